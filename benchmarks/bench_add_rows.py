@@ -0,0 +1,74 @@
+'''
+Benchmark for adding many rows to DynamicTables at once
+
+Run with::
+
+    python benchmarks/bench_add_rows.py
+
+Trials with 1,000,000 rows of a start time, a stop time and a ragged column of tags, and units with 1,000,000
+rows of 10 spike times each are added with ``add_trials`` and ``add_units`` from arrays, and with ``add_trial`` and
+``add_unit`` one row at a time. Adding rows one at a time is timed for 20,000 rows and reported per million rows.
+'''
+from __future__ import print_function
+
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile
+
+N_ROWS = 1000000
+N_SLOW = 20000
+N_SPIKES = 10
+
+
+def make_file():
+    return NWBFile('a file with many rows', 'bench_add_rows', datetime(2018, 1, 1, tzinfo=tzlocal()))
+
+
+def trials_one_at_a_time(start, stop, tags, n):
+    nwbfile = make_file()
+    for i in range(n):
+        nwbfile.add_trial(start_time=float(start[i]), stop_time=float(stop[i]), tags=tags[i])
+
+
+def trials_at_once(start, stop, tags, n):
+    nwbfile = make_file()
+    nwbfile.add_trials(start_time=start[:n], stop_time=stop[:n], tags=tags[:n])
+
+
+def units_one_at_a_time(spike_times, n):
+    nwbfile = make_file()
+    for i in range(n):
+        nwbfile.add_unit(spike_times=spike_times[i * N_SPIKES:(i + 1) * N_SPIKES])
+
+
+def units_at_once(spike_times, n):
+    nwbfile = make_file()
+    offsets = np.arange(1, n + 1) * N_SPIKES
+    nwbfile.add_units(spike_times=spike_times[:n * N_SPIKES], index={'spike_times': offsets})
+
+
+def timed(func, *args):
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def main():
+    start = np.arange(N_ROWS, dtype=float)
+    stop = start + 0.5
+    tags = [['go'] if i % 2 else ['stop', 'late'] for i in range(N_ROWS)]
+    spike_times = np.sort(np.random.rand(N_ROWS * N_SPIKES))
+    scale = float(N_ROWS) / N_SLOW
+    for label, slow, fast, args in (('trials', trials_one_at_a_time, trials_at_once, (start, stop, tags)),
+                                    ('units', units_one_at_a_time, units_at_once, (spike_times,))):
+        one = timed(slow, *(args + (N_SLOW,))) * scale
+        many = timed(fast, *(args + (N_ROWS,)))
+        print('%-8s %d rows: %8.1f s one at a time (estimated) %8.2f s at once' % (label, N_ROWS, one, many))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+Benchmark for appending a TimeSeries to a file with many objects
+
+Run with::
+
+    python benchmarks/bench_append.py
+
+A file with 2,000 TimeSeries in 20 processing modules is written to a temporary directory. The file is then
+opened in append mode, one TimeSeries is added to it, and the time it takes to write the file again with
+:py:meth:`~pynwb.NWBHDF5IO.write` is reported. Only the new TimeSeries and the groups that hold it are written.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO, TimeSeries
+
+N_MODULES = 20
+N_SERIES = 100
+
+
+def write_file(path):
+    nwbfile = NWBFile('a file with many objects', 'bench_append', datetime(2018, 1, 1, tzinfo=tzlocal()))
+    for i in range(N_MODULES):
+        mod = nwbfile.create_processing_module('module%d' % i, 'a processing module')
+        for j in range(N_SERIES):
+            mod.add_data_interface(TimeSeries('series%d' % j, list(range(10)), 'unit', rate=1.0))
+    with NWBHDF5IO(path, 'w') as io:
+        io.write(nwbfile)
+
+
+def append_one(path, name):
+    with NWBHDF5IO(path, 'a') as io:
+        nwbfile = io.read()
+        nwbfile.add_acquisition(TimeSeries(name, list(range(10)), 'unit', rate=1.0))
+        start = time.time()
+        io.write(nwbfile)
+        return time.time() - start
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'bench_append.nwb')
+        write_file(path)
+        times = [append_one(path, 'appended%d' % i) for i in range(3)]
+        print('%-32s %10.3f s' % ('append to %d series' % (N_MODULES * N_SERIES), min(times)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+'''
+Benchmark for writing a (time x channel) array with DataChunkIterator and ArrayDataChunkIterator
+
+Run with::
+
+    python benchmarks/bench_array_iterator.py
+'''
+from __future__ import print_function
+
+import os
+import tempfile
+from timeit import default_timer
+
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO
+from pynwb.form.build import DatasetBuilder
+from pynwb.form.data_utils import DataChunkIterator, ArrayDataChunkIterator
+
+N_SAMPLES = 200000
+N_CHANNELS = 384
+CHUNK_ROWS = 1024
+
+
+def write(path, data):
+    io = HDF5IO(path, mode='w')
+    start = default_timer()
+    io.write_dataset(io._file, DatasetBuilder('data', data))
+    elapsed = default_timer() - start
+    io.close()
+    return elapsed
+
+
+def main():
+    a = np.random.RandomState(0).randint(-1000, 1000, size=(N_SAMPLES, N_CHANNELS)).astype(np.int16)
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        print('array of %s, %.0f MB' % (str(a.shape), a.nbytes / 1e6))
+        t = write(path, DataChunkIterator(data=a, buffer_size=CHUNK_ROWS))
+        print('DataChunkIterator:      %8.3f s' % t)
+        t = write(path, ArrayDataChunkIterator(a, chunk_shape=(CHUNK_ROWS, N_CHANNELS)))
+        print('ArrayDataChunkIterator: %8.3f s' % t)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+'''
+Benchmark for the memory used by a large tree of builders, and the time to look up paths in it
+
+Run with::
+
+    python benchmarks/bench_builders.py
+
+A tree of 100,000 builders is created: 10,000 groups with one attribute, each holding 9 datasets with one
+attribute, similar to a file with one group per ROI or unit. The memory allocated for the tree is measured with
+:py:mod:`tracemalloc`, which requires Python 3.4 or newer. The time to look up the path of each dataset from the
+root builder is reported as well.
+'''
+from __future__ import print_function
+
+import time
+import tracemalloc
+
+from pynwb.form.build import GroupBuilder, DatasetBuilder
+
+N_GROUPS = 10000
+N_DATASETS = 9
+
+
+def make_tree():
+    root = GroupBuilder('root')
+    for i in range(N_GROUPS):
+        group = GroupBuilder('roi%d' % i, attributes={'neurodata_type': 'ROI'})
+        for j in range(N_DATASETS):
+            group.set_dataset(DatasetBuilder('data%d' % j, j, attributes={'unit': 'm'}))
+        root.set_group(group)
+    return root
+
+
+def main():
+    tracemalloc.start()
+    start = time.time()
+    root = make_tree()
+    elapsed = time.time() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    n = N_GROUPS * (N_DATASETS + 1)
+    print('%-24s %10.1f MB (%d bytes per builder)' % ('memory', size / 2.0**20, size // n))
+    print('%-24s %10.3f s' % ('create %d builders' % n, elapsed))
+    paths = ['roi%d/data%d' % (i, j) for i in range(N_GROUPS) for j in range(N_DATASETS)]
+    start = time.time()
+    for path in paths:
+        root[path]
+    print('%-24s %10.3f s' % ('look up %d paths' % len(paths), time.time() - start))
+    names = ['roi%d' % i for i in range(N_GROUPS)]
+    start = time.time()
+    for name in names:
+        root[name]
+    print('%-24s %10.3f s' % ('look up %d names' % len(names), time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Benchmark for many small, overlapping reads from a gzip-compressed dataset with and without the cache of decoded
+chunks
+
+Run with::
+
+    python benchmarks/bench_chunk_cache.py
+
+The reads resemble extracting waveform windows around spike times: each read selects a short window of samples on
+a few neighboring channels. The chunks (2 MB) are larger than the default chunk cache of HDF5 (1 MB).
+'''
+from __future__ import print_function
+
+import os
+import tempfile
+from timeit import default_timer
+
+import h5py
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO
+
+N_SAMPLES = 2**20
+N_CHANNELS = 64
+N_READS = 500
+WINDOW = 64
+
+
+def read(path, windows, cache_size):
+    io = HDF5IO(path, mode='r', chunk_cache_size=cache_size)
+    data = io.read_builder()['data'].data
+    start = default_timer()
+    for t, c in windows:
+        data[t:t + WINDOW, c:c + 4]
+    elapsed = default_timer() - start
+    cache = io.chunk_cache
+    io.close()
+    return elapsed, cache
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        data = np.cumsum(np.random.randint(-3, 4, size=(N_SAMPLES, N_CHANNELS)), axis=0).astype(np.int16)
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('data', data=data, chunks=(32768, 32), compression='gzip')
+        del data
+        times = np.random.randint(0, N_SAMPLES - WINDOW, size=N_READS)
+        channels = np.random.randint(0, N_CHANNELS - 4, size=N_READS)
+        windows = list(zip(times, channels))
+        elapsed, cache = read(path, windows, None)
+        print('%18s: %8.3f s' % ('no cache', elapsed))
+        for size in (2**24, 2**28):
+            elapsed, cache = read(path, windows, size)
+            print('%12d bytes: %8.3f s (%d hits, %d misses)' % (size, elapsed, cache.hits, cache.misses))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
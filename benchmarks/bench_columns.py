@@ -0,0 +1,81 @@
+'''
+Benchmark for building and writing DynamicTable columns of numbers
+
+Run with::
+
+    python benchmarks/bench_columns.py
+
+A Units table with 1,000 units of 1,000 spike times each and an electrodes-like table with 10,000 rows of
+five numeric columns are built with ``add_unit`` and ``add_row``. The memory allocated for each table is
+measured with :py:mod:`tracemalloc`, which requires Python 3.4 or newer, and the time to build each table and
+to write it to a file with :py:class:`~pynwb.NWBHDF5IO` is reported.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO
+from pynwb.core import DynamicTable
+from pynwb.misc import Units
+
+N_UNITS = 1000
+N_SPIKES = 1000
+N_ROWS = 10000
+COLUMNS = ('x', 'y', 'z', 'imp', 'group_id')
+
+
+def make_units():
+    units = Units('units')
+    for i in range(N_UNITS):
+        units.add_unit(spike_times=np.random.rand(N_SPIKES).tolist())
+    return units
+
+
+def make_table():
+    table = DynamicTable('table', 'an electrodes-like table')
+    for name in COLUMNS:
+        table.add_column(name, 'a column of numbers')
+    for i in range(N_ROWS):
+        table.add_row(x=i * 0.1, y=i * 0.2, z=i * 0.3, imp=i * 1e3, group_id=i % 32)
+    return table
+
+
+def measure(make, add):
+    tracemalloc.start()
+    make()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.time()
+    table = make()
+    elapsed = time.time() - start
+    tmpdir = tempfile.mkdtemp()
+    try:
+        nwbfile = NWBFile('a file with a table', 'bench_columns', datetime(2018, 1, 1, tzinfo=tzlocal()))
+        add(nwbfile, table)
+        start = time.time()
+        with NWBHDF5IO(os.path.join(tmpdir, 'bench_columns.nwb'), 'w') as io:
+            io.write(nwbfile)
+        write = time.time() - start
+    finally:
+        shutil.rmtree(tmpdir)
+    return size, elapsed, write
+
+
+def main():
+    for label, make, add in (('units (%d spikes)' % (N_UNITS * N_SPIKES), make_units,
+                              lambda f, t: setattr(f, 'units', t)),
+                             ('table (%d rows)' % N_ROWS, make_table, lambda f, t: f.add_acquisition(t))):
+        size, elapsed, write = measure(make, add)
+        print('%-24s %8.1f MB %8.3f s build %8.3f s write' % (label, size / 2.0**20, elapsed, write))
+
+
+if __name__ == '__main__':
+    main()
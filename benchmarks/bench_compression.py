@@ -0,0 +1,52 @@
+'''
+Benchmark for writing a gzip-compressed dataset with chunks compressed by HDF5 or by a pool of threads
+
+Run with::
+
+    python benchmarks/bench_compression.py
+
+The data resemble raw ephys recordings: a random walk stored as int16. The threads only speed up the write
+on machines with more than one core.
+'''
+from __future__ import print_function
+
+import multiprocessing
+import os
+import tempfile
+from timeit import default_timer
+
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO, H5DataIO
+from pynwb.form.build import DatasetBuilder
+
+N_SAMPLES = 2**21
+N_CHANNELS = 64
+
+
+def write(path, data, workers):
+    io = HDF5IO(path, mode='w')
+    wrapped = H5DataIO(data, chunks=(8192, N_CHANNELS), compression='gzip', compression_opts=4,
+                       compression_workers=workers)
+    start = default_timer()
+    io.write_dataset(io._file, DatasetBuilder('data', wrapped))
+    elapsed = default_timer() - start
+    io.close()
+    return elapsed
+
+
+def main():
+    data = np.cumsum(np.random.randint(-3, 4, size=(N_SAMPLES, N_CHANNELS)), axis=0).astype(np.int16)
+    print('%d MB of int16 data, %d cores' % (data.nbytes // 2**20, multiprocessing.cpu_count()))
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        print('%12s: %8.3f s' % ('HDF5', write(path, data, None)))
+        for workers in (1, 2, 4, 8):
+            print('%4d threads: %8.3f s' % (workers, write(path, data, workers)))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
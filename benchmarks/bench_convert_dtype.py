@@ -0,0 +1,50 @@
+'''
+Benchmark for converting data to the dtype given in the specification with ObjectMapper.convert_dtype
+
+Run with::
+
+    python benchmarks/bench_convert_dtype.py
+
+The time and the peak of the memory allocated during the conversion (as reported by tracemalloc) are
+reported for an array that already has the specified dtype, an array of lower precision, and a list.
+'''
+from __future__ import print_function
+
+import tracemalloc
+from timeit import default_timer
+
+import numpy as np
+
+from pynwb.form.build import ObjectMapper
+from pynwb.form.spec import DatasetSpec
+
+N_ELEMENTS = 2**27
+N_LIST_ELEMENTS = 10**6
+
+
+def measure(spec, value):
+    tracemalloc.start()
+    start = default_timer()
+    ObjectMapper.convert_dtype(spec, value)
+    elapsed = default_timer() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    cases = (
+        ('int16 array, int16 spec', DatasetSpec('data', 'int16', name='data'),
+         np.zeros(N_ELEMENTS, dtype=np.int16)),
+        ('int16 array, int32 spec', DatasetSpec('data', 'int32', name='data'),
+         np.zeros(N_ELEMENTS, dtype=np.int16)),
+        ('float list, float64 spec', DatasetSpec('data', 'float64', name='data'),
+         np.random.rand(N_LIST_ELEMENTS).tolist()),
+    )
+    for label, spec, value in cases:
+        elapsed, peak = measure(spec, value)
+        print('%-26s %8.4f s   peak %8.1f MB' % (label, elapsed, peak / 2**20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+'''
+Benchmark for reading datasets of object references
+
+Run with::
+
+    python benchmarks/bench_deref.py
+
+A file with 200,000 electrodes in 8 electrode groups, and 200,000 epochs of a TimeSeries, is written. The
+electrode group of every electrode (a dataset of object references) and the TimeSeries of every epoch (a compound
+dataset with a column of object references) are then read from the file, and the electrode groups of the first
+N_SINGLE electrodes are read one at a time.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO, TimeSeries
+
+N_ROWS = 200000
+N_GROUPS = 8
+N_SINGLE = 20000
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'bench_deref.nwb')
+    try:
+        nwbfile = NWBFile('a file with many references', 'bench_deref', datetime(2018, 1, 1, tzinfo=tzlocal()))
+        device = nwbfile.create_device('device')
+        groups = [nwbfile.create_electrode_group('group%d' % i, 'a group', 'a location', device)
+                  for i in range(N_GROUPS)]
+        ones = np.ones(N_ROWS)
+        nwbfile.add_electrodes(x=ones, y=ones, z=ones, imp=ones, location=['a location'] * N_ROWS,
+                               filtering=['none'] * N_ROWS, group=[groups[i % N_GROUPS] for i in range(N_ROWS)])
+        ts = TimeSeries('ts', np.arange(N_ROWS, dtype=float), 'a unit', rate=1.0)
+        nwbfile.add_acquisition(ts)
+        start = np.arange(N_ROWS, dtype=float)
+        nwbfile.add_epochs(start_time=start, stop_time=start + 0.5, timeseries=ts)
+        with NWBHDF5IO(path, 'w') as io:
+            io.write(nwbfile)
+        with NWBHDF5IO(path, 'r') as io:
+            read = io.read()
+            groups = read.electrodes['group'].data
+            print('%d electrode groups:      %8.3f s' % (N_ROWS, timed(groups.__getitem__, slice(None))))
+            print('%d electrode groups, one at a time: %8.3f s'
+                  % (N_SINGLE, timed(lambda: [groups[i] for i in range(N_SINGLE)])))
+            epochs = read.epochs['timeseries'].target.data
+            print('%d epoch TimeSeries:      %8.3f s' % (N_ROWS, timed(epochs.__getitem__, slice(None))))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
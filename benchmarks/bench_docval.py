@@ -0,0 +1,70 @@
+'''
+Micro-benchmark for the per-call overhead of the docval decorator
+
+Run with::
+
+    python benchmarks/bench_docval.py
+
+The overhead is reported in microseconds per call, relative to calling an undecorated function,
+for the default mode and for production mode (see :py:func:`pynwb.form.utils.set_production_mode`).
+'''
+from __future__ import print_function
+
+import timeit
+
+from pynwb.form.utils import docval, getargs, set_production_mode
+from pynwb.core import DynamicTable, VectorData
+
+
+class Plain(object):
+
+    def method(self, arg1, arg2, kwarg1=None, kwarg2=0.0):
+        return arg1
+
+
+class Decorated(object):
+
+    @docval({'name': 'arg1', 'type': str, 'doc': 'a str'},
+            {'name': 'arg2', 'type': 'array_data', 'doc': 'an array'},
+            {'name': 'kwarg1', 'type': list, 'doc': 'a list', 'default': list()},
+            {'name': 'kwarg2', 'type': float, 'doc': 'a float', 'default': 0.0})
+    def method(self, **kwargs):
+        return getargs('arg1', kwargs)
+
+
+def per_call(stmt, number, setup_globals):
+    best = min(timeit.repeat(stmt, globals=setup_globals, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def bench_method(number=100000):
+    g = {'plain': Plain(), 'decorated': Decorated(), 'data': [1, 2, 3]}
+    plain = per_call("plain.method('a', data)", number, g)
+    decorated = per_call("decorated.method('a', data)", number, g)
+    return plain, decorated
+
+
+def bench_add_row(number=20000):
+    def run():
+        table = DynamicTable('table', 'a test table',
+                             columns=[VectorData('foo', 'an int column'), VectorData('bar', 'a str column')])
+        for i in range(number):
+            table.add_row({'foo': i, 'bar': 'row'})
+    best = min(timeit.repeat(run, number=1, repeat=3))
+    return best / number * 1e6
+
+
+def main():
+    for production in (False, True):
+        set_production_mode(production)
+        plain, decorated = bench_method()
+        add_row = bench_add_row()
+        print('production mode: %s' % production)
+        print('    undecorated call:         %6.2f us' % plain)
+        print('    docval call:              %6.2f us (overhead %6.2f us)' % (decorated, decorated - plain))
+        print('    DynamicTable.add_row:     %6.2f us per row' % add_row)
+    set_production_mode(False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+'''
+Benchmark for writing an unbounded stream with each of the growth policies of H5DataIO
+
+Run with::
+
+    python benchmarks/bench_growth.py
+
+A generator of unknown length is written one sample per chunk (buffer_size=1), which requires the
+dataset to be expanded as the data arrive.
+'''
+from __future__ import print_function
+
+import os
+import tempfile
+from timeit import default_timer
+
+from pynwb.form.backends.hdf5 import HDF5IO, H5DataIO
+from pynwb.form.build import DatasetBuilder
+from pynwb.form.data_utils import DataChunkIterator
+
+N_SAMPLES = 50000
+
+
+def samples():
+    for i in range(N_SAMPLES):
+        yield float(i)
+
+
+def write(path, growth):
+    io = HDF5IO(path, mode='w')
+    data = H5DataIO(DataChunkIterator(data=samples(), buffer_size=1), chunks=(1024,), growth=growth)
+    start = default_timer()
+    io.write_dataset(io._file, DatasetBuilder('data', data))
+    elapsed = default_timer() - start
+    io.close()
+    return elapsed
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        for growth in ('exact', 'chunk', 'geometric'):
+            print('%10s: %8.3f s for %d samples' % (growth, write(path, growth), N_SAMPLES))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+'''
+Benchmark for the time it takes to import pynwb
+
+Run with::
+
+    python benchmarks/bench_import.py
+
+``import pynwb`` is timed in fresh interpreters, reading the core namespace from the YAML files and
+from the cache of the loaded namespace that is installed with pynwb. The time to import the packages
+pynwb depends on, e.g., numpy, h5py and pandas, is reported for comparison.
+
+To read the YAML files, the cache files are moved out of the directory of the core namespace while the
+import is timed. If pynwb was not installed with a cache, e.g., in a source checkout, the cache is written
+for the benchmark and removed afterwards.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPEAT = 5
+
+STMT = 'import time; t = time.time(); import %s; print(time.time() - t)'
+
+
+def time_import(module):
+    times = list()
+    for i in range(REPEAT):
+        out = subprocess.check_output([sys.executable, '-c', STMT % module])
+        times.append(float(out.decode('utf-8').strip().splitlines()[-1]))
+    return min(times)
+
+
+def get_cache_files(data_dir):
+    return set(f for f in os.listdir(data_dir) if f.endswith('.pkl'))
+
+
+def main():
+    import pynwb
+    data_dir = os.path.dirname(pynwb._get_resources()['namespace_path'])
+    installed = get_cache_files(data_dir)
+    print('%-32s %10s' % ('', 'time (s)'))
+    deps = 'numpy, h5py, pandas, ruamel.yaml'
+    print('%-32s %10.3f' % (deps, time_import(deps)))
+    moved = tempfile.mkdtemp()
+    try:
+        for f in installed:
+            shutil.move(os.path.join(data_dir, f), moved)
+        print('%-32s %10.3f' % ('pynwb from YAML', time_import('pynwb')))
+    finally:
+        for f in installed:
+            shutil.move(os.path.join(moved, f), data_dir)
+        shutil.rmtree(moved)
+    subprocess.check_call([sys.executable, '-c', 'import pynwb; pynwb._cache_core_namespace()'])
+    written = get_cache_files(data_dir) - installed
+    try:
+        print('%-32s %10.3f' % ('pynwb from cache', time_import('pynwb')))
+    finally:
+        for f in written:
+            os.remove(os.path.join(data_dir, f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+'''
+Benchmark for writing in-memory arrays and lists with HDF5IO.write_dataset
+
+Run with::
+
+    python benchmarks/bench_list_fill.py          # 1 GB array
+    python benchmarks/bench_list_fill.py 10       # 10 GB array
+
+The first argument is the size of the array in GB. The second, optional argument is the size of the
+list in GB (default 0.05), since a list takes several times the memory of an array of the same values.
+For each input the time and the peak of the memory allocated during the write (as reported by
+tracemalloc) are compared with assigning the data to an h5py dataset directly, i.e. ``dset[:] = data``.
+'''
+from __future__ import print_function
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from timeit import default_timer
+
+import h5py
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO
+from pynwb.form.build import DatasetBuilder
+
+GB = 2**30
+
+
+def measure(func):
+    tracemalloc.start()
+    start = default_timer()
+    func()
+    elapsed = default_timer() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def write_assign(path, data, dtype):
+    with h5py.File(path, 'w') as f:
+        dset = f.create_dataset('data', shape=np.shape(data), dtype=dtype)
+        dset[:] = data
+
+
+def write_hdf5io(path, data, dtype):
+    io = HDF5IO(path, mode='w')
+    io.write_dataset(io._file, DatasetBuilder('data', data, dtype=dtype))
+    io.close()
+
+
+def report(label, path, data, dtype, h5py_dtype):
+    for name, func in (('dset[:] = data', lambda: write_assign(path, data, h5py_dtype)),
+                       ('write_dataset', lambda: write_hdf5io(path, data, dtype))):
+        elapsed, peak = measure(func)
+        print('%-28s %-16s %8.2f s   peak %8.1f MB' % (label, name, elapsed, peak / 2**20))
+
+
+def main():
+    array_gb = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    list_gb = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        data = np.random.rand(int(array_gb * GB) // 8 // 1000, 1000)
+        report('float64 array (%.2f GB)' % array_gb, path, data, 'float64', 'f8')
+        report('float64 array -> float32', path, data, 'float', 'f4')
+        del data
+        data = np.random.rand(int(list_gb * GB) // 8 // 100, 100).tolist()
+        report('float list (%.2f GB)' % list_gb, path, data, 'float64', 'f8')
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
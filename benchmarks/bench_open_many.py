@@ -0,0 +1,58 @@
+'''
+Benchmark for the time it takes to open many small NWB files
+
+Run with::
+
+    python benchmarks/bench_open_many.py
+
+1,000 small files are written to a temporary directory. The time to create a TypeMap with
+:py:func:`pynwb.get_type_map` and a BuildManager with :py:func:`pynwb.get_manager` is reported, along
+with the time to open each file with :py:class:`~pynwb.NWBHDF5IO` and read one TimeSeries from it.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+from datetime import datetime
+
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO, TimeSeries, get_type_map, get_manager
+
+N_FILES = 1000
+
+
+def write_file(path):
+    nwbfile = NWBFile('a small file', 'bench_open_many', datetime(2018, 1, 1, tzinfo=tzlocal()))
+    nwbfile.add_acquisition(TimeSeries('target', list(range(10)), 'unit', rate=1.0))
+    with NWBHDF5IO(path, 'w') as io:
+        io.write(nwbfile)
+
+
+def read_one(path):
+    with NWBHDF5IO(path, 'r') as io:
+        io.read_builder()
+        io.get_container('/acquisition/target')
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        paths = [os.path.join(tmpdir, 'bench_open_many_%d.nwb' % i) for i in range(N_FILES)]
+        path = paths[0]
+        write_file(path)
+        for p in paths[1:]:
+            shutil.copyfile(path, p)
+        n = 100
+        print('%-24s %10.1f us' % ('get_type_map()', min(timeit.repeat(get_type_map, number=n, repeat=3)) / n * 1e6))
+        print('%-24s %10.1f us' % ('get_manager()', min(timeit.repeat(get_manager, number=n, repeat=3)) / n * 1e6))
+        t = min(timeit.repeat(lambda: [read_one(p) for p in paths], number=1, repeat=3))
+        print('%-24s %10.3f s' % ('open %d files' % N_FILES, t))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
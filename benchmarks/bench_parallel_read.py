@@ -0,0 +1,56 @@
+'''
+Benchmark for reading a large slice of a gzip-compressed dataset with chunks decompressed by HDF5 or by a pool of
+threads
+
+Run with::
+
+    python benchmarks/bench_parallel_read.py
+
+Decompressing chunks in threads requires h5py 2.10 or newer (for read_direct_chunk), and only speeds up the read
+on machines with more than one core.
+'''
+from __future__ import print_function
+
+import multiprocessing
+import os
+import tempfile
+from timeit import default_timer
+
+import h5py
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO
+
+N_SAMPLES = 2**21
+N_CHANNELS = 64
+
+
+def read(path, workers):
+    io = HDF5IO(path, mode='r', read_workers=workers)
+    data = io.read_builder()['data'].data
+    start = default_timer()
+    data[:N_SAMPLES // 2]
+    elapsed = default_timer() - start
+    io.close()
+    return elapsed
+
+
+def main():
+    print('%d cores, read_direct_chunk %savailable' %
+          (multiprocessing.cpu_count(), '' if hasattr(h5py.h5d.DatasetID, 'read_direct_chunk') else 'not '))
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        data = np.cumsum(np.random.randint(-3, 4, size=(N_SAMPLES, N_CHANNELS)), axis=0).astype(np.int16)
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('data', data=data, chunks=(8192, N_CHANNELS), compression='gzip')
+        del data
+        print('%12s: %8.3f s' % ('HDF5', read(path, None)))
+        for workers in (1, 2, 4, 8):
+            print('%4d threads: %8.3f s' % (workers, read(path, workers)))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+'''
+Benchmark for reading the rows of a ragged column from a file
+
+Run with::
+
+    python benchmarks/bench_ragged.py
+
+A Units table with 20,000 units of 50 spike times each is written to a file. The spike times of all units, and of
+every other unit, are then read from the file with ``units['spike_times'][...]``, and with
+:py:meth:`~pynwb.core.VectorIndex.get_rows` as a flat array and offsets.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO
+
+N_UNITS = 20000
+N_SPIKES = 50
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'bench_ragged.nwb')
+    try:
+        nwbfile = NWBFile('a file with many units', 'bench_ragged', datetime(2018, 1, 1, tzinfo=tzlocal()))
+        spike_times = np.random.rand(N_UNITS * N_SPIKES)
+        nwbfile.add_units(spike_times=spike_times, index={'spike_times': np.arange(1, N_UNITS + 1) * N_SPIKES})
+        with NWBHDF5IO(path, 'w') as io:
+            io.write(nwbfile)
+        with NWBHDF5IO(path, 'r') as io:
+            spikes = io.read().units['spike_times']
+            every_other = list(range(0, N_UNITS, 2))
+            print('%d units, all rows:          %8.3f s' % (N_UNITS, timed(spikes.__getitem__, slice(None))))
+            print('%d units, every other row:   %8.3f s' % (N_UNITS, timed(spikes.__getitem__, every_other)))
+            print('%d units, all rows, flat:    %8.3f s' % (N_UNITS, timed(spikes.get_rows, flat=True)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
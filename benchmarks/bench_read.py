@@ -0,0 +1,62 @@
+'''
+Benchmark for the time it takes to open an NWB file and read a single TimeSeries from it
+
+Run with::
+
+    python benchmarks/bench_read.py
+
+Files with an increasing number of TimeSeries in a processing module are written to a temporary
+directory, and for each file the time to read the builder tree and to construct one TimeSeries
+with :py:meth:`~pynwb.form.backends.hdf5.h5tools.HDF5IO.get_container` is reported, along with the
+time to read the whole file with :py:meth:`~pynwb.NWBHDF5IO.read`.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import timeit
+from datetime import datetime
+
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO, TimeSeries
+
+
+def write_file(path, n_objects):
+    nwbfile = NWBFile('a file with many TimeSeries', 'bench_read', datetime(2018, 1, 1, tzinfo=tzlocal()))
+    module = nwbfile.create_processing_module('module', 'a module with many TimeSeries')
+    for i in range(n_objects):
+        module.add_data_interface(TimeSeries('ts%d' % i, list(range(10)), 'unit', rate=1.0))
+    nwbfile.add_acquisition(TimeSeries('target', list(range(10)), 'unit', rate=1.0))
+    with NWBHDF5IO(path, 'w') as io:
+        io.write(nwbfile)
+
+
+def read_one(path):
+    with NWBHDF5IO(path, 'r') as io:
+        io.read_builder()
+        io.get_container('/acquisition/target')
+
+
+def read_all(path):
+    with NWBHDF5IO(path, 'r') as io:
+        io.read()
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        print('%10s %14s %14s' % ('objects', 'read one (s)', 'read all (s)'))
+        for n_objects in (10, 100, 1000):
+            path = os.path.join(tmpdir, 'bench_read_%d.nwb' % n_objects)
+            write_file(path, n_objects)
+            one = min(timeit.repeat(lambda: read_one(path), number=1, repeat=3))
+            full = min(timeit.repeat(lambda: read_all(path), number=1, repeat=3))
+            print('%10d %14.4f %14.4f' % (n_objects, one, full))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
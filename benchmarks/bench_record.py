@@ -0,0 +1,80 @@
+'''
+Benchmark for reading a file from its metadata record
+
+Run with::
+
+    python benchmarks/bench_record.py
+
+A file with 5,000 TimeSeries in 50 processing modules is written twice, without and with a metadata record. The
+builder tree of each file is then read and walked, reading the contents of every group, the file is read, and
+a single TimeSeries is read from it with :py:meth:`~pynwb.form.backends.hdf5.h5tools.HDF5IO.get_container`, each
+with a new NWBHDF5IO. The time to read a single TimeSeries includes the time to open the file. The file without a
+record is read both without and with scanning its metadata.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO, TimeSeries
+
+N_MODULES = 50
+N_SERIES = 100
+
+
+def walk(builder):
+    n = 1
+    for group in builder.groups.values():
+        n += walk(group)
+    return n + len(builder.datasets) + len(builder.links)
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    ret = func(*args, **kwargs)
+    return ret, time.time() - start
+
+
+def read_one(path, scan_metadata):
+    with NWBHDF5IO(path, 'r', scan_metadata=scan_metadata) as io:
+        io.read_builder()
+        return io.get_container('/processing/module%d/series%d' % (N_MODULES // 2, N_SERIES // 2))
+
+
+def write(path, cache_metadata):
+    nwbfile = NWBFile('a file with many objects', 'bench_record', datetime(2018, 1, 1, tzinfo=tzlocal()))
+    for i in range(N_MODULES):
+        module = nwbfile.create_processing_module('module%d' % i, 'a module')
+        for j in range(N_SERIES):
+            ts = TimeSeries('series%d' % j, np.arange(10.), 'a unit', timestamps=np.arange(10.))
+            module.add_data_interface(ts)
+    with NWBHDF5IO(path, 'w') as io:
+        io.write(nwbfile, cache_metadata=cache_metadata)
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for cache_metadata, scan_metadata in ((False, False), (False, True), (True, False)):
+            path = os.path.join(tmpdir, 'bench_record_%s.nwb' % cache_metadata)
+            if not os.path.exists(path):
+                write(path, cache_metadata)
+            with NWBHDF5IO(path, 'r', scan_metadata=scan_metadata) as io:
+                n, walk_time = timed(lambda: walk(io.read_builder()))
+            with NWBHDF5IO(path, 'r', scan_metadata=scan_metadata) as io:
+                read_time = timed(io.read)[1]
+            one_time = timed(read_one, path, scan_metadata)[1]
+            print('cache_metadata=%-5s scan_metadata=%-5s %d objects: walk %7.3f s, read %7.3f s, read one %7.3f s'
+                  % (cache_metadata, scan_metadata, n, walk_time, read_time, one_time))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
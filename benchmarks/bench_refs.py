@@ -0,0 +1,47 @@
+'''
+Benchmark for writing datasets of object references
+
+Run with::
+
+    python benchmarks/bench_refs.py
+
+An array of object references and a compound dataset with a reference column, each referring to a small
+number of target datasets (like the ``group`` column of the electrodes table), are written with
+:py:meth:`~pynwb.form.backends.hdf5.h5tools.HDF5IO.write_builder`.
+'''
+from __future__ import print_function
+
+import os
+import tempfile
+import timeit
+
+from pynwb.form.backends.hdf5 import HDF5IO
+from pynwb.form.build import GroupBuilder
+from pynwb.form.spec import DtypeSpec, RefSpec
+
+
+def write(path, n_refs, n_targets=8):
+    root = GroupBuilder('root')
+    targets = [root.add_dataset('target%d' % i, list(range(10))) for i in range(n_targets)]
+    root.add_dataset('refs', [targets[i % n_targets] for i in range(n_refs)], dtype='object')
+    dtype = [DtypeSpec('index', 'the row index', 'int32'), DtypeSpec('ref', 'the target', RefSpec('Data', 'object'))]
+    root.add_dataset('table', [(i, targets[i % n_targets]) for i in range(n_refs)], dtype=dtype)
+    io = HDF5IO(path, mode='w')
+    io.write_builder(root)
+    io.close()
+
+
+def main():
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        print('%10s %10s' % ('references', 'write (s)'))
+        for n_refs in (1000, 10000, 100000):
+            t = min(timeit.repeat(lambda: write(path, n_refs), number=1, repeat=3))
+            print('%10d %10.4f' % (n_refs, t))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
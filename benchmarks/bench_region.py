@@ -0,0 +1,54 @@
+'''
+Benchmark for indexing the region of a dataset that a region reference refers to
+
+Run with::
+
+    python benchmarks/bench_region.py
+
+A dataset of 20,000,000 numbers is written to a file, with a region reference to all but the first and last
+1,000,000 numbers. The region is indexed with one index, with 1,000 random indices, and with a slice of 1,000
+numbers, each with a new :py:class:`~pynwb.form.backends.hdf5.h5_utils.H5RegionSlicer`.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from h5py import File
+
+from pynwb.form.backends.hdf5 import H5RegionSlicer
+
+N_VALUES = 20000000
+MARGIN = 1000000
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'bench_region.h5')
+    try:
+        with File(path, 'w') as f:
+            dset = f.create_dataset('data', data=np.random.rand(N_VALUES))
+            f.attrs['region'] = dset.regionref[MARGIN:N_VALUES - MARGIN]
+        with File(path, 'r') as f:
+            dset = f['data']
+            region = f.attrs['region']
+            n = N_VALUES - 2 * MARGIN
+            indices = np.random.randint(0, n, 1000)
+            for label, key in (('one index', n // 2), ('1000 random indices', indices),
+                               ('slice of 1000', slice(0, 1000))):
+                print('%-20s %8.3f s' % (label, timed(lambda: H5RegionSlicer(dset, region)[key])))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''
+Benchmark for reading the builder tree of a file with many objects
+
+Run with::
+
+    python benchmarks/bench_scan.py
+
+A file with 5,000 groups of 9 datasets each (50,000 objects), each with two attributes, is written with h5py.
+The builder tree of the file is then read and walked, reading the contents of every group, without and with
+scanning the metadata of the file, each with a new HDF5IO.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from h5py import File, SoftLink
+
+from pynwb.form.backends.hdf5 import HDF5IO
+
+N_GROUPS = 5000
+N_DATASETS = 9
+
+
+def walk(builder):
+    n = 1
+    for group in builder.groups.values():
+        n += walk(group)
+    return n + len(builder.datasets) + len(builder.links)
+
+
+def read(path, scan_metadata):
+    start = time.time()
+    io = HDF5IO(path, mode='r', scan_metadata=scan_metadata)
+    n = walk(io.read_builder())
+    elapsed = time.time() - start
+    io.close()
+    return n, elapsed
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'bench_scan.h5')
+    try:
+        with File(path, 'w') as f:
+            for i in range(N_GROUPS):
+                group = f.create_group('group%d' % i)
+                group.attrs['neurodata_type'] = 'Group'
+                group.attrs['index'] = i
+                for j in range(N_DATASETS):
+                    dset = group.create_dataset('data%d' % j, data=np.arange(10))
+                    dset.attrs['unit'] = 'seconds'
+                    dset.attrs['conversion'] = 1.0
+                group['link'] = SoftLink('/group0/data0')
+        for scan_metadata in (False, True):
+            n, elapsed = read(path, scan_metadata)
+            print('scan_metadata=%-5s %d objects: %8.3f s' % (scan_metadata, n, elapsed))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+'''
+Benchmark for reading a file with large text columns
+
+Run with::
+
+    python benchmarks/bench_strings.py
+
+Trials tables with a column of notes of 200 characters each are written to files, with 10,000 to 1,000,000 rows.
+Each file is read in a new interpreter process, and the time to read the file, the peak memory of the process, and
+the time to get the notes of 1,000 random trials are printed.
+'''
+from __future__ import print_function
+
+import os
+import resource
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing import get_context
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO
+
+SIZES = (10000, 100000, 1000000)
+NOTE = 'x' * 200
+
+
+def read(path):
+    start = time.time()
+    io = NWBHDF5IO(path, 'r')
+    nwbfile = io.read()
+    open_time = time.time() - start
+    notes = nwbfile.trials['notes']
+    rows = np.random.randint(0, len(notes), 1000)
+    start = time.time()
+    notes.data[rows]
+    select_time = time.time() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+    io.close()
+    return open_time, rss, select_time
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for n in SIZES:
+            path = os.path.join(tmpdir, 'bench_strings_%d.nwb' % n)
+            nwbfile = NWBFile('a file with a large text column', 'bench_strings',
+                              datetime(2018, 1, 1, tzinfo=tzlocal()))
+            nwbfile.add_trial_column('notes', 'notes about the trial')
+            start = np.arange(n, dtype=float)
+            nwbfile.add_trials(start_time=start, stop_time=start + 0.5, notes=[NOTE] * n)
+            with NWBHDF5IO(path, 'w') as io:
+                io.write(nwbfile)
+            pool = get_context('spawn').Pool(1)
+            open_time, rss, select_time = pool.apply(read, (path,))
+            pool.terminate()
+            print('%8d trials: read %7.3f s, peak RSS %8.1f MB, 1000 random notes %7.3f s'
+                  % (n, open_time, rss, select_time))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+'''
+Benchmark for overlapping reading and writing with ThreadedDataChunkIterator
+
+Run with::
+
+    python benchmarks/bench_threaded_write.py
+
+Chunks are produced by decompressing zlib-compressed blocks (standing in for reading a raw acquisition file)
+and written to a gzip-compressed dataset with :py:meth:`~pynwb.form.backends.hdf5.h5tools.HDF5IO.write_dataset`,
+once directly and once wrapped in a
+:py:class:`~pynwb.form.data_utils.ThreadedDataChunkIterator`.
+'''
+from __future__ import print_function
+
+import os
+import tempfile
+import zlib
+from timeit import default_timer
+
+import numpy as np
+
+from pynwb.form.backends.hdf5 import HDF5IO, H5DataIO
+from pynwb.form.build import DatasetBuilder
+from pynwb.form.data_utils import AbstractDataChunkIterator, DataChunk, ThreadedDataChunkIterator
+
+N_CHUNKS = 64
+CHUNK_ROWS = 4096
+N_CHANNELS = 64
+
+
+def make_blocks():
+    rng = np.random.RandomState(0)
+    block = np.cumsum(rng.randint(-8, 8, size=(CHUNK_ROWS, N_CHANNELS)), axis=0).astype(np.int16)
+    return [zlib.compress(block.tobytes(), 6) for i in range(N_CHUNKS)]
+
+
+class BlockIterator(AbstractDataChunkIterator):
+    """Decompress one block of rows per chunk"""
+
+    def __init__(self, blocks):
+        self.blocks = iter(enumerate(blocks))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        i, blk = next(self.blocks)
+        data = np.frombuffer(zlib.decompress(blk), dtype=np.int16).reshape(CHUNK_ROWS, N_CHANNELS)
+        return DataChunk(data=data, selection=np.s_[i * CHUNK_ROWS:(i + 1) * CHUNK_ROWS])
+
+    next = __next__
+
+    def recommended_chunk_shape(self):
+        return (CHUNK_ROWS, N_CHANNELS)
+
+    def recommended_data_shape(self):
+        return (N_CHUNKS * CHUNK_ROWS, N_CHANNELS)
+
+    @property
+    def dtype(self):
+        return np.dtype(np.int16)
+
+    @property
+    def maxshape(self):
+        return (None, N_CHANNELS)
+
+
+def write(path, data):
+    io = HDF5IO(path, mode='w')
+    wrapped = H5DataIO(data, compression='gzip', compression_opts=4, chunks=(CHUNK_ROWS, N_CHANNELS),
+                       maxshape=(None, N_CHANNELS))
+    start = default_timer()
+    io.write_dataset(io._file, DatasetBuilder('data', wrapped))
+    elapsed = default_timer() - start
+    io.close()
+    return elapsed
+
+
+def main():
+    blocks = make_blocks()
+    fd, path = tempfile.mkstemp(suffix='.h5')
+    os.close(fd)
+    try:
+        plain = write(path, BlockIterator(blocks))
+        print('single thread:              %8.3f s' % plain)
+        for depth in (1, 2, 4):
+            dci = ThreadedDataChunkIterator(BlockIterator(blocks), queue_depth=depth)
+            threaded = write(path, dci)
+            stats = dci.stats
+            print('ThreadedDataChunkIterator:  %8.3f s (queue_depth=%d, read %.3f s, '
+                  'read stalled %.3f s, write stalled %.3f s)'
+                  % (threaded, depth, stats['read_time'], stats['producer_wait'], stats['consumer_wait']))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+Benchmark for converting a DynamicTable read from a file to a pandas DataFrame
+
+Run with::
+
+    python benchmarks/bench_to_dataframe.py
+
+A Units table with 20,000 units of 50 spike times each, a mean waveform of 40 samples and a quality metric for each
+unit is written to a file. The table is then read and converted with ``to_dataframe()``, with only the spike times
+as flat views, with only the quality metric, and with only the first 1,000 units.
+'''
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzlocal
+
+from pynwb import NWBFile, NWBHDF5IO
+
+N_UNITS = 20000
+N_SPIKES = 50
+N_SAMPLES = 40
+
+
+def timed(func, **kwargs):
+    start = time.time()
+    func(**kwargs)
+    return time.time() - start
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    path = os.path.join(tmpdir, 'bench_to_dataframe.nwb')
+    try:
+        nwbfile = NWBFile('a file with many units', 'bench_to_dataframe', datetime(2018, 1, 1, tzinfo=tzlocal()))
+        nwbfile.add_unit_column('quality', 'the quality of each unit')
+        nwbfile.add_units(spike_times=np.random.rand(N_UNITS * N_SPIKES),
+                          waveform_mean=np.random.rand(N_UNITS, N_SAMPLES),
+                          quality=np.random.rand(N_UNITS),
+                          index={'spike_times': np.arange(1, N_UNITS + 1) * N_SPIKES})
+        with NWBHDF5IO(path, 'w') as io:
+            io.write(nwbfile)
+        with NWBHDF5IO(path, 'r') as io:
+            units = io.read().units
+            for label, kwargs in (('all columns', dict()),
+                                  ('spike times, flat', dict(columns=['spike_times'], ragged='flat')),
+                                  ('quality', dict(columns=['quality'])),
+                                  ('first 1000 units', dict(rows=slice(0, 1000)))):
+                print('%-20s %8.3f s' % (label, timed(units.to_dataframe, **kwargs)))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import os
+import subprocess
+import sys
+
 from setuptools import setup, find_packages
+from setuptools.command.develop import develop
 
 import versioneer
 
@@ -12,10 +17,45 @@ print('found these packages:', pkgs)
 
 schema_dir = 'data'
 
+cmdclass = versioneer.get_cmdclass()
+build_py = cmdclass['build_py']
+
+
+def cache_core_namespace(cmd, lib_dir):
+    '''Write the cache of the core namespace that is read when pynwb is imported into the pynwb package in lib_dir'''
+    if cmd.dry_run:
+        return
+    # pynwb is imported with the Python it is built with, so the cache is written for that Python
+    env = dict(os.environ)
+    paths = [os.path.abspath(lib_dir)] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p]
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+    cmd.announce('caching the core namespace in %s' % os.path.join(lib_dir, 'pynwb', schema_dir), level=2)
+    if subprocess.call([sys.executable, '-c', 'import pynwb; pynwb._cache_core_namespace()'], env=env) != 0:
+        # e.g., if the dependencies of pynwb are not installed yet
+        cmd.warn('could not cache the core namespace, so it is read from its YAML files when pynwb is imported')
+
+
+class BuildPy(build_py):
+
+    def run(self):
+        build_py.run(self)
+        cache_core_namespace(self, self.build_lib)
+
+
+class Develop(develop):
+
+    def run(self):
+        develop.run(self)
+        cache_core_namespace(self, 'src')
+
+
+cmdclass['build_py'] = BuildPy
+cmdclass['develop'] = Develop
+
 setup_args = {
     'name': 'pynwb',
     'version': versioneer.get_version(),
-    'cmdclass': versioneer.get_cmdclass(),
+    'cmdclass': cmdclass,
     'description': 'Package for working with Neurodata stored in the NWB format',
     'long_description': readme,
     'long_description_content_type': 'text/x-rst; charset=UTF-8',
@@ -2,7 +2,7 @@
 for reading and writing data in NWB format
 '''
 import os.path
-from copy import deepcopy
+from copy import copy
 from warnings import warn
 
 import h5py
@@ -26,6 +26,9 @@ def __get_resources():
     from os.path import join
     ret = dict()
     ret['namespace_path'] = join(resource_filename(__name__, 'data'), __core_ns_file_name)
+    # the core namespace is cached next to its YAML files when pynwb is built, see _cache_core_namespace
+    ret['cache_dir'] = resource_filename(__name__, 'data')
+    ret['cache_key'] = 'pynwb %s' % __version__
     return ret
 
 
@@ -58,12 +61,12 @@ def get_type_map(**kwargs):
     extensions = getargs('extensions', kwargs)
     type_map = None
     if extensions is None:
-        type_map = deepcopy(__TYPE_MAP)
+        type_map = copy(__TYPE_MAP)
     else:
         if isinstance(extensions, TypeMap):
             type_map = extensions
         else:
-            type_map = deepcopy(__TYPE_MAP)
+            type_map = copy(__TYPE_MAP)
         if isinstance(extensions, list):
             for ext in extensions:
                 if isinstance(ext, str):
@@ -106,10 +109,31 @@ def load_namespaces(**kwargs):
     return __TYPE_MAP.load_namespaces(namespace_path)
 
 
+from ._version import get_versions  # noqa: E402
+__version__ = get_versions()['version']
+del get_versions
+
 # load the core namespace i.e. base NWB specification
 __resources = __get_resources()
 if os.path.exists(__resources['namespace_path']):
-    load_namespaces(__resources['namespace_path'])
+    __TYPE_MAP.load_namespaces(__resources['namespace_path'], cache_dir=__resources['cache_dir'],
+                               cache_key=__resources['cache_key'], write_cache=False)
+
+
+@docval({'name': 'cache_dir', 'type': str,
+         'doc': 'the directory to write the cache in, instead of the directory of the core namespace',
+         'default': None},
+        is_method=False)
+def _cache_core_namespace(**kwargs):
+    '''
+    Write the cache of the core namespace that is read instead of its YAML files when pynwb is imported
+
+    This is run by setup.py when pynwb is built or installed, so that the cache is installed with pynwb.
+    '''
+    cache_dir = getargs('cache_dir', kwargs)
+    ns_catalog = NamespaceCatalog(NWBGroupSpec, NWBDatasetSpec, NWBNamespace)
+    ns_catalog.load_namespaces(__resources['namespace_path'], cache_dir=cache_dir or __resources['cache_dir'],
+                               cache_key=__resources['cache_key'])
 
 
 def available_namespaces():
@@ -196,10 +220,24 @@ class NWBHDF5IO(_HDF5IO):
             {'name': 'extensions', 'type': (str, TypeMap, list),
              'doc': 'a path to a namespace, a TypeMap, or a list consisting paths \
              to namespaces and TypeMaps', 'default': None},
-            {'name': 'file', 'type': h5py.File, 'doc': 'a pre-existing h5py.File object', 'default': None})
+            {'name': 'file', 'type': h5py.File, 'doc': 'a pre-existing h5py.File object', 'default': None},
+            {'name': 'comm', 'type': 'Intracomm',
+             'doc': 'the MPI communicator to use for parallel I/O', 'default': None},
+            {'name': 'read_workers', 'type': int,
+             'doc': 'the number of threads that decompress the chunks of gzip-compressed datasets when reading',
+             'default': None},
+            {'name': 'chunk_cache_size', 'type': int,
+             'doc': 'the maximum number of bytes of decoded chunks of compressed datasets to keep in memory. '
+                    'Defaults to the size set with NWBHDF5IO.set_chunk_cache_size', 'default': None},
+            {'name': 'scan_metadata', 'type': bool,
+             'doc': 'whether to read the links and attributes of all objects in one traversal of the file',
+             'default': False})
     def __init__(self, **kwargs):
-        path, mode, manager, extensions, load_namespaces, file_obj =\
-            popargs('path', 'mode', 'manager', 'extensions', 'load_namespaces', 'file', kwargs)
+        path, mode, manager, extensions, load_namespaces, file_obj, comm, read_workers, chunk_cache_size, \
+            scan_metadata = popargs('path', 'mode', 'manager', 'extensions', 'load_namespaces', 'file', 'comm',
+                                    'read_workers', 'chunk_cache_size', 'scan_metadata', kwargs)
+        if chunk_cache_size is None:
+            chunk_cache_size = NWBHDF5IO.__chunk_cache_size
         if load_namespaces:
             if manager is not None:
                 warn("loading namespaces from file - ignoring 'manager'")
@@ -225,7 +263,25 @@ class NWBHDF5IO(_HDF5IO):
                 manager = get_manager(extensions=extensions)
             elif manager is None:
                 manager = get_manager()
-        super(NWBHDF5IO, self).__init__(path, manager=manager, mode=mode, file=file_obj)
+        super(NWBHDF5IO, self).__init__(path, manager=manager, mode=mode, file=file_obj, comm=comm,
+                                        read_workers=read_workers, chunk_cache_size=chunk_cache_size,
+                                        scan_metadata=scan_metadata)
+
+    __chunk_cache_size = None
+
+    @staticmethod
+    @docval({'name': 'size', 'type': int,
+             'doc': 'the maximum number of bytes of decoded chunks each NWBHDF5IO keeps in memory, or None to '
+                    'disable the cache', 'default': None},
+            is_method=False)
+    def set_chunk_cache_size(**kwargs):
+        '''Set the default size of the cache of decoded chunks of all NWBHDF5IO objects created afterwards'''
+        NWBHDF5IO.__chunk_cache_size = getargs('size', kwargs)
+
+    @staticmethod
+    def get_chunk_cache_size():
+        '''Get the default size of the cache of decoded chunks of NWBHDF5IO objects'''
+        return NWBHDF5IO.__chunk_cache_size
 
 
 from . import io as __io  # noqa: F401,E402
@@ -244,7 +300,3 @@ from . import ogen  # noqa: F401,E402
 from . import ophys  # noqa: F401,E402
 from . import retinotopy  # noqa: F401,E402
 from . import legacy  # noqa: F401,E402
-
-from ._version import get_versions  # noqa: E402
-__version__ = get_versions()['version']
-del get_versions
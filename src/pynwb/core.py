@@ -1,9 +1,14 @@
-from h5py import RegionReference
+from collections import OrderedDict
+from itertools import chain
+
+from h5py import RegionReference, Dataset
 import numpy as np
 import pandas as pd
 
 from .form.utils import docval, getargs, ExtenderMeta, call_docval_func, popargs, get_docval, fmt_docval_args, pystr
 from .form import Container, Data, DataRegion, get_region_slicer
+from .form.data_utils import DataIO, ExtendedData, GrowableArray
+from .form.query import FORMDataset
 
 from . import CORE_NAMESPACE, register_class
 from six import with_metaclass
@@ -26,6 +31,79 @@ def set_parents(container, parent):
     return ret
 
 
+# the number of values between two ranges below which reading the values in between is cheaper than another read
+_MAX_GAP = 4096
+
+
+def _row_indices(rows, n, name):
+    '''
+    Get the indices of the given rows of an object of length n as a non-negative integer array
+
+    rows can be a slice, a list or array of integers, or a boolean mask of length n.
+    '''
+    if isinstance(rows, slice):
+        return np.arange(*rows.indices(n))
+    rows = np.asarray(rows)
+    if rows.dtype == bool:
+        if rows.shape != (n,):
+            raise IndexError("boolean index of shape %s does not match '%s' of length %d" % (rows.shape, name, n))
+        return np.flatnonzero(rows)
+    if rows.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if rows.dtype.kind not in 'iu':
+        raise IndexError("cannot index '%s' with rows of type %s" % (name, rows.dtype))
+    rows = rows.astype(np.int64)
+    rows = np.where(rows < 0, rows + n, rows)
+    if len(rows) and (rows.min() < 0 or rows.max() >= n):
+        raise IndexError("row index out of range for '%s' of length %d" % (name, n))
+    return rows
+
+
+def _read_ranges(data, starts, ends):
+    '''
+    Read the values of data from start to end of each range with a single read for each run of ranges that are
+    adjacent or overlap, or that are separated by at most _MAX_GAP values, which are read and discarded. Return the
+    values that were read and the start of each range in them.
+    '''
+    if isinstance(data, DataIO):
+        data = data.data
+    if len(starts) == 0:
+        return data[0:0], starts
+    order = np.argsort(starts, kind='mergesort')
+    s = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    new_run = np.ones(len(s), dtype=bool)
+    new_run[1:] = s[1:] > reach[:-1] + _MAX_GAP
+    run_first = np.flatnonzero(new_run)
+    run_starts = s[run_first]
+    run_ends = reach[np.append(run_first[1:] - 1, len(s) - 1)]
+    chunks = [data[int(a):int(b)] for a, b in zip(run_starts, run_ends)]
+    if len(chunks) == 1:
+        buf = chunks[0]
+    elif all(isinstance(c, np.ndarray) for c in chunks):
+        buf = np.concatenate(chunks)
+    else:
+        buf = list(chain.from_iterable(chunks))
+    # the position of the start of each run, and then each range, in the values that were read
+    run_pos = np.cumsum(run_ends - run_starts) - (run_ends - run_starts)
+    run_ids = np.cumsum(new_run) - 1
+    buf_starts = np.empty(len(s), dtype=np.int64)
+    buf_starts[order] = run_pos[run_ids] + (s - run_starts[run_ids])
+    return buf, buf_starts
+
+
+def _read_rows(data, rows):
+    '''Read the given rows of data, reading rows that are close to each other with a single read'''
+    if isinstance(rows, slice):
+        if isinstance(data, DataIO):
+            data = data.data
+        return data[rows]
+    buf, pos = _read_ranges(data, rows, rows + 1)
+    if isinstance(buf, np.ndarray):
+        return buf[pos]
+    return [buf[i] for i in pos]
+
+
 class LabelledDict(dict):
     '''
     A dict wrapper class for aggregating Timeseries
@@ -131,6 +209,7 @@ class NWBBaseType(with_metaclass(ExtenderMeta, Container)):
                 msg = "can't set attribute '%s' -- already set" % name
                 raise AttributeError(msg)
             self.fields[name] = val
+            self.set_modified()
 
         return nwbbt_setter
 
@@ -314,22 +393,54 @@ class NWBData(NWBBaseType, Data):
         return self.data[args]
 
     def append(self, arg):
-        if isinstance(self.data, list):
+        if isinstance(self.data, list) and len(self.data) == 0 and GrowableArray.can_store(arg):
+            # store numbers in a typed array that grows in place, rather than as Python objects in a list
+            self.__data = GrowableArray()
+        if isinstance(self.data, GrowableArray):
+            try:
+                self.__data.append(arg)
+            except (TypeError, ValueError, OverflowError):
+                # not a number, so store the values as Python objects
+                self.__data = self.__data.tolist()
+                self.__data.append(arg)
+        elif isinstance(self.data, (list, ExtendedData)):
             self.data.append(arg)
         elif isinstance(self.data, np.ndarray):
             self.__data = np.append(self.__data, [arg])
+        elif isinstance(self.data, (Dataset, FORMDataset)):
+            # keep the rows in memory until they are written to the end of the dataset
+            self.__data = ExtendedData(self.__data)
+            self.__data.append(arg)
         else:
             msg = "NWBData cannot append to object of type '%s'" % type(self.__data)
             raise ValueError(msg)
+        if not self.modified:
+            self.set_modified()
 
     def extend(self, arg):
-        if isinstance(self.data, list):
+        if isinstance(arg, np.ndarray) and arg.dtype.kind in 'SU':
+            # store strings as Python strings, like the values that are appended one at a time
+            arg = arg.tolist()
+        if isinstance(self.data, list) and len(self.data) == 0 and GrowableArray.can_store_all(arg):
+            self.__data = GrowableArray()
+        if isinstance(self.data, GrowableArray):
+            try:
+                self.__data.extend(arg)
+            except (TypeError, ValueError, OverflowError):
+                self.__data = self.__data.tolist()
+                self.__data.extend(arg)
+        elif isinstance(self.data, (list, ExtendedData)):
             self.data.extend(arg)
         elif isinstance(self.data, np.ndarray):
             self.__data = np.append(self.__data, [arg])
+        elif isinstance(self.data, (Dataset, FORMDataset)):
+            self.__data = ExtendedData(self.__data)
+            self.__data.extend(arg)
         else:
             msg = "NWBData cannot extend object of type '%s'" % type(self.__data)
             raise ValueError(msg)
+        if not self.modified:
+            self.set_modified()
 
 
 @register_class('Index', CORE_NAMESPACE)
@@ -370,7 +481,7 @@ class VectorData(NWBData):
     @docval({'name': 'val', 'type': None, 'doc': 'the value to add to this column'})
     def add_row(self, **kwargs):
         val = getargs('val', kwargs)
-        self.data.append(val)
+        self.append(val)
 
 
 @register_class('VectorIndex', CORE_NAMESPACE)
@@ -391,7 +502,7 @@ class VectorIndex(Index):
 
     def add_vector(self, arg):
         self.target.extend(arg)
-        self.data.append(len(self.target))
+        self.append(len(self.target))
 
     def add_row(self, arg):
         self.add_vector(arg)
@@ -399,18 +510,78 @@ class VectorIndex(Index):
     def __getitem_helper(self, arg):
         start = 0 if arg == 0 else self.data[arg-1]
         end = self.data[arg]
-        return self.target[start:end]
+        ret = self.target[start:end]
+        if isinstance(self.target.data, GrowableArray) and isinstance(ret, np.ndarray):
+            # the rows of a column that is built in memory are lists, whether or not its values are numbers
+            ret = ret.tolist()
+        return ret
 
     def __getitem__(self, arg):
-        if isinstance(arg, slice):
-            indices = list(range(*arg.indices(len(self.data))))
-            ret = list()
-            for i in indices:
-                ret.append(self.__getitem_helper(i))
-            return ret
+        if isinstance(arg, (slice, list, np.ndarray)):
+            return self.get_rows(arg)
         else:
             return self.__getitem_helper(arg)
 
+    @docval({'name': 'rows', 'type': (slice, list, tuple, np.ndarray), 'doc': 'the rows to get',
+             'default': slice(None)},
+            {'name': 'flat', 'type': bool, 'default': False,
+             'doc': 'return the values of all rows concatenated and the offsets of the end of each row in them, '
+                    'instead of a list with the values of each row'})
+    def get_rows(self, **kwargs):
+        '''
+        Get the values of many rows at once. The part of the index that the rows need is read at once, and the
+        values of rows that are adjacent or overlap in the target are read with a single read, so that a slice of
+        rows is read with two reads. Rows that are close to each other in the target are also read with a single
+        read. If *flat* is True, a tuple of the values and the offsets of the end of each
+        row is returned, where the values are a view of the target if the target is an array and the rows are
+        adjacent in it. The values of an indexed :py:class:`~pynwb.core.DynamicTableRegion` are the indices of the
+        rows of its table.
+        '''
+        rows, flat = getargs('rows', 'flat', kwargs)
+        starts, ends = self.__get_bounds(rows)
+        if isinstance(self.target, DynamicTableRegion) and not flat:
+            # the rows of an indexed DynamicTableRegion are DynamicTableRegions
+            return [self.target[int(s):int(e)] for s, e in zip(starts, ends)]
+        buf, buf_starts = _read_ranges(self.target.data, starts, ends)
+        if len(starts) == 0:
+            return (buf, ends) if flat else list()
+        lengths = ends - starts
+        offsets = np.cumsum(lengths)
+        buf_ends = buf_starts + lengths
+        adjacent = np.array_equal(buf_starts[1:], buf_ends[:-1])
+        if isinstance(buf, np.ndarray):
+            if adjacent:
+                values = buf[buf_starts[0]:buf_ends[-1]]
+            else:
+                # gather the values of each row
+                pos = np.arange(offsets[-1]) + np.repeat(buf_starts - (offsets - lengths), lengths)
+                values = buf[pos]
+            if flat:
+                return values, offsets
+            ret = np.split(values, offsets[:-1])
+            if isinstance(self.target.data, GrowableArray):
+                # the rows of a column that is built in memory are lists, whether or not its values are numbers
+                ret = [r.tolist() for r in ret]
+            return ret
+        ret = [buf[s:e] for s, e in zip(buf_starts, buf_ends)]
+        if flat:
+            return buf[buf_starts[0]:buf_ends[-1]] if adjacent else list(chain.from_iterable(ret)), offsets
+        return ret
+
+    def __get_bounds(self, rows):
+        # get the start and end of each row in the target, reading the part of the index the rows need at once
+        rows = _row_indices(rows, len(self.data), self.name)
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        first = max(int(rows.min()) - 1, 0)
+        index = self.data
+        if isinstance(index, DataIO):
+            index = index.data
+        index = np.asarray(index[first:int(rows.max()) + 1], dtype=np.int64)
+        ends = index[rows - first]
+        starts = np.where(rows > 0, index[np.maximum(rows - 1 - first, 0)], 0)
+        return starts, ends
+
 
 @register_class('ElementIdentifiers', CORE_NAMESPACE)
 class ElementIdentifiers(NWBData):
@@ -957,7 +1128,7 @@ class DynamicTable(NWBDataInterface):
                     if len(id) > 0:
                         raise ValueError("must provide same number of ids as length of columns")
                     else:
-                        id.data.extend(range(lens[0]))
+                        id.extend(range(lens[0]))
         else:
             columns = list()
 
@@ -1113,7 +1284,7 @@ class DynamicTable(NWBDataInterface):
             row_id = data.pop('id', None)
         if row_id is None:
             row_id = len(self)
-        self.id.data.append(row_id)
+        self.id.append(row_id)
 
         for colname, colnum in self.__colids.items():
             if colname not in data:
@@ -1124,6 +1295,120 @@ class DynamicTable(NWBDataInterface):
             else:
                 c.add_row(data[colname])
 
+    @docval({'name': 'data', 'type': dict, 'default': None,  # noqa: C901
+             'doc': 'a dict with an array of values for each column, with one value for each row'},
+            {'name': 'id', 'type': 'array_data', 'doc': 'the IDs for the rows', 'default': None},
+            {'name': 'index', 'type': dict, 'default': None,
+             'doc': 'the offsets of the end of each row in the values of each indexed column'},
+            allow_extra=True)
+    def add_rows(self, **kwargs):
+        '''
+        Add many rows to the table at once. The values of each column are given as an array with one value for each
+        row. The values of an indexed column are given either as a list with a sequence of values for each row, or as
+        the values of all rows concatenated, together with the offsets of the end of each row in *index*, like the
+        data of a :py:class:`~pynwb.core.VectorIndex`. All columns are checked before any rows are added, and the
+        values of each column are added in a single call. If *id* is not provided, it will auto-increment.
+        '''
+        data, row_ids, index = popargs('data', 'id', 'index', kwargs)
+        data = data if data is not None else kwargs
+        index = index if index is not None else dict()
+
+        extra_columns = set(data.keys()) - set(self.__colids.keys())
+        missing_columns = set(self.__colids.keys()) - set(data.keys())
+
+        # check to see if any of the extra columns just need to be added
+        new_columns = list()
+        if extra_columns:
+            for col in self.__columns__:
+                if col['name'] in extra_columns:
+                    if data[col['name']] is not None:
+                        new_columns.append(col)
+                    extra_columns.remove(col['name'])
+        for name in index:
+            if name not in data:
+                extra_columns.add(name)
+
+        if extra_columns or missing_columns:
+            raise ValueError(
+                '\n'.join([
+                    'row data keys don\'t match available columns',
+                    'you supplied {} extra keys: {}'.format(len(extra_columns), extra_columns),
+                    'and were missing {} keys: {}'.format(len(missing_columns), missing_columns)
+                ])
+            )
+
+        indexed = set(name for name, c in self.__colids.items() if isinstance(self.__df_cols[c], VectorIndex))
+        indexed.update(col['name'] for col in new_columns if col.get('index', False))
+        for name in index:
+            if name not in indexed:
+                raise ValueError("column '%s' is not indexed" % name)
+
+        # check all values before adding any of them
+        blocks = dict()
+        n_rows = None
+        for colname in list(self.__colids.keys()) + [col['name'] for col in new_columns]:
+            values = data[colname]
+            if colname in indexed:
+                values, offsets = self.__flatten(colname, values, index.get(colname))
+                block = (values, offsets)
+                n = len(offsets)
+            else:
+                if isinstance(values, (str, bytes)) or not hasattr(values, '__len__'):
+                    raise ValueError("the values of column '%s' must be an array with a value for each row" % colname)
+                block = values
+                n = len(values)
+            if n_rows is None:
+                n_rows = n
+            elif n != n_rows:
+                raise ValueError("column '%s' has %d rows, expected %d rows" % (colname, n, n_rows))
+            blocks[colname] = block
+        if n_rows is None:
+            n_rows = 0 if row_ids is None else len(row_ids)
+
+        if row_ids is None:
+            row_ids = np.arange(len(self), len(self) + n_rows)
+        elif len(row_ids) != n_rows:
+            raise ValueError("must provide the same number of ids as rows, expected %d ids" % n_rows)
+
+        for col in new_columns:
+            self.add_column(col['name'], col['description'],
+                            index=col.get('index', False),
+                            table=col.get('table', False))
+        self.id.extend(row_ids)
+        for colname, colnum in self.__colids.items():
+            c = self.__df_cols[colnum]
+            if isinstance(c, VectorIndex):
+                values, offsets = blocks[colname]
+                start = len(c.target)
+                c.target.extend(values)
+                c.extend(offsets + start)
+            else:
+                c.extend(blocks[colname])
+
+    @staticmethod
+    def __flatten(colname, values, offsets):
+        '''Get the concatenated values and the offsets of the end of each row of an indexed column'''
+        if offsets is None:
+            # a sequence of values for each row
+            lengths = np.fromiter((len(row) for row in values), dtype=np.int64, count=len(values))
+            if len(values) > 0 and all(isinstance(row, np.ndarray) for row in values):
+                values = np.concatenate(values)
+            else:
+                values = list(chain.from_iterable(values))
+            return values, np.cumsum(lengths)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim != 1:
+            raise ValueError("the offsets of column '%s' must be a one-dimensional array" % colname)
+        if len(offsets) > 0:
+            if offsets[0] < 0 or np.any(np.diff(offsets) < 0):
+                raise ValueError("the offsets of column '%s' must be non-negative and non-decreasing" % colname)
+            if offsets[-1] != len(values):
+                raise ValueError("the last offset of column '%s' is %d, but there are %d values"
+                                 % (colname, offsets[-1], len(values)))
+        elif len(values) > 0:
+            raise ValueError("column '%s' has values but no offsets" % colname)
+        return values, offsets
+
     @docval({'name': 'name', 'type': str, 'doc': 'the name of this VectorData'},
             {'name': 'description', 'type': str, 'doc': 'a description for this column'},
             {'name': 'data', 'type': ('array_data', 'data'),
@@ -1238,19 +1523,85 @@ class DynamicTable(NWBDataInterface):
             return self[key]
         return default
 
-    def to_dataframe(self):
-        '''Produce a pandas DataFrame containing this table's data.
+    @docval({'name': 'columns', 'type': (list, tuple), 'doc': 'the names of the columns to include',
+             'default': None},
+            {'name': 'rows', 'type': (slice, list, tuple, np.ndarray), 'doc': 'the rows to include',
+             'default': None},
+            {'name': 'ragged', 'type': str, 'default': 'list',
+             'doc': "how to include indexed columns: 'list' to include the values of each row as they are returned "
+                    "by indexing the column, 'flat' to include views of an array of the values of all rows, or "
+                    "'skip' to leave them out"},
+            {'name': 'resolve_regions', 'type': bool, 'default': False,
+             'doc': 'include the rows of the tables that DynamicTableRegion columns refer to, instead of the '
+                    'indices of the rows'})
+    def to_dataframe(self, **kwargs):
         '''
+        Produce a pandas DataFrame containing this table's data.
 
-        data = {}
-        for name in self.colnames:
+        Only the given columns and rows are read, reading rows that are close to each other with a single read. The
+        values of a DynamicTableRegion column are the indices of the rows of its table. If *resolve_regions* is
+        True, each of these columns is replaced with the columns of its table, prefixed with the name of the column
+        and read once for all rows, or, if the column is indexed, with a DataFrame of the rows of its table for each
+        row.
+        '''
+        columns, rows, ragged, resolve_regions = getargs('columns', 'rows', 'ragged', 'resolve_regions', kwargs)
+        if ragged not in ('list', 'flat', 'skip'):
+            raise ValueError("ragged must be 'list', 'flat' or 'skip', not '%s'" % ragged)
+        if columns is None:
+            columns = self.colnames
+        else:
+            for name in columns:
+                if name not in self.__colids:
+                    raise KeyError("column '%s' not found in DynamicTable '%s'" % (name, self.name))
+        if rows is None:
+            rows = slice(None)
+        if not isinstance(rows, slice) or rows.step not in (None, 1):
+            rows = _row_indices(rows, len(self), self.name)
+        n_rows = len(range(*rows.indices(len(self)))) if isinstance(rows, slice) else len(rows)
+
+        data = OrderedDict()
+        for name in columns:
             col = self.__df_cols[self.__colids[name]]
-            if isinstance(col.data, np.ndarray) and col.data.ndim > 1:
-                data[name] = [x for x in col[:]]
+            if isinstance(col, VectorIndex):
+                if ragged == 'skip':
+                    continue
+                region = isinstance(col.target, DynamicTableRegion)
+                if ragged == 'list' and not region:
+                    data[name] = col.get_rows(rows)
+                    continue
+                values, offsets = col.get_rows(rows, flat=True)
+                if isinstance(values, np.ndarray) or region:
+                    values = np.asarray(values)
+                    values = np.split(values, offsets[:-1]) if n_rows > 0 else list()
+                else:
+                    starts = np.concatenate(([0], offsets[:-1]))
+                    values = [values[s:e] for s, e in zip(starts, offsets)]
+                if region and resolve_regions:
+                    values = self.__join_rows(col.target.table, values)
+                data[name] = values
             else:
-                data[name] = col[:]
+                values = _read_rows(col.data, rows)
+                if isinstance(col, DynamicTableRegion) and resolve_regions:
+                    joined = self.__join_rows(col.table, [np.asarray(values)])[0]
+                    for c in joined.columns:
+                        data['%s_%s' % (name, c)] = joined[c].values
+                elif isinstance(values, np.ndarray) and values.ndim > 1:
+                    data[name] = list(values)
+                else:
+                    data[name] = values
 
-        return pd.DataFrame(data, index=pd.Index(name=self.id.name, data=self.id.data))
+        ids = _read_rows(self.id.data, rows)
+        return pd.DataFrame(data, index=pd.Index(name=self.id.name, data=ids), columns=list(data.keys()))
+
+    @staticmethod
+    def __join_rows(table, indices):
+        '''Get a DataFrame of the rows of table for each array of row indices, reading each row once'''
+        if len(indices) == 0:
+            return list()
+        unique, inverse = np.unique(np.concatenate(indices).astype(np.int64), return_inverse=True)
+        df = table.to_dataframe(rows=unique)
+        offsets = np.cumsum([len(i) for i in indices])
+        return [df.iloc[inv] for inv in np.split(inverse, offsets[:-1])]
 
     @classmethod
     @docval(
@@ -1362,7 +1713,7 @@ class DynamicTableRegion(VectorData):
             arg2 = key[1]
             return self.table[self.data[arg1], arg2]
         elif isinstance(key, slice):
-            data = np.arange(*key.indices(len(self.table)))
+            data = self.data[key]
             return DynamicTableRegion(name=self.name, data=data, description=self.description, table=self.table)
         else:
             if isinstance(key, int):
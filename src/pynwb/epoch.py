@@ -7,6 +7,7 @@ from . import register_class, CORE_NAMESPACE
 from .base import TimeSeries
 from .core import DynamicTable, ElementIdentifiers
 
+import numpy as np
 import pandas as pd
 
 
@@ -62,6 +63,64 @@ class TimeIntervals(DynamicTable):
             rkwargs['timeseries'] = timeseries
         return super(TimeIntervals, self).add_row(**rkwargs)
 
+    @docval({'name': 'start_time', 'type': 'array_data', 'doc': 'Start time of each epoch, in seconds'},
+            {'name': 'stop_time', 'type': 'array_data', 'doc': 'Stop time of each epoch, in seconds'},
+            {'name': 'tags', 'type': 'array_data', 'default': None,
+             'doc': 'user-defined tags for each epoch, or the tags of all epochs if the offsets of the tags of each '
+                    'epoch are given in *index*'},
+            {'name': 'timeseries', 'type': (list, tuple, TimeSeries), 'default': None,
+             'doc': 'the TimeSeries all of the epochs apply to'},
+            {'name': 'id', 'type': 'array_data', 'doc': 'the ID for each epoch', 'default': None},
+            {'name': 'index', 'type': dict, 'default': None,
+             'doc': 'the offsets of the end of each epoch in the values of each indexed column'},
+            allow_extra=True)
+    def add_intervals(self, **kwargs):
+        """
+        Add many epochs at once. See :py:meth:`~pynwb.core.DynamicTable.add_rows` for more details.
+        """
+        tags, timeseries, row_ids, index = popargs('tags', 'timeseries', 'id', 'index', kwargs)
+        start_time, stop_time = getargs('start_time', 'stop_time', kwargs)
+        index = dict() if index is None else dict(index)
+        rkwargs = dict(kwargs)
+        if tags is not None:
+            if 'tags' not in index:
+                tags = [[s.strip() for s in t.split(",") if not s.isspace()] if isinstance(t, str) else t
+                        for t in tags]
+            rkwargs['tags'] = tags
+        if not (timeseries is None or (isinstance(timeseries, (tuple, list)) and len(timeseries) == 0)):
+            if isinstance(timeseries, TimeSeries):
+                timeseries = [timeseries]
+            start_time = np.asarray(start_time, dtype=float)
+            stop_time = np.asarray(stop_time, dtype=float)
+            counts = [self.__calculate_idx_counts(start_time, stop_time, ts) for ts in timeseries]
+            tmp = list()
+            for i in range(len(start_time)):
+                for (idx_start, count), ts in zip(counts, timeseries):
+                    tmp.append((int(idx_start[i]), int(count[i]), ts))
+            rkwargs['timeseries'] = tmp
+            index['timeseries'] = np.arange(1, len(start_time) + 1) * len(timeseries)
+        return super(TimeIntervals, self).add_rows(data=rkwargs, id=row_ids, index=index)
+
+    @staticmethod
+    def __calculate_idx_counts(start_time, stop_time, ts_data):
+        # the same as __calculate_idx_count, for arrays of start and stop times
+        if isinstance(ts_data.timestamps, DataIO):
+            ts_timestamps = ts_data.timestamps.data
+        else:
+            ts_timestamps = ts_data.timestamps
+        ts_starting_time = ts_data.starting_time
+        ts_rate = ts_data.rate
+        if ts_starting_time is not None and ts_rate:
+            start_idx = ((start_time - ts_starting_time)*ts_rate).astype(int)
+            stop_idx = ((stop_time - ts_starting_time)*ts_rate).astype(int)
+        elif len(ts_timestamps) > 0:
+            timestamps = np.asarray(ts_timestamps)
+            start_idx = np.searchsorted(timestamps, start_time, side='left')
+            stop_idx = np.searchsorted(timestamps, stop_time, side='left')
+        else:
+            raise ValueError("TimeSeries object must have timestamps or starting_time and rate")
+        return start_idx, stop_idx - start_idx
+
     def __calculate_idx_count(self, start_time, stop_time, ts_data):
         if isinstance(ts_data.timestamps, DataIO):
             ts_timestamps = ts_data.timestamps.data
@@ -432,6 +432,25 @@ class NWBFile(MultiContainerInterface):
             self.epoch_tags.update(kwargs['tags'])
         call_docval_func(self.epochs.add_interval, kwargs)
 
+    @docval(*get_docval(TimeIntervals.add_intervals), allow_extra=True)
+    def add_epochs(self, **kwargs):
+        """
+        Add many epochs at once.
+        See :py:meth:`~pynwb.epoch.TimeIntervals.add_intervals` for more details.
+        """
+        self.__check_epochs()
+        tags = kwargs['tags']
+        if tags is not None:
+            index = kwargs['index']
+            if index is not None and 'tags' in index:
+                self.epoch_tags.update(tags)
+            else:
+                for t in tags:
+                    if isinstance(t, str):
+                        t = [s.strip() for s in t.split(",") if not s.isspace()]
+                    self.epoch_tags.update(t)
+        call_docval_func(self.epochs.add_intervals, kwargs)
+
     def __check_electrodes(self):
         if self.electrodes is None:
             self.electrodes = ElectrodeTable()
@@ -469,6 +488,31 @@ class NWBFile(MultiContainerInterface):
             d['group_name'] = d['group'].name
         call_docval_func(self.electrodes.add_row, d)
 
+    @docval({'name': 'x', 'type': 'array_data', 'doc': 'the x coordinate of the position of each electrode'},
+            {'name': 'y', 'type': 'array_data', 'doc': 'the y coordinate of the position of each electrode'},
+            {'name': 'z', 'type': 'array_data', 'doc': 'the z coordinate of the position of each electrode'},
+            {'name': 'imp', 'type': 'array_data', 'doc': 'the impedance of each electrode'},
+            {'name': 'location', 'type': 'array_data',
+             'doc': 'the location of each electrode within the subject e.g. brain region'},
+            {'name': 'filtering', 'type': 'array_data', 'doc': 'description of hardware filtering of each electrode'},
+            {'name': 'group', 'type': 'array_data', 'doc': 'the ElectrodeGroup object of each electrode'},
+            {'name': 'id', 'type': 'array_data', 'doc': 'a unique identifier for each electrode', 'default': None},
+            allow_extra=True)
+    def add_electrodes(self, **kwargs):
+        """
+        Add many electrodes to the electrode table at once.
+        See :py:meth:`~pynwb.core.DynamicTable.add_rows` for more details.
+
+        Required fields are *x*, *y*, *z*, *imp*, *location*, *filtering*,
+        *group* and any columns that have been added
+        (through calls to `add_electrode_columns`).
+        """
+        self.__check_electrodes()
+        row_ids = kwargs.pop('id')
+        if kwargs.get('group_name', None) is None:
+            kwargs['group_name'] = [g.name for g in kwargs['group']]
+        self.electrodes.add_rows(data=kwargs, id=row_ids)
+
     @docval({'name': 'region', 'type': (slice, list, tuple), 'doc': 'the indices of the table'},
             {'name': 'description', 'type': str, 'doc': 'a brief description of what this electrode is'},
             {'name': 'name', 'type': str, 'doc': 'the name of this container', 'default': 'electrodes'})
@@ -509,6 +553,15 @@ class NWBFile(MultiContainerInterface):
         self.__check_units()
         call_docval_func(self.units.add_unit, kwargs)
 
+    @docval(*get_docval(Units.add_units), allow_extra=True)
+    def add_units(self, **kwargs):
+        """
+        Add many units to the unit table at once.
+        See :py:meth:`~pynwb.misc.Units.add_units` for more details.
+        """
+        self.__check_units()
+        call_docval_func(self.units.add_units, kwargs)
+
     def __check_trials(self):
         if self.trials is None:
             self.trials = TimeIntervals('trials', 'experimental trials')
@@ -534,6 +587,15 @@ class NWBFile(MultiContainerInterface):
         self.__check_trials()
         call_docval_func(self.trials.add_interval, kwargs)
 
+    @docval(*get_docval(TimeIntervals.add_intervals), allow_extra=True)
+    def add_trials(self, **kwargs):
+        """
+        Add many trials to the trial table at once.
+        See :py:meth:`~pynwb.epoch.TimeIntervals.add_intervals` for more details.
+        """
+        self.__check_trials()
+        call_docval_func(self.trials.add_intervals, kwargs)
+
     def __check_invalid_times(self):
         if self.invalid_times is None:
             self.invalid_times = TimeIntervals('invalid_times', 'time intervals to be removed from analysis')
@@ -1,12 +1,18 @@
 from copy import copy
-from collections import Iterable
-from six import binary_type, text_type
-from h5py import Group, Dataset, RegionReference, Reference, special_dtype
+from collections import Iterable, OrderedDict
+from six import binary_type, text_type, integer_types
+from six.moves import range as six_range
+from h5py import Group, Dataset, RegionReference, Reference, special_dtype, h5a, h5d, h5g, h5l, h5o, h5r, h5s, h5t
+import base64
+import itertools
 import json
 import h5py
 import numpy as np
 import warnings
 import os
+import posixpath
+import threading
+import zlib
 
 from ...query import FORMDataset
 from ...array import Array
@@ -35,6 +41,702 @@ class H5Dataset(FORMDataset):
     def ref(self):
         return self.dataset.ref
 
+    @property
+    def shape(self):
+        return self.dataset.shape
+
+    def __getitem__(self, key):
+        workers = getattr(self.__io, 'read_workers', None)
+        cache = getattr(self.__io, 'chunk_cache', None)
+        if workers is not None or cache is not None:
+            ret = self.__read_chunks(key, workers, cache)
+            if ret is not None:
+                return ret
+        return super(H5Dataset, self).__getitem__(key)
+
+    @classmethod
+    def __can_read_chunks(cls, dset):
+        """Check if the chunks of dset can be read with read_direct_chunk and decompressed with zlib"""
+        if not hasattr(dset.id, 'read_direct_chunk'):
+            return False
+        # only gzip, optionally preceded by the shuffle filter, is implemented here
+        return dset.compression == 'gzip' and not dset.fletcher32 and dset.scaleoffset is None
+
+    @classmethod
+    def __read_raw_chunk(cls, dset, offset):
+        """Read the compressed chunk of dset at offset, or return None if it has not been written"""
+        try:
+            filter_mask, raw = dset.id.read_direct_chunk(offset)
+        except Exception:
+            return None
+        # a set bit in the filter mask means that a filter was skipped for the chunk
+        return raw if filter_mask == 0 else None
+
+    @classmethod
+    def __selection_bounds(cls, key, shape):
+        """
+        Get the start and stop of a selection in each dimension, and the dimensions selected with an integer,
+        or None if the selection is not a combination of integers and slices with step 1
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) > len(shape):
+            return None
+        key = key + (slice(None),) * (len(shape) - len(key))
+        bounds = list()
+        squeeze = list()
+        for i, (k, size) in enumerate(zip(key, shape)):
+            if isinstance(k, (int, np.integer)) and not isinstance(k, bool):
+                k = k + size if k < 0 else k
+                if not 0 <= k < size:
+                    return None
+                bounds.append((k, k + 1))
+                squeeze.append(i)
+            elif isinstance(k, slice):
+                start, stop, step = k.indices(size)
+                if step != 1:
+                    return None
+                bounds.append((start, max(start, stop)))
+            else:
+                return None
+        return bounds, squeeze
+
+    def __read_chunks(self, key, workers, cache):
+        """
+        Read a selection of a chunked dataset one chunk at a time
+
+        Chunks are taken from cache if they are in it, and added to it after they are read. If workers is given,
+        the chunks of gzip-compressed datasets are read with read_direct_chunk, and the read_pool of workers threads
+        of the IO object decompresses them. Returns None if the dataset or the selection is not supported, or if neither
+        cache nor threads would be used.
+        """
+        dset = self.dataset
+        if not isinstance(dset, Dataset) or dset.chunks is None or dset.dtype.kind not in 'iuf':
+            return None
+        if workers is not None and not self.__can_read_chunks(dset):
+            workers = None
+        if workers is None and cache is None:
+            return None
+        selection = self.__selection_bounds(key, dset.shape)
+        if selection is None:
+            return None
+        bounds, squeeze = selection
+        ranges = [range(b // c * c, e, c) for (b, e), c in zip(bounds, dset.chunks)]
+        n_chunks = int(np.prod([len(r) for r in ranges]))
+        if n_chunks == 0 or (cache is None and n_chunks < 2):
+            return None
+        ret = np.empty([e - b for b, e in bounds], dtype=dset.dtype)
+        # the edge chunks are clipped to the shape of the dataset, so they are not valid once it is resized
+        dataset_key = (dset.file.filename, dset.name, dset.shape)
+        missing = list()
+        for chunk_offset in itertools.product(*ranges):
+            chunk = None if cache is None else cache.get((dataset_key, chunk_offset))
+            if chunk is None:
+                missing.append(chunk_offset)
+            else:
+                self.__copy_chunk(dset, chunk_offset, chunk, bounds, ret)
+        if workers is None:
+            decoded = ((o, self.__copy_chunk(dset, o, dset[self.__chunk_region(dset, o)], bounds, ret))
+                       for o in missing)
+        else:
+            decoded = self.__decode_chunks(dset, missing, bounds, ret, workers, self.__io.read_pool)
+        for chunk_offset, chunk in decoded:
+            if cache is not None:
+                cache.put((dataset_key, chunk_offset), chunk)
+        if len(squeeze) > 0:
+            ret = ret[tuple(0 if i in squeeze else slice(None) for i in range(ret.ndim))]
+        return ret
+
+    @classmethod
+    def __chunk_region(cls, dset, chunk_offset):
+        """Get the part of the chunk at chunk_offset that is within the dataset"""
+        return tuple(slice(o, min(o + c, n)) for o, c, n in zip(chunk_offset, dset.chunks, dset.shape))
+
+    @classmethod
+    def __copy_chunk(cls, dset, chunk_offset, chunk, bounds, ret):
+        """Copy the part of a chunk that overlaps the selection given by bounds into ret, and return the chunk"""
+        src = list()
+        dst = list()
+        for (b, e), o, c in zip(bounds, chunk_offset, dset.chunks):
+            start, stop = max(b, o), min(e, o + c)
+            src.append(slice(start - o, stop - o))
+            dst.append(slice(start - b, stop - b))
+        ret[tuple(dst)] = chunk[tuple(src)]
+        return chunk
+
+    @classmethod
+    def __decode_chunks(cls, dset, chunk_offsets, bounds, ret, workers, pool):
+        """
+        Read the chunks at chunk_offsets with read_direct_chunk, and decompress them in pool, of workers threads
+
+        Yields the offset and the decoded data of each chunk, after copying the data into ret.
+        """
+        dtype = dset.dtype
+        shuffle = dset.shuffle
+
+        def decode(args):
+            chunk_offset, raw = args
+            chunk = np.frombuffer(zlib.decompress(raw), dtype=np.uint8)
+            if shuffle:
+                # the shuffle filter stores the first byte of all elements, then the second byte, and so on
+                chunk = np.ascontiguousarray(chunk.reshape(dtype.itemsize, -1).T)
+            chunk = chunk.view(dtype).reshape(dset.chunks)
+            chunk = chunk[tuple(slice(0, r.stop - r.start) for r in cls.__chunk_region(dset, chunk_offset))]
+            return chunk_offset, cls.__copy_chunk(dset, chunk_offset, chunk, bounds, ret)
+
+        for i in range(0, len(chunk_offsets), 4 * workers):
+            # read a few chunks for each thread at a time, to bound the memory used for compressed chunks
+            raw_chunks = list()
+            for chunk_offset in chunk_offsets[i:i + 4 * workers]:
+                raw = cls.__read_raw_chunk(dset, chunk_offset)
+                if raw is None:
+                    # let HDF5 read chunks that are filled with the fill value or that skipped filters
+                    chunk = dset[cls.__chunk_region(dset, chunk_offset)]
+                    yield chunk_offset, cls.__copy_chunk(dset, chunk_offset, chunk, bounds, ret)
+                else:
+                    raw_chunks.append((chunk_offset, raw))
+            for decoded in pool.map(decode, raw_chunks):
+                yield decoded
+
+
+class ChunkCache(object):
+    """
+    A least-recently-used cache of decoded chunks, bounded by the total number of bytes of the chunks
+
+    HDF5IO keeps one cache for all datasets it reads (see the chunk_cache_size argument of HDF5IO).
+    """
+
+    @docval({'name': 'capacity', 'type': int, 'doc': 'the maximum number of bytes of the cached chunks'})
+    def __init__(self, **kwargs):
+        self.__capacity = getargs('capacity', kwargs)
+        self.__chunks = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def capacity(self):
+        """The maximum number of bytes of the cached chunks"""
+        return self.__capacity
+
+    @property
+    def size(self):
+        """The number of bytes of the cached chunks"""
+        return self.__size
+
+    @property
+    def hits(self):
+        """The number of chunks that were found in the cache"""
+        return self.__hits
+
+    @property
+    def misses(self):
+        """The number of chunks that were not found in the cache"""
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__chunks)
+
+    def get(self, key):
+        """Get the chunk with the given key, or None if it is not in the cache"""
+        with self.__lock:
+            chunk = self.__chunks.pop(key, None)
+            if chunk is None:
+                self.__misses += 1
+                return None
+            self.__chunks[key] = chunk      # most recently used
+            self.__hits += 1
+            return chunk
+
+    def put(self, key, chunk):
+        """Add a chunk to the cache, evicting the least recently used chunks if the cache is full"""
+        if chunk.nbytes > self.__capacity:
+            return
+        with self.__lock:
+            old = self.__chunks.pop(key, None)
+            if old is not None:
+                self.__size -= old.nbytes
+            while self.__size + chunk.nbytes > self.__capacity:
+                self.__size -= self.__chunks.popitem(last=False)[1].nbytes
+            self.__chunks[key] = chunk
+            self.__size += chunk.nbytes
+
+    def drop(self, filename, name):
+        """Remove the chunks of the dataset name in the file filename from the cache, e.g. after writing to it"""
+        with self.__lock:
+            for key in [k for k in self.__chunks if k[0][:2] == (filename, name)]:
+                self.__size -= self.__chunks.pop(key).nbytes
+
+    def clear(self):
+        """Remove all chunks from the cache"""
+        with self.__lock:
+            self.__chunks.clear()
+            self.__size = 0
+
+
+class H5MetadataScan(object):
+    """
+    The links, objects and attributes of an HDF5 file, read with a single traversal of the file
+
+    The links of all groups are visited with one call to the low-level link iteration of HDF5, and each object is
+    opened once, by the first link to it, to read its attributes, and the data type and shape of datasets.
+    Groups and datasets are kept as low-level object identifiers, so no high-level h5py objects are created
+    while scanning, and the path of each object does not need to be looked up.
+
+    A scan can be saved as a record with :py:meth:`to_record`, and loaded from the record instead of traversing
+    the file. The record of each object is kept separately, so that objects of a scan loaded from a record are
+    decoded and opened the first time they are needed, and only the objects that are read are checked against
+    the record.
+    """
+
+    HARD = 'hard'
+    SOFT = 'soft'
+    EXTERNAL = 'external'
+
+    GROUP = 'group'
+    DATASET = 'dataset'
+
+    __record_version = 3
+
+    @docval({'name': 'file', 'type': h5py.File, 'doc': 'the HDF5 file to scan'},
+            {'name': 'ignore', 'type': (set, list, tuple), 'doc': 'the paths of groups not to scan', 'default': ()},
+            {'name': 'record', 'type': (bytes, str),
+             'doc': 'a record of the file from to_record, to load instead of traversing the file', 'default': None})
+    def __init__(self, **kwargs):
+        h5file, ignore, record = getargs('file', 'ignore', 'record', kwargs)
+        self.__file = h5file
+        self.__ignore = tuple(ignore)
+        self.__links = dict()           # the name, link type and target of each link in each group
+        self.__objects = dict()         # the identifier, if opened, and the attributes of each object
+        self.__addresses = dict()       # the path of the first link to each object, by address
+        self.__layouts = dict()         # the data type, shape and maximum shape of each dataset
+        self.__record = None            # the records of the objects, if loaded from a record
+        self.__offsets = dict()         # the start and end of the record of each object that was not decoded
+        if record is not None:
+            self.__load(record)
+            return
+        root = h5o.open(h5file.id, b'/')
+        self.__links['/'] = list()
+        self.__objects['/'] = [root, self.read_attributes(root)]
+        self.__addresses[h5o.get_info(root).addr] = '/'
+        h5file.id.links.visit(self.__visit, info=True)
+
+    @staticmethod
+    def __is_ignored(path, ignore):
+        return any(path == p or path.startswith(p + '/') for p in ignore)
+
+    @classmethod
+    def __link_target(cls, fid, name, info):
+        if info.type == h5l.TYPE_HARD:
+            return cls.HARD, info.u
+        if info.type == h5l.TYPE_SOFT:
+            return cls.SOFT, fid.links.get_val(name).decode('utf-8')
+        filename, target = fid.links.get_val(name)
+        return cls.EXTERNAL, (filename.decode('utf-8'), target.decode('utf-8'))
+
+    def __visit(self, name, info):
+        path = '/' + name.decode('utf-8')
+        if self.__is_ignored(path, self.__ignore):
+            return None
+        parent, base = posixpath.split(path)
+        # HDF5 visits the links in a group once, through the first link to the group
+        links = self.__links[parent]
+        link_type, target = self.__link_target(self.__file.id, name, info)
+        if link_type == self.HARD:
+            addr = target
+            target = self.__addresses.get(addr)
+            if target is None:
+                target = path
+                self.__addresses[addr] = path
+                oid = h5o.open(self.__file.id, name)
+                self.__objects[path] = [oid, self.read_attributes(oid)]
+                if isinstance(oid, h5g.GroupID):
+                    self.__links[path] = list()
+                elif isinstance(oid, h5d.DatasetID):
+                    space = oid.get_space()
+                    maxshape = tuple(None if x == h5s.UNLIMITED else x for x in space.get_simple_extent_dims(True))
+                    self.__layouts[path] = (oid.dtype, space.shape, maxshape)
+        links.append((base, link_type, target))
+        return None
+
+    @staticmethod
+    def read_attributes(oid):
+        """Read the attributes of the object with the low-level identifier oid, like h5py.AttributeManager does"""
+        ret = dict()
+        for i in range(h5a.get_num_attrs(oid)):
+            attr = h5a.open(oid, index=i)
+            name = attr.name.decode('utf-8')
+            if attr.get_space().get_simple_extent_type() == h5s.NULL:
+                ret[name] = h5py.Empty(attr.dtype)
+                continue
+            dtype = attr.dtype
+            shape = attr.shape
+            htype = h5t.py_create(dtype)
+            if dtype.subdtype is not None:
+                # NumPy has no array types, so read arrays of arrays as arrays with more dimensions
+                dtype, subshape = dtype.subdtype
+                shape = shape + subshape
+            value = np.ndarray(shape, dtype=dtype, order='C')
+            attr.read(value, mtype=htype)
+            ret[name] = value[()] if len(value.shape) == 0 else value
+        return ret
+
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the object'},
+            returns='the type of the object, GROUP or DATASET, or None if it was not scanned', rtype=str)
+    def get_type(self, **kwargs):
+        """Get the type of the object that was first found at path"""
+        path = getargs('path', kwargs)
+        self.__decode_object(path)
+        if path in self.__layouts:
+            return self.DATASET
+        if path in self.__links:
+            return self.GROUP
+        return None
+
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the object'},
+            returns='the low-level identifier of the object, or None if it was not scanned')
+    def get_object(self, **kwargs):
+        """
+        Get the low-level identifier of the object that was first found at path, opening it if needed
+
+        Objects of a scan loaded from a record are checked when they are opened: a KeyError is raised if the object
+        does not exist, or if its number of attributes, the number of links of a group, or the shape of a dataset
+        is not the same as in the record.
+        """
+        path = getargs('path', kwargs)
+        self.__decode_object(path)
+        obj = self.__objects.get(path)
+        if obj is None:
+            return None
+        if obj[0] is None:
+            oid = h5o.open(self.__file.id, path.encode('utf-8'))
+            if not self.__matches_record(path, oid):
+                raise KeyError("'%s' changed since the record was written" % path)
+            obj[0] = oid
+        return obj[0]
+
+    def __matches_record(self, path, oid):
+        if h5a.get_num_attrs(oid) != len(self.__objects[path][1]):
+            return False
+        if path in self.__layouts:
+            return isinstance(oid, h5d.DatasetID) and oid.get_space().shape == self.__layouts[path][1]
+        if not isinstance(oid, h5g.GroupID):
+            return False
+        # the links to objects that are not scanned are not in the record
+        ignored = sum(1 for p in self.__ignore
+                      if posixpath.dirname(p) == path and posixpath.basename(p).encode('utf-8') in oid)
+        return oid.get_num_objs() - ignored == len(self.__links[path])
+
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the object'},
+            returns='the attributes of the object, or None if it was not scanned', rtype=dict)
+    def get_attributes(self, **kwargs):
+        """Get the attributes of the object that was first found at path"""
+        path = getargs('path', kwargs)
+        self.__decode_object(path)
+        obj = self.__objects.get(path)
+        return None if obj is None else obj[1]
+
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the dataset'},
+            returns='the data type, shape and maximum shape of the dataset, or None if it was not scanned',
+            rtype=tuple)
+    def get_layout(self, **kwargs):
+        """Get the data type, shape and maximum shape of the dataset that was first found at path"""
+        path = getargs('path', kwargs)
+        self.__decode_object(path)
+        return self.__layouts.get(path)
+
+    @docval({'name': 'obj', 'type': (h5py.Group, h5py.Dataset), 'doc': 'an object in the scanned file'},
+            returns='the path of the first link to the object, or None if it was not scanned', rtype=str)
+    def get_path(self, **kwargs):
+        """Get the path of the first link to an object, which is the path its attributes and links are kept by"""
+        return self.__addresses.get(h5o.get_info(getargs('obj', kwargs).id).addr)
+
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the group'},
+            returns='the name, link type and target of each link in the group', rtype=list)
+    def get_links(self, **kwargs):
+        """
+        Get the links in the group that was first found at path
+
+        The target of a hard link is the path of the first link to the object, the target of a soft link is the path
+        it refers to, and the target of an external link is the name of the file and the path in that file.
+        """
+        path = getargs('path', kwargs)
+        self.__decode_object(path)
+        return self.__links.get(path, list())
+
+    @docval(returns='the record of the scan, encoded with UTF-8', rtype=bytes)
+    def to_record(self):
+        """
+        Get a record of the scan, from which it can be loaded without traversing the file
+
+        The record starts with a line with the address of each object, and the start and end of its record in the
+        rest of the record, which is the JSON record of each object, one after the other.
+
+        Attribute values are saved with their data type, so that they are loaded as the same values that h5py reads.
+        Object references are saved as the path of the object they refer to.
+        """
+        index = dict()
+        records = list()
+        size = 0
+        for addr, path in self.__addresses.items():
+            self.__decode_object(path)
+            obj = {'attributes': {k: self.__encode_value(v) for k, v in self.__objects[path][1].items()}}
+            if path in self.__links:
+                obj['links'] = [list(link) for link in self.__links[path]]
+            elif path in self.__layouts:
+                dtype, shape, maxshape = self.__layouts[path]
+                obj['dtype'] = self.__encode_dtype(dtype)
+                obj['shape'] = list(shape)
+                obj['maxshape'] = list(maxshape)
+            else:
+                continue    # committed data types are not read
+            obj = json.dumps(obj).encode('utf-8')
+            index[path] = [addr, size, size + len(obj)]
+            records.append(obj)
+            size += len(obj)
+        header = json.dumps({'version': self.__record_version, 'index': index}).encode('utf-8')
+        return header + b'\n' + b''.join(records)
+
+    def __load(self, record):
+        if isinstance(record, text_type):
+            record = record.encode('utf-8')
+        header, _, self.__record = record.partition(b'\n')
+        header = json.loads(header.decode('utf-8'))
+        if header.get('version') != self.__record_version:
+            raise ValueError("unsupported record version: %s" % header.get('version'))
+        for path, (addr, start, end) in header['index'].items():
+            path = str(path)
+            self.__addresses[addr] = path
+            self.__offsets[path] = (start, end)
+
+    def __decode_object(self, path):
+        # the record of an object loaded from a record is decoded the first time the object is needed
+        offsets = self.__offsets.pop(path, None)
+        if offsets is None:
+            return
+        obj = json.loads(self.__record[offsets[0]:offsets[1]].decode('utf-8'))
+        self.__objects[path] = [None, {str(k): self.__decode_value(v) for k, v in obj['attributes'].items()}]
+        if 'links' in obj:
+            self.__links[path] = [(str(name), str(link_type), str(target) if link_type != self.EXTERNAL
+                                   else (str(target[0]), str(target[1])))
+                                  for name, link_type, target in obj['links']]
+        else:
+            self.__layouts[path] = (self.__decode_dtype(obj['dtype']), tuple(obj['shape']), tuple(obj['maxshape']))
+
+    @classmethod
+    def __encode_dtype(cls, dtype):
+        ref = h5py.check_dtype(ref=dtype)
+        if ref is not None:
+            return {'ref': 'region' if ref is RegionReference else 'object'}
+        vlen = h5py.check_dtype(vlen=dtype)
+        if vlen is not None:
+            if vlen is text_type:
+                return {'vlen': 'str'}
+            if vlen is binary_type:
+                return {'vlen': 'bytes'}
+            return {'vlen': cls.__encode_dtype(np.dtype(vlen))}
+        enum = h5py.check_dtype(enum=dtype)
+        if enum is not None:
+            return {'enum': cls.__encode_dtype(np.dtype(dtype.str)), 'values': enum}
+        if dtype.names is not None:
+            return {'fields': [[name, cls.__encode_dtype(dtype.fields[name][0]), dtype.fields[name][1]]
+                               for name in dtype.names],
+                    'itemsize': dtype.itemsize}
+        if dtype.subdtype is not None:
+            return {'subdtype': cls.__encode_dtype(dtype.subdtype[0]), 'shape': list(dtype.subdtype[1])}
+        return dtype.str
+
+    @classmethod
+    def __decode_dtype(cls, value):
+        if not isinstance(value, dict):
+            return np.dtype(str(value))
+        if 'ref' in value:
+            return special_dtype(ref=RegionReference if value['ref'] == 'region' else Reference)
+        if 'vlen' in value:
+            vlen = value['vlen']
+            if vlen == 'str':
+                return special_dtype(vlen=text_type)
+            if vlen == 'bytes':
+                return special_dtype(vlen=binary_type)
+            return special_dtype(vlen=cls.__decode_dtype(vlen))
+        if 'enum' in value:
+            return special_dtype(enum=(cls.__decode_dtype(value['enum']),
+                                       {str(k): v for k, v in value['values'].items()}))
+        if 'fields' in value:
+            return np.dtype({'names': [str(f[0]) for f in value['fields']],
+                             'formats': [cls.__decode_dtype(f[1]) for f in value['fields']],
+                             'offsets': [f[2] for f in value['fields']],
+                             'itemsize': value['itemsize']})
+        return np.dtype((cls.__decode_dtype(value['subdtype']), tuple(value['shape'])))
+
+    def __encode_value(self, value):
+        if isinstance(value, h5py.Empty):
+            return {'empty': self.__encode_dtype(value.dtype)}
+        if isinstance(value, RegionReference):
+            raise ValueError("cannot record region reference attributes")
+        if isinstance(value, Reference):
+            return {'ref': h5r.get_name(value, self.__file.id).decode('utf-8')}
+        if isinstance(value, text_type):
+            return {'str': value}
+        if isinstance(value, binary_type) and not isinstance(value, np.generic):
+            return {'bytes': value.decode('latin-1')}
+        dtype = value.dtype
+        if dtype.kind == 'O':
+            values = value.ravel().tolist()
+            if h5py.check_dtype(ref=dtype) is Reference:
+                return {'ref': [h5r.get_name(v, self.__file.id).decode('utf-8') for v in values],
+                        'shape': list(value.shape)}
+            vlen = h5py.check_dtype(vlen=dtype)
+            if vlen is text_type:
+                return {'str': values, 'shape': list(value.shape)}
+            if vlen is binary_type:
+                return {'bytes': [v.decode('latin-1') for v in values], 'shape': list(value.shape)}
+            raise ValueError("cannot record attributes of data type %s" % dtype)
+        if dtype.hasobject:
+            raise ValueError("cannot record attributes of data type %s" % dtype)
+        ret = {'dtype': self.__encode_dtype(dtype),
+               'data': base64.b64encode(np.ascontiguousarray(value).tobytes()).decode('ascii')}
+        if isinstance(value, np.ndarray):
+            ret['shape'] = list(value.shape)
+        return ret
+
+    def __decode_value(self, value):
+        if 'empty' in value:
+            return h5py.Empty(self.__decode_dtype(value['empty']))
+        shape = value.get('shape')
+        if 'ref' in value:
+            if shape is None:
+                return self.__get_ref(value['ref'])
+            ret = np.empty(len(value['ref']), dtype=special_dtype(ref=Reference))
+            ret[:] = [self.__get_ref(path) for path in value['ref']]
+            return ret.reshape(shape)
+        if 'str' in value:
+            if shape is None:
+                return value['str']
+            ret = np.empty(len(value['str']), dtype=special_dtype(vlen=text_type))
+            ret[:] = value['str']
+            return ret.reshape(shape)
+        if 'bytes' in value:
+            if shape is None:
+                return value['bytes'].encode('latin-1')
+            ret = np.empty(len(value['bytes']), dtype=special_dtype(vlen=binary_type))
+            ret[:] = [v.encode('latin-1') for v in value['bytes']]
+            return ret.reshape(shape)
+        ret = np.frombuffer(base64.b64decode(value['data']), dtype=self.__decode_dtype(value['dtype'])).copy()
+        return ret[0] if shape is None else ret.reshape(shape)
+
+    def __get_ref(self, path):
+        return h5r.create(self.__file.id, path.encode('utf-8'), h5r.OBJECT)
+
+
+def _read_ref_addresses(dset, lo, hi, field=None):
+    """
+    Read the addresses of the objects that the object references in rows lo to hi of dset refer to
+
+    The references are read as their raw values, which are the addresses of the objects in the file, instead of
+    as h5py references, so that references to the same object can be found with NumPy. If field is given, the
+    references are read from that field of a compound dataset.
+    """
+    mtype = h5t.STD_REF_OBJ
+    dtype = np.uint64
+    if field is not None:
+        mtype = h5t.create(h5t.COMPOUND, h5t.STD_REF_OBJ.get_size())
+        mtype.insert(field.encode('utf-8'), 0, h5t.STD_REF_OBJ)
+        dtype = np.dtype([(field, np.uint64)])
+    buf = np.empty(hi - lo, dtype=dtype)
+    if hi > lo:
+        fspace = dset.id.get_space()
+        fspace.select_hyperslab((lo,), (hi - lo,))
+        dset.id.read(h5s.create_simple((hi - lo,)), fspace, buf, mtype=mtype)
+    return buf if field is None else buf[field]
+
+
+def _row_span(key, n):
+    """
+    Get the first and last row + 1 of the rows of a one-dimensional dataset of length n that key selects
+
+    Returns the index of the selected rows into the rows from first to last, which is an int if key selects a
+    single row, a slice if key is a slice, and an array of indices otherwise, and the first and last row + 1.
+    Only the index of a list or array of indices is computed as an array, so selecting one row or a slice of
+    rows takes constant time.
+    """
+    if isinstance(key, integer_types + (np.integer,)) and not isinstance(key, bool):
+        row = int(key) + n if key < 0 else int(key)
+        if row < 0 or row >= n:
+            raise IndexError("index %d is out of range for dataset of length %d" % (key, n))
+        return 0, row, row + 1
+    if isinstance(key, slice):
+        start, stop, step = key.indices(n)
+        count = len(six_range(start, stop, step))
+        if count == 0:
+            return slice(0, 0), 0, 0
+        last = start + (count - 1) * step
+        if step > 0:
+            return slice(0, last - start + 1, step), start, last + 1
+        return slice(start - last, None, step), last, start + 1
+    if isinstance(key, (list, np.ndarray)):
+        rows = _point_indices(np.asarray(key), n, 'dataset')
+    else:
+        rows = np.arange(n)[key]
+        if np.ndim(rows) == 0:
+            return 0, int(rows), int(rows) + 1
+    if rows.size == 0:
+        return rows, 0, 0
+    lo = int(rows.min())
+    return rows - lo, lo, int(rows.max()) + 1
+
+
+def _point_indices(idx, n, name):
+    """
+    Convert an array of indices or a boolean mask into a dimension of length n to non-negative indices
+
+    Raises an IndexError naming the indexed object name if the indices are out of range or not integers.
+    """
+    if idx.dtype == bool:
+        if idx.shape != (n,):
+            raise IndexError("boolean index of shape %s does not match %s of length %d" % (idx.shape, name, n))
+        return np.flatnonzero(idx)
+    if idx.size == 0:
+        return idx.astype(int)
+    if idx.dtype.kind not in 'iu':
+        raise IndexError("cannot index %s with array of type %s" % (name, idx.dtype))
+    idx = np.where(idx < 0, idx + n, idx)
+    if idx.min() < 0 or idx.max() >= n:
+        raise IndexError("index out of range for %s of length %d" % (name, n))
+    return idx
+
+
+def _read_rows(dset, rows, key=(), max_gap=256):
+    """
+    Read the rows of dset at the non-empty array of indices rows, given in any order and with repeats
+
+    Rows that are at most max_gap rows apart are read with one read of the range of rows that covers them, instead
+    of one read for each row. key selects the part of each row that is read. The rows of a one-dimensional
+    h5py.Dataset that are spread over many ranges are read with a single read of a point selection instead.
+    """
+    uniq, inv = np.unique(rows, return_inverse=True)
+    breaks = np.flatnonzero(np.diff(uniq) > max_gap) + 1
+    # each read has an overhead of about as much as reading a hundred points
+    if isinstance(dset, Dataset) and len(dset.shape) == 1 and not key and 0 < len(breaks) and \
+            len(uniq) <= 100 * (len(breaks) + 1):
+        return _read_points(dset, uniq)[inv]
+    blocks = list()
+    for start, stop in zip(np.concatenate(([0], breaks)), np.concatenate((breaks, [len(uniq)]))):
+        lo, hi = int(uniq[start]), int(uniq[stop - 1]) + 1
+        block = dset[(slice(lo, hi),) + key] if key else dset[lo:hi]
+        blocks.append(np.asarray(block)[uniq[start:stop] - lo])
+    return np.concatenate(blocks)[inv]
+
+
+def _read_points(dset, idx):
+    """Read the elements of the one-dimensional h5py.Dataset dset at the increasing indices idx with one read"""
+    fspace = dset.id.get_space()
+    fspace.select_elements(np.asarray(idx, dtype=np.uint64).reshape(-1, 1))
+    ret = np.empty(len(idx), dtype=dset.dtype)
+    dset.id.read(h5s.create_simple((len(idx),)), fspace, ret, mtype=h5t.py_create(dset.dtype))
+    return ret
+
 
 class H5TableDataset(H5Dataset):
 
@@ -79,6 +781,8 @@ class H5TableDataset(H5Dataset):
         rows = copy(super(H5TableDataset, self).__getitem__(arg))
         if isinstance(arg, int):
             self.__swap_refs(rows)
+        elif isinstance(self.dataset, Dataset) and isinstance(rows, np.ndarray):
+            self.__resolve_refs(arg, rows)
         else:
             for row in rows:
                 self.__swap_refs(row)
@@ -89,22 +793,92 @@ class H5TableDataset(H5Dataset):
             getref = self.__refgetters[i]
             row[i] = getref(row[i])
 
+    def __resolve_refs(self, arg, rows):
+        """
+        Replace the references in the rows that arg selects with the objects they refer to
+
+        The objects are looked up once for each column of references, rather than once for each row.
+        """
+        dset = self.dataset
+        names = dset.dtype.names
+        idx, lo, hi = _row_span(arg, len(dset))
+        for i, getref in self.__refgetters.items():
+            name = names[i]
+            if getref == self.__get_ref:
+                addrs = _read_ref_addresses(dset, lo, hi, field=name)[idx]
+                rows[name] = _get_ref_containers(self.io, dset, addrs, rows[name])
+            else:
+                # the regions differ from row to row, but the objects they refer to are looked up once
+                objs = _get_ref_containers(self.io, dset, None, rows[name])
+                col = np.empty(len(rows), dtype=object)
+                for j, (obj, ref) in enumerate(zip(objs, rows[name])):
+                    col[j] = obj[ref]
+                rows[name] = col
+
     def __get_ref(self, ref):
-        return self.io.get_container(self.dataset.file[ref])
+        return _get_ref_containers(self.io, self.dataset, None, [ref])[0]
 
     def __get_regref(self, ref):
         obj = self.__get_ref(ref)
         return obj[ref]
 
 
+def _get_ref_containers(io, dset, addrs, refs):
+    """
+    Get the Container for each of the references read from dset
+
+    Each object is looked up once, and the Containers are kept in the ref_cache of io, so that objects that are
+    referred to again, by this or any other dataset read with io, are not looked up again. The objects are
+    identified by their addresses addrs, if given, or by the paths of the references refs. If addrs is given,
+    refs can be a function that reads the i-th reference, so that only the references to objects that are not
+    in the cache are read. Returns an array of the Containers.
+    """
+    cache = getattr(io, 'ref_cache', None)
+    if cache is None:
+        cache = dict()
+    fname = dset.file.filename
+    if addrs is None:
+        keys = np.array([h5r.get_name(ref, dset.file.id) for ref in refs], dtype=object)
+    else:
+        keys = addrs
+    get_ref = refs if callable(refs) else refs.__getitem__
+    ret = np.empty(len(keys), dtype=object)
+    if len(keys) == 0:
+        return ret
+    uniq, first, inv = np.unique(keys, return_index=True, return_inverse=True)
+    containers = np.empty(len(uniq), dtype=object)
+    for j, (key, i) in enumerate(zip(uniq, first)):
+        key = (fname, key.item() if isinstance(key, np.generic) else key)
+        container = cache.get(key)
+        if container is None:
+            container = io.get_container(dset.file[get_ref(i)])
+            cache[key] = container
+        containers[j] = container
+    ret[:] = containers[inv]
+    return ret
+
+
 class H5ReferenceDataset(H5Dataset):
 
     def __getitem__(self, arg):
-        ref = super(H5ReferenceDataset, self).__getitem__(arg)
-        if isinstance(ref, np.ndarray):
-            return [self.io.get_container(self.dataset.file[x]) for x in ref]
-        else:
-            return self.io.get_container(self.dataset.file[ref])
+        dset = self.dataset
+        if not isinstance(dset, Dataset):
+            ref = super(H5ReferenceDataset, self).__getitem__(arg)
+            if isinstance(ref, np.ndarray):
+                return [self.io.get_container(dset.file[x]) for x in ref]
+            else:
+                return self.io.get_container(dset.file[ref])
+        idx, lo, hi = _row_span(arg, len(dset))
+        if isinstance(idx, int):
+            return self.__get_containers([idx], lo, hi)[0]
+        return list(self.__get_containers(idx, lo, hi))
+
+    def __get_containers(self, idx, lo, hi):
+        """Get the Containers that the rows idx of rows lo to hi refer to, reading the references of those rows once"""
+        dset = self.dataset
+        addrs = _read_ref_addresses(dset, lo, hi)[idx]
+        rows = np.arange(lo, hi)[idx]
+        return _get_ref_containers(self.io, dset, addrs, lambda i: dset[rows[i]])
 
     @property
     def dtype(self):
@@ -114,15 +888,73 @@ class H5ReferenceDataset(H5Dataset):
 class H5RegionDataset(H5ReferenceDataset):
 
     def __getitem__(self, arg):
-        obj = super(H5RegionDataset, self).__getitem__(arg)
-        ref = self.dataset[arg]
-        return obj[ref]
+        refs = self.dataset[arg]
+        if not isinstance(refs, np.ndarray):
+            obj = self.__get_objects([refs])[0]
+            return obj[refs]
+        objs = self.__get_objects(refs)
+        return [obj[ref] for obj, ref in zip(objs, refs)]
+
+    def __get_objects(self, refs):
+        """Get the objects that the region references refs refer to"""
+        dset = self.dataset
+        if not isinstance(dset, Dataset):
+            return [self.io.get_container(dset.file[ref]) for ref in refs]
+        return _get_ref_containers(self.io, dset, None, refs)
 
     @property
     def dtype(self):
         return 'region'
 
 
+class H5StrDataset(H5Dataset):
+    """
+    A one-dimensional dataset of variable-length strings that is read lazily
+
+    Only the rows that are selected are read and decoded, so reading a file does not load its text columns.
+    Selecting rows with a list or array of indices reads the ranges of rows that cover them, rather than
+    one row at a time.
+    """
+
+    # the number of unselected rows between two selected rows that are read rather than skipped
+    __max_gap = 256
+
+    # the number of rows that are read at a time when iterating over the dataset
+    __block_size = 4096
+
+    # == and != compare the strings like the array they were read as before, rather than building a Query
+    __operations__ = ('__lt__', '__gt__', '__le__', '__ge__')
+
+    def __getitem__(self, arg):
+        if isinstance(arg, (list, np.ndarray)):
+            return self.__read_points(np.asarray(arg))
+        return super(H5StrDataset, self).__getitem__(arg)
+
+    def __eq__(self, other):
+        return np.asarray(self) == other
+
+    def __ne__(self, other):
+        return np.asarray(self) != other
+
+    __hash__ = H5Dataset.__hash__
+
+    def __read_points(self, idx):
+        """Read the rows at the indices idx, with one read for each range of nearby rows"""
+        idx = _point_indices(idx, len(self), type(self).__name__)
+        if idx.size == 0:
+            return np.empty(0, dtype=object)
+        return _read_rows(self.dataset, idx, max_gap=self.__max_gap)
+
+    def __iter__(self):
+        for start in range(0, len(self), self.__block_size):
+            for value in self.dataset[start:start + self.__block_size]:
+                yield value
+
+    def __array__(self, dtype=None):
+        ret = self.dataset[()]
+        return ret if dtype is None else ret.astype(dtype)
+
+
 class H5SpecWriter(SpecWriter):
 
     __str_type = special_dtype(vlen=binary_type)
@@ -174,23 +1006,156 @@ class H5SpecReader(SpecReader):
         return ret
 
 
+class _Span(object):
+    """Evenly spaced indices, like a Python 3 range, that can be indexed with integers, slices and arrays"""
+
+    def __init__(self, start, stop, step=1):
+        self.start = start
+        self.step = step
+        self.__len = len(six_range(start, stop, step))
+
+    @property
+    def slice(self):
+        """The indices as a slice, for a step greater than zero"""
+        return slice(self.start, self.start + len(self) * self.step, self.step)
+
+    def __len__(self):
+        return self.__len
+
+    def __getitem__(self, arg):
+        if isinstance(arg, slice):
+            start, stop, step = arg.indices(len(self))
+            return _Span(self.start + start * self.step, self.start + stop * self.step, self.step * step)
+        if isinstance(arg, (list, np.ndarray)):
+            return self.start + _point_indices(np.asarray(arg), len(self), 'region') * self.step
+        if arg < 0:
+            arg += len(self)
+        if not 0 <= arg < len(self):
+            raise IndexError("index out of range for region of length %d" % len(self))
+        return self.start + int(arg) * self.step
+
+
 class H5RegionSlicer(RegionSlicer):
+    """
+    Slice the region of a dataset that a region reference refers to
+
+    The selection of the region reference is decoded once, into the rows of the dataset it selects and the part of
+    each row it selects. Indices into the region are mapped to the rows of the dataset, so that only the rows that
+    are indexed are read, with one read for each range of nearby rows, rather than reading the whole region.
+    Selections that are not the product of a selection along each dimension, such as points of a multidimensional
+    dataset, are read in full the first time the region is indexed.
+    """
+
+    # the number of unselected rows between two selected rows that are read rather than skipped
+    __max_gap = 256
 
     @docval({'name': 'dataset', 'type': (Dataset, H5Dataset), 'doc': 'the HDF5 dataset to slice'},
             {'name': 'region', 'type': RegionReference, 'doc': 'the region reference to use to slice'})
     def __init__(self, **kwargs):
         self.__dataset = getargs('dataset', kwargs)
         self.__regref = getargs('region', kwargs)
-        self.__len = self.__dataset.regionref.selection(self.__regref)[0]
         self.__region = None
+        self.__rows = None
+        dset = self.__dataset.dataset if isinstance(self.__dataset, H5Dataset) else self.__dataset
+        if isinstance(dset, Dataset):
+            self.__decode(h5r.get_region(self.__regref, dset.id))
+        if self.__rows is None:
+            self.__len = self.__dataset.regionref.selection(self.__regref)[0]
+        else:
+            self.__len = len(self.__rows)
+
+    def __decode(self, space):
+        """
+        Decode the selection of the dataspace space into the rows it selects, and the part of each row it selects
+
+        The indices along each dimension are kept as a _Span if they are evenly spaced, and as an array otherwise.
+        The part of each row is read with slices, and the indices along dimensions that are not evenly spaced are
+        taken from the slices after reading them.
+        """
+        sel_type = space.get_select_type()
+        shape = space.shape
+        if len(shape) == 0:
+            return
+        if sel_type == h5s.SEL_ALL:
+            axes = [_Span(0, n) for n in shape]
+        elif sel_type == h5s.SEL_NONE:
+            axes = [_Span(0, 0) for n in shape]
+        elif sel_type == h5s.SEL_POINTS:
+            if len(shape) > 1:
+                return
+            axes = [self.__evenly_spaced(space.get_select_elem_pointlist()[:, 0])]
+        elif sel_type == h5s.SEL_HYPERSLABS:
+            blocks = space.get_select_hyper_blocklist()
+            axes = [self.__block_indices(blocks[:, 0, i], blocks[:, 1, i]) for i in range(len(shape))]
+            if np.prod([len(a) for a in axes]) != space.get_select_npoints():
+                return
+        else:
+            return
+        self.__rows = axes[0]
+        key = list()
+        self.__take = list()
+        for i, a in enumerate(axes[1:], 1):
+            if isinstance(a, _Span):
+                key.append(a.slice)
+            else:
+                key.append(slice(int(a[0]), int(a[-1]) + 1))
+                self.__take.append((i, a - a[0]))
+        self.__key = tuple(key)
+
+    @classmethod
+    def __block_indices(cls, starts, ends):
+        """Get the indices that the blocks from starts to ends, inclusive, cover along one dimension"""
+        blocks = set(zip(starts.tolist(), ends.tolist()))
+        if len(blocks) == 1:
+            start, end = blocks.pop()
+            return _Span(start, end + 1)
+        return cls.__evenly_spaced(np.unique(np.concatenate([np.arange(s, e + 1) for s, e in blocks])))
+
+    @classmethod
+    def __evenly_spaced(cls, idx):
+        """Get the indices idx as a _Span if they are evenly spaced and increasing"""
+        if len(idx) == 1:
+            return _Span(int(idx[0]), int(idx[0]) + 1)
+        step = idx[1] - idx[0] if len(idx) > 1 else 0
+        if step > 0 and np.all(np.diff(idx) == step):
+            return _Span(int(idx[0]), int(idx[-1]) + 1, int(step))
+        return idx
 
     def __read_region(self):
         if self.__region is None:
             self.__region = self.__dataset[self.__regref]
 
+    def __read(self, rows):
+        """Read the rows of the dataset at rows, which is a _Span, an array or an index"""
+        dset = self.__dataset
+        if isinstance(rows, _Span):
+            if rows.step < 0:
+                return self.__read(rows[::-1])[::-1]
+            sel = rows.slice if len(rows) > 0 else slice(0, 0)
+            ret = dset[(sel,) + self.__key] if self.__key else dset[sel]
+        elif isinstance(rows, np.ndarray):
+            if rows.size == 0:
+                return self.__read(_Span(0, 0))
+            ret = _read_rows(dset, rows, self.__key, max_gap=self.__max_gap)
+        else:
+            ret = dset[(int(rows),) + self.__key] if self.__key else dset[int(rows)]
+        offset = 0 if isinstance(rows, (_Span, np.ndarray)) else 1
+        for axis, idx in self.__take:
+            ret = np.take(ret, idx, axis=axis - offset)
+        return ret
+
     def __getitem__(self, idx):
-        self.__read_region()
-        return self.__region[idx]
+        if self.__rows is None:
+            self.__read_region()
+            return self.__region[idx]
+        key = idx if isinstance(idx, tuple) else (idx,)
+        if len(key) == 0 or key[0] is Ellipsis:
+            return self.__read(self.__rows)[idx]
+        rows = self.__rows[key[0]]
+        ret = self.__read(rows)
+        if len(key) > 1:
+            ret = ret[key[1:]] if np.ndim(rows) == 0 else ret[(slice(None),) + key[1:]]
+        return ret
 
     def __len__(self):
         return self.__len
@@ -222,7 +1187,12 @@ class H5DataIO(DataIO):
              'default': None},
             {'name': 'compression_opts',
              'type': int,
-             'doc': 'Parameter for compression filter',
+             'doc': 'Parameter for compression filter, i.e., the compression level (0-9) for gzip',
+             'default': None},
+            {'name': 'compression_workers',
+             'type': int,
+             'doc': 'Number of threads that compress chunks with gzip. The compressed chunks are written directly ' +
+                    'to the file. If None, HDF5 compresses the chunks on the writing thread.',
              'default': None},
             {'name': 'fillvalue',
              'type': None,
@@ -240,15 +1210,28 @@ class H5DataIO(DataIO):
              'type': bool,
              'doc': 'If data is an h5py.Dataset should it be linked to or copied. NOTE: This parameter is only ' +
                     'allowed if data is an h5py.Dataset',
-             'default': False}
+             'default': False},
+            {'name': 'growth',
+             'type': str,
+             'doc': 'How to grow a resizable dataset when data is a DataChunkIterator: "exact" to resize to fit ' +
+                    'each chunk, "chunk" to round up to a multiple of the chunk shape, or "geometric" to at least ' +
+                    'double the size. The dataset is trimmed to the size of the data after the last chunk.',
+             'default': 'exact'}
             )
     def __init__(self, **kwargs):
         # Get the list of I/O options that user has passed in
-        ioarg_names = [name for name in kwargs.keys() if name not in['data', 'link_data']]
+        ioarg_names = [name for name in kwargs.keys()
+                       if name not in ['data', 'link_data', 'growth', 'compression_workers']]
         # Remove the ioargs from kwargs
         ioarg_values = [popargs(argname, kwargs) for argname in ioarg_names]
         # Consume link_data parameter
         self.__link_data = popargs('link_data', kwargs)
+        self.__growth = popargs('growth', kwargs)
+        if self.__growth not in ('geometric', 'chunk', 'exact'):
+            raise ValueError("growth must be one of 'geometric', 'chunk' or 'exact', got '%s'" % self.__growth)
+        self.__compression_workers = popargs('compression_workers', kwargs)
+        if self.__compression_workers is not None and self.__compression_workers < 1:
+            raise ValueError("compression_workers must be at least 1, got %d" % self.__compression_workers)
         # Check for possible collision with other parameters
         if not isinstance(getargs('data', kwargs), Dataset) and self.__link_data:
             self.__link_data = False
@@ -280,6 +1263,9 @@ class H5DataIO(DataIO):
                 warnings.warn(str(self.__iosettings['compression']) + " compression may not be available" +
                               "on all installations of HDF5. Use of gzip is recommended to ensure portability of" +
                               "the generated HDF5 files.")
+        if self.__compression_workers is not None and self.__iosettings.get('compression') != 'gzip':
+            warnings.warn('compression_workers in H5DataIO will be ignored without gzip compression')
+            self.__compression_workers = None
         # Check possible parameter collisions
         if isinstance(self.data, Dataset):
             for k in self.__iosettings.keys():
@@ -289,6 +1275,14 @@ class H5DataIO(DataIO):
     def link_data(self):
         return self.__link_data
 
+    @property
+    def growth(self):
+        return self.__growth
+
+    @property
+    def compression_workers(self):
+        return self.__compression_workers
+
     @property
     def io_settings(self):
         return self.__iosettings
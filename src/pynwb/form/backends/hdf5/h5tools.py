@@ -1,26 +1,33 @@
 from collections import deque
+import itertools
 import numpy as np
 import os.path
+import posixpath
+import zlib
 from functools import partial
+from multiprocessing.pool import ThreadPool
 from h5py import File, Group, Dataset, special_dtype, SoftLink, ExternalLink, Reference, RegionReference, check_dtype
+from h5py import h5d
 from six import raise_from, text_type, string_types, binary_type
 import warnings
 from ...container import Container
 
 from ...utils import docval, getargs, popargs, call_docval_func
-from ...data_utils import AbstractDataChunkIterator, get_shape
-from ...build import Builder, GroupBuilder, DatasetBuilder, LinkBuilder, BuildManager,\
+from ...data_utils import AbstractDataChunkIterator, ThreadedDataChunkIterator, DtypeView, ExtendedData, get_shape
+from ...build import Builder, GroupBuilder, LazyGroupBuilder, DatasetBuilder, LinkBuilder, BuildManager,\
                      RegionBuilder, ReferenceBuilder, TypeMap
 from ...spec import RefSpec, DtypeSpec, NamespaceCatalog, GroupSpec
 from ...spec import NamespaceBuilder
 
-from .h5_utils import H5ReferenceDataset, H5RegionDataset, H5TableDataset,\
-                      H5DataIO, H5SpecReader, H5SpecWriter
+from .h5_utils import H5Dataset, H5ReferenceDataset, H5RegionDataset, H5TableDataset, H5StrDataset,\
+                      H5DataIO, H5SpecReader, H5SpecWriter, ChunkCache, H5MetadataScan
 
 from ..io import FORMIO
 
 ROOT_NAME = 'root'
 SPEC_LOC_ATTR = '.specloc'
+METADATA_LOC_ATTR = '.metadataloc'
+METADATA_NAME = '.metadata'
 H5_TEXT = special_dtype(vlen=text_type)
 H5_BINARY = special_dtype(vlen=binary_type)
 H5_REF = special_dtype(ref=Reference)
@@ -33,15 +40,45 @@ class HDF5IO(FORMIO):
             {'name': 'manager', 'type': BuildManager, 'doc': 'the BuildManager to use for I/O', 'default': None},
             {'name': 'mode', 'type': str,
              'doc': 'the mode to open the HDF5 file with, one of ("w", "r", "r+", "a", "w-")'},
-            {'name': 'comm', 'type': 'Intracom',
+            {'name': 'comm', 'type': 'Intracomm',
              'doc': 'the MPI communicator to use for parallel I/O', 'default': None},
-            {'name': 'file', 'type': File, 'doc': 'a pre-existing h5py.File object', 'default': None})
+            {'name': 'file', 'type': File, 'doc': 'a pre-existing h5py.File object', 'default': None},
+            {'name': 'read_workers', 'type': int,
+             'doc': 'the number of threads that decompress the chunks of gzip-compressed datasets when reading',
+             'default': None},
+            {'name': 'chunk_cache_size', 'type': int,
+             'doc': 'the maximum number of bytes of decoded chunks of compressed datasets to keep in memory',
+             'default': None},
+            {'name': 'scan_metadata', 'type': bool,
+             'doc': 'whether to read the links and attributes of all objects in one traversal of the file',
+             'default': False})
     def __init__(self, **kwargs):
         '''Open an HDF5 file for IO
 
         For `mode`, see `h5py.File <http://docs.h5py.org/en/latest/high/file.html#opening-creating-files>_`.
+
+        If `comm` is given, the file is opened with the MPI-IO driver, which requires h5py to be built with
+        parallel HDF5. All ranks must then write the same builder tree, so that groups, datasets and attributes
+        are created collectively. Each rank writes its own part of the data: lists and arrays are split along
+        the first dimension into one slab per rank, and the chunks yielded by a DataChunkIterator are
+        written by the rank that iterates over them.
+
+        If `read_workers` is given, chunked, gzip-compressed numeric datasets are read as H5Dataset objects,
+        which decompress the chunks of selections that span multiple chunks in a pool of `read_workers` threads.
+        The pool is created the first time it is needed, and closed with this object. Reading compressed chunks
+        requires h5py 2.10 or newer, so `read_workers` is ignored, with a warning, with older versions of h5py.
+
+        If `chunk_cache_size` is given, chunked, compressed numeric datasets are read as H5Dataset objects, which
+        keep the decoded chunks they read in a cache that is shared by all datasets read with this object. When
+        the cache exceeds `chunk_cache_size` bytes, the least recently used chunks are removed from it.
+
+        If `scan_metadata` is True, the links and attributes of all objects in the file are read with one
+        traversal of the file when the builder tree is first read, and the contents of groups are then built
+        from the result of the traversal instead of looking up each object in the file. This is faster for
+        files with many objects when most of them are read.
         '''
-        path, manager, mode, comm, file_obj = popargs('path', 'manager', 'mode', 'comm', 'file', kwargs)
+        path, manager, mode, comm, file_obj, read_workers, chunk_cache_size, scan_metadata = popargs(
+            'path', 'manager', 'mode', 'comm', 'file', 'read_workers', 'chunk_cache_size', 'scan_metadata', kwargs)
 
         if file_obj is not None and os.path.abspath(file_obj.filename) != os.path.abspath(path):
             raise ValueError('You argued {} as this object\'s path, but supplied a file with filename: {}'.format())
@@ -49,6 +86,17 @@ class HDF5IO(FORMIO):
         if manager is None:
             manager = BuildManager(TypeMap(NamespaceCatalog()))
         self.__comm = comm
+        if read_workers is not None and not hasattr(h5d.DatasetID, 'read_direct_chunk'):
+            warnings.warn("ignoring read_workers: decompressing chunks in threads requires h5py 2.10 or newer")
+            read_workers = None
+        self.__read_workers = read_workers
+        self.__read_pool = None     # the pool of read_workers threads, created the first time it is needed
+        self.__chunk_cache = ChunkCache(chunk_cache_size) if chunk_cache_size else None
+        self.__ref_cache = dict()   # the Container of each object that references were read to
+        self.__scan_metadata = scan_metadata
+        self.__scan = None          # the H5MetadataScan of the file, if scan_metadata is True
+        self.__from_record = False  # whether the H5MetadataScan was loaded from the metadata record of the file
+        self.__ignore = set()       # the paths of the groups and datasets that are not read
         self.__mode = mode
         self.__path = path
         self.__file = file_obj
@@ -56,11 +104,41 @@ class HDF5IO(FORMIO):
         self.__built = dict()       # keep track of which files have been read
         self.__read = dict()        # keep track of each builder for each dataset/group/link
         self.__ref_queue = deque()  # a queue of the references that need to be added
+        self.__paths = dict()       # cache of the HDF5 path of each builder written
+        self.__obj_refs = dict()    # cache of the object reference to each builder written
 
     @property
     def comm(self):
+        '''The MPI communicator used for parallel I/O, or None'''
         return self.__comm
 
+    @property
+    def read_workers(self):
+        '''The number of threads that decompress chunks when reading, or None to let HDF5 decompress them'''
+        return self.__read_workers
+
+    @property
+    def read_pool(self):
+        '''The pool of read_workers threads that decompress chunks, or None if read_workers is not given'''
+        if self.__read_pool is None and self.__read_workers is not None:
+            self.__read_pool = ThreadPool(self.__read_workers)
+        return self.__read_pool
+
+    @property
+    def chunk_cache(self):
+        '''The ChunkCache of the decoded chunks read from compressed datasets, or None'''
+        return self.__chunk_cache
+
+    @property
+    def ref_cache(self):
+        '''The Container of each object that references were read to, by the file and address or path of the object'''
+        return self.__ref_cache
+
+    @property
+    def scan_metadata(self):
+        '''Whether the links and attributes of all objects are read with one traversal of the file'''
+        return self.__scan_metadata
+
     @property
     def _file(self):
         return self.__file
@@ -189,9 +267,21 @@ class HDF5IO(FORMIO):
     @docval({'name': 'container', 'type': Container, 'doc': 'the Container object to write'},
             {'name': 'cache_spec', 'type': bool, 'doc': 'cache specification to file', 'default': False},
             {'name': 'link_data', 'type': bool,
-             'doc': 'If not specified otherwise link (True) or copy (False) HDF5 Datasets', 'default': True})
+             'doc': 'If not specified otherwise link (True) or copy (False) HDF5 Datasets', 'default': True},
+            {'name': 'cache_metadata', 'type': bool,
+             'doc': 'store a record of the links, attributes, data types and shapes of all objects in the file',
+             'default': False})
     def write(self, **kwargs):
-        cache_spec = popargs('cache_spec', kwargs)
+        '''
+        Write a Container to the file
+
+        If `cache_metadata` is True, a record of the links and attributes of all groups and datasets, and of the
+        data type and shape of all datasets, is stored in one dataset next to the cached specification, after the
+        Container is written. The builder tree of the file is then read from the record instead of from the
+        objects in the file, as long as the size of the file has not changed. Each object is checked against the
+        record when it is first read, and the record is no longer used once an object does not match it.
+        '''
+        cache_spec, cache_metadata = popargs('cache_spec', 'cache_metadata', kwargs)
         call_docval_func(super(HDF5IO, self).write, kwargs)
         if cache_spec:
             ref = self.__file.attrs.get(SPEC_LOC_ATTR)
@@ -213,9 +303,74 @@ class HDF5IO(FORMIO):
                 ns_group = spec_group.require_group(group_name)
                 writer = H5SpecWriter(ns_group)
                 ns_builder.export('namespace', writer=writer)
+        # a record written before is out of date once the file is written to
+        self.__delete_metadata_record()
+        if cache_metadata:
+            self.__write_metadata_record()
+
+    def __delete_metadata_record(self):
+        ref = self.__file.attrs.get(METADATA_LOC_ATTR)
+        if ref is not None:
+            del self.__file[self.__file[ref].name]
+            del self.__file.attrs[METADATA_LOC_ATTR]
+
+    def __write_metadata_record(self):
+        '''Store a record of the metadata of all objects in the file, next to the cached specification'''
+        parent = self.__file
+        ignore = set()
+        specloc = self.__file.attrs.get(SPEC_LOC_ATTR)
+        if specloc is not None:
+            spec_group = self.__file[specloc]
+            ignore.add(spec_group.name)
+            parent = spec_group.parent
+        # the record is not scanned, and its location is written over in place once it is known, so that the root
+        # group has the same attributes as in the record
+        ignore.add(posixpath.join(parent.name, METADATA_NAME))
+        self.__file.attrs[METADATA_LOC_ATTR] = self.__file.ref
+        record = H5MetadataScan(self.__file, ignore).to_record()
+        dset = parent.create_dataset(METADATA_NAME, data=np.frombuffer(record, dtype=np.uint8))
+        self.__file.attrs.modify(METADATA_LOC_ATTR, dset.ref)
+        # adding objects, or writing over data or attributes with larger values, grows the file, so the size of the
+        # file is kept once the record is written, and written over in place
+        dset.attrs.create('filesize', 0, dtype=np.int64)
+        self.__file.flush()
+        dset.attrs.modify('filesize', self.__file.id.get_filesize())
+        self.__file.flush()
+
+    def __read_metadata_record(self, ignore):
+        '''Load the H5MetadataScan of the file from its metadata record, if it has one that is up to date'''
+        ref = self.__file.attrs.get(METADATA_LOC_ATTR)
+        if ref is None:
+            return None
+        scan = None
+        try:
+            dset = self.__file[ref]
+            ignore.add(dset.name)
+            if dset.attrs.get('filesize') == self.__file.id.get_filesize():
+                scan = H5MetadataScan(self.__file, ignore, record=dset[()].tobytes())
+        except (KeyError, ValueError):
+            # the record was deleted, or written by another version
+            pass
+        if scan is None:
+            warnings.warn("the metadata record of '%s' is out of date and is not used" % self.__path)
+            return None
+        return scan
+
+    def __drop_metadata_record(self, path):
+        '''Stop reading from the metadata record of the file, after an object in the group at path was not found'''
+        warnings.warn("the metadata record of '%s' is out of date and is not used: the contents of '%s' changed"
+                      % (self.__path, path))
+        self.__scan = H5MetadataScan(self.__file, self.__ignore) if self.__scan_metadata else None
+        self.__from_record = False
 
     @docval(returns='a GroupBuilder representing the NWB Dataset', rtype='GroupBuilder')
     def read_builder(self):
+        '''
+        Get the builder for the root of the file
+
+        The builder tree is read lazily: the contents of each group are read from the file the first
+        time they are accessed, so this does not depend on the number of objects in the file.
+        '''
         f_builder = self.__read.get(self.__file)
         # ignore cached specs when reading builder
         ignore = set()
@@ -223,7 +378,13 @@ class HDF5IO(FORMIO):
         if specloc is not None:
             ignore.add(self.__file[specloc].name)
         if f_builder is None:
+            self.__ignore = ignore
+            self.__scan = self.__read_metadata_record(ignore)
+            self.__from_record = self.__scan is not None
+            if self.__scan is None and self.__scan_metadata:
+                self.__scan = H5MetadataScan(self.__file, ignore)
             f_builder = self.__read_group(self.__file, ROOT_NAME, ignore=ignore)
+            self.__set_built(self.__file.filename, self.__file.name, f_builder)
             self.__read[self.__file] = f_builder
         return f_builder
 
@@ -237,84 +398,187 @@ class HDF5IO(FORMIO):
         else:
             return None
 
-    @docval({'name': 'h5obj', 'type': (Dataset, Group),
-             'doc': 'the HDF5 object to the corresponding Container/Data object for'})
+    @docval({'name': 'h5obj', 'type': (Dataset, Group, str),
+             'doc': 'the HDF5 object (or its path) to get the corresponding Container/Data object for'})
     def get_container(self, **kwargs):
+        '''
+        Get the Container/Data object for an object in the file
+
+        Only the builders for the given object, its parents, and anything it refers to are read
+        from the file, so this can be used to access a single object without reading the whole file.
+        '''
         h5obj = getargs('h5obj', kwargs)
-        fpath = h5obj.file.filename
-        path = h5obj.name
-        builder = self.__get_built(fpath, path)
-        if builder is None:
-            msg = '%s:%s has not been built' % (fpath, path)
-            raise ValueError(msg)
+        if isinstance(h5obj, string_types):
+            builder = self.get_builder(h5obj)
+        else:
+            builder = self.__read_ref(h5obj)
         container = self.manager.construct(builder)
         return container
 
+    @docval({'name': 'path', 'type': str, 'doc': 'the path of the HDF5 object to get the Builder for'},
+            returns='the Builder for the object at the given path', rtype=Builder)
+    def get_builder(self, **kwargs):
+        '''
+        Get the Builder for an object in the file
+
+        The builders that were read are indexed by their path, so an object that was read before is
+        found without looking it up in the file. Otherwise, only the builders for the object and its
+        parents are read.
+        '''
+        path = getargs('path', kwargs)
+        if not path.startswith('/'):
+            path = '/' + path
+        path = posixpath.normpath(path)
+        builder = self.__get_built(self.__file.filename, path)
+        if builder is None:
+            builder = self.__read_ref(self.__file[path])
+        return builder
+
     def __read_group(self, h5obj, name=None, ignore=set()):
+        if name is None:
+            name = str(os.path.basename(h5obj.name))
+        loader = None
+        if self.__scan is not None and h5obj.file.filename == self.__file.filename:
+            path = self.__scan.get_path(h5obj)
+            if path is not None:
+                loader = partial(self.__read_scanned_group_contents, path)
+        if loader is None:
+            loader = partial(self.__read_group_contents, h5obj, ignore)
+        ret = LazyGroupBuilder(name, loader, source=self.__path)
+        ret.written = True
+        return ret
+
+    def __read_group_contents(self, h5obj, ignore):
         kwargs = {
             "attributes": self.__read_attrs(h5obj),
-            "groups": dict(),
-            "datasets": dict(),
-            "links": dict()
+            "groups": list(),
+            "datasets": list(),
+            "links": list()
         }
 
         for key, val in kwargs['attributes'].items():
             if isinstance(val, bytes):
                 kwargs['attributes'][key] = val.decode('UTF-8')
 
-        if name is None:
-            name = str(os.path.basename(h5obj.name))
         for k in h5obj:
             sub_h5obj = h5obj.get(k)
+            if sub_h5obj is None:
+                warnings.warn('Broken Link: %s' % os.path.join(h5obj.name, k))
+                continue
             if sub_h5obj.name in ignore:
                 continue
-            if not (sub_h5obj is None):
-                link_type = h5obj.get(k, getlink=True)
-                if isinstance(link_type, SoftLink) or isinstance(link_type, ExternalLink):
-                    # Reading links might be better suited in its own function
-                    # get path of link (the key used for tracking what's been built)
-                    target_path = link_type.path
-                    builder_name = os.path.basename(target_path)
-                    # get builder if already read, else build it
-                    builder = self.__get_built(sub_h5obj.file.filename, target_path)
+            link_type = h5obj.get(k, getlink=True)
+            if isinstance(link_type, SoftLink) or isinstance(link_type, ExternalLink):
+                # Reading links might be better suited in its own function
+                # get path of link (the key used for tracking what's been built)
+                # NOTE: all links must have absolute paths
+                target_path = link_type.path
+                builder = self.__read_ref(sub_h5obj, target_path)
+                link_builder = LinkBuilder(builder, k, source=self.__path)
+                link_builder.written = True
+                kwargs['links'].append(link_builder)
+            else:
+                builder = self.__get_built(sub_h5obj.file.filename, sub_h5obj.name)
+                if isinstance(sub_h5obj, Dataset):
                     if builder is None:
-                        # NOTE: all links must have absolute paths
-                        if isinstance(sub_h5obj, Dataset):
-                            builder = self.__read_dataset(sub_h5obj, builder_name)
-                        else:
-                            builder = self.__read_group(sub_h5obj, builder_name, ignore=ignore)
-                        self.__set_built(sub_h5obj.file.filename, target_path, builder)
-                    link_builder = LinkBuilder(builder, k, source=self.__path)
-                    link_builder.written = True
-                    kwargs['links'][builder_name] = link_builder
+                        builder = self.__read_dataset(sub_h5obj)
+                    kwargs['datasets'].append(builder)
                 else:
-                    builder = self.__get_built(sub_h5obj.file.filename, sub_h5obj.name)
-                    obj_type = None
-                    read_method = None
-                    if isinstance(sub_h5obj, Dataset):
-                        read_method = self.__read_dataset
-                        obj_type = kwargs['datasets']
-                    else:
-                        read_method = partial(self.__read_group, ignore=ignore)
-                        obj_type = kwargs['groups']
                     if builder is None:
-                        builder = read_method(sub_h5obj)
-                        self.__set_built(sub_h5obj.file.filename, sub_h5obj.name, builder)
-                    obj_type[builder.name] = builder
-            else:
-                warnings.warn('Broken Link: %s' % os.path.join(h5obj.name, k))
-                kwargs['datasets'][k] = None
+                        builder = self.__read_group(sub_h5obj, ignore=ignore)
+                    kwargs['groups'].append(builder)
+                self.__set_built(sub_h5obj.file.filename, sub_h5obj.name, builder)
+        return kwargs
+
+    def __read_scanned_group_contents(self, path):
+        '''Read the contents of a group from the H5MetadataScan of the file'''
+        if self.__scan is None or self.__scan.get_type(path) != H5MetadataScan.GROUP:
+            # the metadata record was dropped after the builder of the group was created
+            return self.__read_group_contents(self.__file[path], self.__ignore)
+        try:
+            return self.__read_scanned_links(path)
+        except KeyError:
+            # an object in the metadata record was deleted from the file
+            if not self.__from_record:
+                raise
+            self.__drop_metadata_record(path)
+            return self.__read_scanned_group_contents(path)
+
+    def __read_scanned_links(self, path):
+        # opening the group raises a KeyError if it no longer matches the metadata record
+        self.__scan.get_object(path)
+        kwargs = {
+            "attributes": self.__read_attrs(self.__file, self.__scan.get_attributes(path)),
+            "groups": list(),
+            "datasets": list(),
+            "links": list()
+        }
+
+        for key, val in kwargs['attributes'].items():
+            if isinstance(val, bytes):
+                kwargs['attributes'][key] = val.decode('UTF-8')
+
+        for k, link_type, target in self.__scan.get_links(path):
+            if link_type == H5MetadataScan.HARD:
+                builder = self.__read_scanned_object(target)
+                if isinstance(builder, DatasetBuilder):
+                    kwargs['datasets'].append(builder)
+                elif isinstance(builder, GroupBuilder):
+                    kwargs['groups'].append(builder)
                 continue
-        kwargs['source'] = self.__path
-        ret = GroupBuilder(name, **kwargs)
-        ret.written = True
+            if link_type == H5MetadataScan.SOFT and self.__scan.get_type(target) is not None:
+                builder = self.__read_scanned_ref(target)
+            else:
+                # objects that were not scanned, e.g. in other files, are read like any other object
+                sub_h5obj = self.__file.get(posixpath.join(path, k))
+                if sub_h5obj is None:
+                    warnings.warn('Broken Link: %s' % posixpath.join(path, k))
+                    continue
+                builder = self.__read_ref(sub_h5obj, target if link_type == H5MetadataScan.SOFT else target[1])
+            link_builder = LinkBuilder(builder, k, source=self.__path)
+            link_builder.written = True
+            kwargs['links'].append(link_builder)
+        return kwargs
+
+    def __read_scanned_object(self, path):
+        '''Get the builder for the object that was first found at path by the H5MetadataScan of the file'''
+        if path == '/':
+            return self.read_builder()
+        ret = self.__get_built(self.__file.filename, path)
+        if ret is None:
+            obj_type = self.__scan.get_type(path)
+            name = posixpath.basename(path)
+            if obj_type == H5MetadataScan.DATASET:
+                # opening the dataset raises a KeyError if it no longer exists or matches the metadata record
+                oid = self.__scan.get_object(path)
+                ret = self.__read_dataset(Dataset(oid), name, self.__scan.get_attributes(path),
+                                          self.__scan.get_layout(path))
+            elif obj_type == H5MetadataScan.GROUP:
+                ret = LazyGroupBuilder(name, partial(self.__read_scanned_group_contents, path), source=self.__path)
+                ret.written = True
+            else:
+                # committed datatypes are not read
+                return None
+            self.__set_built(self.__file.filename, path, ret)
         return ret
 
-    def __read_dataset(self, h5obj, name=None):
+    def __read_scanned_ref(self, path):
+        '''Get the builder for a scanned object, attaching it to the builder of its parent group, like __read_ref'''
+        ret = self.__get_built(self.__file.filename, path)
+        if ret is None:
+            ret = self.__read_scanned_object(path)
+            if ret is not None:
+                ret.parent = self.__read_scanned_ref(posixpath.dirname(path))
+        return ret
+
+    def __read_dataset(self, h5obj, name=None, attributes=None, layout=None):
+        if layout is None:
+            layout = (h5obj.dtype, h5obj.shape, h5obj.maxshape)
+        dtype, shape, maxshape = layout
         kwargs = {
-            "attributes": self.__read_attrs(h5obj),
-            "dtype": h5obj.dtype,
-            "maxshape": h5obj.maxshape
+            "attributes": self.__read_attrs(h5obj, attributes),
+            "dtype": dtype,
+            "maxshape": maxshape
         }
         for key, val in kwargs['attributes'].items():
             if isinstance(val, bytes):
@@ -323,17 +587,14 @@ class HDF5IO(FORMIO):
         if name is None:
             name = str(os.path.basename(h5obj.name))
         kwargs['source'] = self.__path
-        ndims = len(h5obj.shape)
+        ndims = len(shape)
         if ndims == 0:                                       # read scalar
             scalar = h5obj[()]
             if isinstance(scalar, bytes):
                 scalar = scalar.decode('UTF-8')
 
             if isinstance(scalar, Reference):
-                # TODO (AJTRITT):  This should call __read_ref to support Group references
-                target = h5obj.file[scalar]
-                target_builder = self.__read_dataset(target)
-                self.__set_built(target.file.filename, target.name, target_builder)
+                target_builder = self.__read_ref(h5obj.file[scalar])
                 if isinstance(scalar, RegionReference):
                     kwargs['data'] = RegionBuilder(scalar, target_builder)
                 else:
@@ -342,31 +603,41 @@ class HDF5IO(FORMIO):
                 kwargs["data"] = scalar
         elif ndims == 1:
             d = None
-            if h5obj.dtype.kind == 'O':    # read list of strings or list of references
+            if dtype.kind == 'O':    # read list of strings or list of references
                 elem1 = h5obj[0]
                 if isinstance(elem1, (text_type, binary_type)):
-                    d = h5obj[()]
+                    d = H5StrDataset(h5obj, self)
                 elif isinstance(elem1, RegionReference):
                     d = H5RegionDataset(h5obj, self)
                 elif isinstance(elem1, Reference):
                     d = H5ReferenceDataset(h5obj, self)
-            elif h5obj.dtype.kind == 'V':    # table
-                cpd_dt = h5obj.dtype
+            elif dtype.kind == 'V':    # table
+                cpd_dt = dtype
                 ref_cols = [check_dtype(ref=cpd_dt[i]) for i in range(len(cpd_dt))]
                 d = H5TableDataset(h5obj, self, ref_cols)
             else:
-                d = h5obj
+                d = self.__read_array(h5obj)
             kwargs["data"] = d
         else:
-            kwargs["data"] = h5obj
+            kwargs["data"] = self.__read_array(h5obj)
         ret = DatasetBuilder(name, **kwargs)
         ret.written = True
         return ret
 
-    def __read_attrs(self, h5obj):
+    def __read_array(self, h5obj):
+        # compressed arrays are wrapped, so that their chunks can be decompressed in parallel or cached
+        if h5obj.compression is None or h5obj.dtype.kind not in 'iuf':
+            return h5obj
+        if self.__chunk_cache is not None or (self.__read_workers is not None and h5obj.compression == 'gzip'):
+            return H5Dataset(h5obj, self)
+        return h5obj
+
+    def __read_attrs(self, h5obj, attributes=None):
         ret = dict()
-        for k, v in h5obj.attrs.items():
-            if k == SPEC_LOC_ATTR:     # ignore cached spec
+        if attributes is None:
+            attributes = h5obj.attrs
+        for k, v in attributes.items():
+            if k in (SPEC_LOC_ATTR, METADATA_LOC_ATTR):     # ignore cached spec and metadata
                 continue
             if isinstance(v, RegionReference):
                 raise ValueError("cannot read region reference attributes yet")
@@ -376,39 +647,77 @@ class HDF5IO(FORMIO):
                 ret[k] = v
         return ret
 
-    def __read_ref(self, h5obj):
-        ret = None
-        ret = self.__get_built(h5obj.file.filename, h5obj.name)
+    def __read_ref(self, h5obj, path=None):
+        '''
+        Get the builder for the given HDF5 object, reading it if it has not been read yet
+
+        Builders for objects in this file are attached to the builder of their parent group,
+        so that they can be constructed without reading the rest of the file.
+        '''
+        if path is None:
+            path = h5obj.name
+        fpath = h5obj.file.filename
+        if fpath == self.__file.filename and path == '/':
+            return self.read_builder()
+        ret = self.__get_built(fpath, path)
         if ret is None:
             if isinstance(h5obj, Dataset):
-                ret = self.__read_dataset(h5obj)
+                ret = self.__read_dataset(h5obj, os.path.basename(path))
             elif isinstance(h5obj, Group):
-                ret = self.__read_group(h5obj)
+                ret = self.__read_group(h5obj, os.path.basename(path))
             else:
                 raise ValueError("h5obj must be a Dataset or a Group - got %s" % str(h5obj))
-            self.__set_built(h5obj.file.filename, h5obj.name, ret)
+            self.__set_built(fpath, path, ret)
+            if fpath == self.__file.filename and path != '/':
+                ret.parent = self.__read_ref(self.__file[os.path.dirname(path)])
         return ret
 
     def open(self):
         if self.__file is None:
             open_flag = self.__mode
-            self.__file = File(self.__path, open_flag)
+            if self.__comm is not None:
+                self.__file = File(self.__path, open_flag, driver='mpio', comm=self.__comm)
+            else:
+                self.__file = File(self.__path, open_flag)
 
     def close(self):
         if self.__file is not None:
             self.__file.close()
+        if self.__chunk_cache is not None:
+            self.__chunk_cache.clear()
+        self.__ref_cache.clear()
+        self.__scan = None
+        self.__from_record = False
+        if self.__read_pool is not None:
+            self.__read_pool.terminate()
+            self.__read_pool = None
 
     @docval({'name': 'builder', 'type': GroupBuilder, 'doc': 'the GroupBuilder object representing the NWBFile'},
             {'name': 'link_data', 'type': bool,
              'doc': 'If not specified otherwise link (True) or copy (False) HDF5 Datasets', 'default': True})
     def write_builder(self, **kwargs):
         f_builder, link_data = getargs('builder', 'link_data', kwargs)
-        for name, gbldr in f_builder.groups.items():
-            self.write_group(self.__file, gbldr)
-        for name, dbldr in f_builder.datasets.items():
-            self.write_dataset(self.__file, dbldr, link_data)
-        self.set_attributes(self.__file, f_builder.attributes)
-        self.__add_refs()
+        if not f_builder.written or f_builder.modified:
+            # an unmodified file that was read only needs its queued references written
+            for name, gbldr in f_builder.groups.items():
+                self.write_group(self.__file, gbldr)
+            for name, dbldr in f_builder.datasets.items():
+                self.write_dataset(self.__file, dbldr, link_data)
+            self.set_attributes(self.__file, self.__get_attributes_to_write(f_builder))
+        try:
+            self.__add_refs()
+        finally:
+            self.__paths.clear()
+            self.__obj_refs.clear()
+        f_builder.set_modified(False)
+
+    @staticmethod
+    def __get_attributes_to_write(builder):
+        '''Get all attributes of a new Builder, or only the modified attributes of a written Builder'''
+        attributes = builder.attributes
+        if builder.written:
+            attributes = {k: attributes[k] for k in builder.modified_attributes if k in attributes}
+        return attributes
 
     def __add_refs(self):
         '''
@@ -418,17 +727,57 @@ class HDF5IO(FORMIO):
         the current traversal algorithm (i.e. iterating over GroupBuilder items)
         does not happen in a guaranteed order. We need to figure out what objects
         will be references, and then write them after we write everything else.
+        The queued fillers are run in dependency order, i.e. a filler that writes a
+        dataset runs before the fillers that write references to that dataset.
         '''
+        queue = deque(self.__order_refs(self.__ref_queue))
+        self.__ref_queue.clear()
         failed = set()
-        while len(self.__ref_queue) > 0:
-            call = self.__ref_queue.popleft()
+        while len(queue) > 0:
+            call = queue.popleft()
             try:
                 call()
             except KeyError:
                 if id(call) in failed:
                     raise RuntimeError('Unable to resolve reference')
                 failed.add(id(call))
-                self.__ref_queue.append(call)
+                queue.append(call)
+
+    @classmethod
+    def __order_refs(cls, queue):
+        '''
+        Topologically sort queued reference fillers by the builders they write and refer to
+
+        Fillers that are part of a dependency cycle are run last, in the order they were queued.
+        '''
+        queue = list(queue)
+        providers = dict()
+        for i, (builder, targets, func) in enumerate(queue):
+            if builder is not None:
+                providers.setdefault(id(builder), list()).append(i)
+        n_deps = [0] * len(queue)
+        dependents = [list() for i in range(len(queue))]
+        for i, (builder, targets, func) in enumerate(queue):
+            deps = set()
+            for target in targets:
+                deps.update(providers.get(id(target), ()))
+            deps.discard(i)
+            n_deps[i] = len(deps)
+            for j in deps:
+                dependents[j].append(i)
+        ready = deque(i for i in range(len(queue)) if n_deps[i] == 0)
+        order = list()
+        while len(ready) > 0:
+            i = ready.popleft()
+            order.append(i)
+            for j in dependents[i]:
+                n_deps[j] -= 1
+                if n_deps[j] == 0:
+                    ready.append(j)
+        if len(order) < len(queue):
+            ordered = set(order)
+            order.extend(i for i in range(len(queue)) if i not in ordered)
+        return [queue[i][2] for i in order]
 
     @classmethod
     def get_type(cls, data):
@@ -508,12 +857,13 @@ class HDF5IO(FORMIO):
                     if isinstance(tmp[0], (text_type, binary_type)):
                         value = [np.string_(s) for s in tmp]
                     elif isinstance(tmp[0], Container):  # a list of references
-                        self.__queue_ref(self._make_attr_ref_filler(obj, key, tmp))
+                        self.__queue_ref(self._make_attr_ref_filler(obj, key, tmp), targets=self.__get_targets(tmp))
+                        continue
                     else:
                         value = np.array(value)
                 obj.attrs[key] = value
             elif isinstance(value, (Container, Builder, ReferenceBuilder)):           # a reference
-                self.__queue_ref(self._make_attr_ref_filler(obj, key, value))
+                self.__queue_ref(self._make_attr_ref_filler(obj, key, value), targets=self.__get_targets([value]))
             else:
                 obj.attrs[key] = value                   # a regular scalar
 
@@ -523,10 +873,7 @@ class HDF5IO(FORMIO):
         '''
         if isinstance(value, (tuple, list)):
             def _filler():
-                ret = list()
-                for item in value:
-                    ret.append(self.__get_ref(item))
-                obj.attrs[key] = ret
+                obj.attrs[key] = self.__get_refs(value)
         else:
             def _filler():
                 obj.attrs[key] = self.__get_ref(value)
@@ -540,6 +887,9 @@ class HDF5IO(FORMIO):
         parent, builder = getargs('parent', 'builder', kwargs)
         if builder.written:
             group = parent[builder.name]
+            if not builder.modified:
+                # nothing below this group changed, so do not read or visit its contents
+                return group
         else:
             group = parent.create_group(builder.name)
         # write all groups
@@ -558,20 +908,30 @@ class HDF5IO(FORMIO):
         if links:
             for link_name, sub_builder in links.items():
                 self.write_link(group, sub_builder)
-        attributes = builder.attributes
-        self.set_attributes(group, attributes)
+        self.set_attributes(group, self.__get_attributes_to_write(builder))
         builder.written = True
+        builder.set_modified(False)
         return group
 
     def __get_path(self, builder):
+        # the path of each builder is computed from the path of its parent, so that each path is built once
+        path = self.__paths.get(id(builder))
+        if path is not None:
+            return path
+        builders = list()
         curr = builder
-        names = list()
         while curr is not None and curr.name != ROOT_NAME:
-            names.append(curr.name)
+            path = self.__paths.get(id(curr))
+            if path is not None:
+                break
+            builders.append(curr)
             curr = curr.parent
-        delim = "/"
-        path = "%s%s" % (delim, delim.join(reversed(names)))
-        return path
+        if path is None or path == '/':
+            path = ''
+        for curr in reversed(builders):
+            path = "%s/%s" % (path, curr.name)
+            self.__paths[id(curr)] = path
+        return path or '/'
 
     @docval({'name': 'parent', 'type': Group, 'doc': 'the parent HDF5 object'},
             {'name': 'builder', 'type': LinkBuilder, 'doc': 'the LinkBuilder to write'},
@@ -608,16 +968,21 @@ class HDF5IO(FORMIO):
         """
         parent, builder, link_data = getargs('parent', 'builder', 'link_data', kwargs)
         if builder.written:
+            if builder.modified:
+                self.__append_dataset(parent, builder)
             return None
         name = builder.name
         data = builder.data
         options = dict()   # dict with additional
         if isinstance(data, H5DataIO):
             options['io_settings'] = data.io_settings
+            options['growth'] = data.growth
+            options['compression_workers'] = data.compression_workers
             link_data = data.link_data
             data = data.data
         else:
             options['io_settings'] = {}
+        options['comm'] = self.__comm
         attributes = builder.attributes
         options['dtype'] = builder.dtype
         dset = None
@@ -660,18 +1025,21 @@ class HDF5IO(FORMIO):
                     raise_from(Exception(msg), exc)
                 dset = parent.require_dataset(name, shape=(len(data),), dtype=_dtype, **options['io_settings'])
                 builder.written = True
+                columns = [[item[i] for item in data] for i in range(len(_dtype))]
+                targets = list()
+                for i in refs:
+                    targets.extend(self.__get_targets(columns[i]))
 
-                @self.__queue_ref
                 def _filler():
-                    ret = list()
-                    for item in data:
-                        new_item = list(item)
-                        for i in refs:
-                            new_item[i] = self.__get_ref(item[i])
-                        ret.append(tuple(new_item))
+                    ret = np.empty(len(data), dtype=_dtype)
+                    for i, col in enumerate(columns):
+                        if i in refs:
+                            col = self.__get_refs(col, _dtype[i])
+                        ret[_dtype.names[i]] = col
                     dset = parent[name]
                     dset[:] = ret
                     self.set_attributes(dset, attributes)
+                self.__queue_ref(_filler, builder, targets)
                 return
             # If the compound data type contains only regular data (i.e., no references) then we can write it as usual
             else:
@@ -685,23 +1053,23 @@ class HDF5IO(FORMIO):
                 dset = parent.require_dataset(name, shape=(), dtype=_dtype)
                 builder.written = True
 
-                @self.__queue_ref
                 def _filler():
                     ref = self.__get_ref(data.builder, data.region)
                     dset = parent[name]
                     dset[()] = ref
                     self.set_attributes(dset, attributes)
+                self.__queue_ref(_filler, builder, [data.builder])
             # Write a scalar object reference dataset
             elif isinstance(data, ReferenceBuilder):
                 dset = parent.require_dataset(name, dtype=_dtype, shape=())
                 builder.written = True
 
-                @self.__queue_ref
                 def _filler():
                     ref = self.__get_ref(data.builder)
                     dset = parent[name]
                     dset[()] = ref
                     self.set_attributes(dset, attributes)
+                self.__queue_ref(_filler, builder, [data.builder])
             # Write an array dataset of references
             else:
                 # Write a array of region references
@@ -709,27 +1077,21 @@ class HDF5IO(FORMIO):
                     dset = parent.require_dataset(name, dtype=_dtype, shape=(len(data),), **options['io_settings'])
                     builder.written = True
 
-                    @self.__queue_ref
                     def _filler():
-                        refs = list()
-                        for item in data:
-                            refs.append(self.__get_ref(item.builder, item.region))
                         dset = parent[name]
-                        dset[()] = refs
+                        dset[()] = self.__get_refs(data, _dtype)
                         self.set_attributes(dset, attributes)
+                    self.__queue_ref(_filler, builder, self.__get_targets(data))
                 # Write array of object references
                 else:
                     dset = parent.require_dataset(name, shape=(len(data),), dtype=_dtype, ** options['io_settings'])
                     builder.written = True
 
-                    @self.__queue_ref
                     def _filler():
-                        refs = list()
-                        for item in data:
-                            refs.append(self.__get_ref(item))
                         dset = parent[name]
-                        dset[()] = refs
+                        dset[()] = self.__get_refs(data, _dtype)
                         self.set_attributes(dset, attributes)
+                    self.__queue_ref(_filler, builder, self.__get_targets(data))
             return
         # write a "regular" dataset
         else:
@@ -747,6 +1109,7 @@ class HDF5IO(FORMIO):
                 dset = self.__scalar_fill__(parent, name, data, options)
         # Create the attributes on the dataset only if we are the primary and not just a Soft/External link
         if link is None:
+            self.__drop_cached_chunks(dset)
             self.set_attributes(dset, attributes)
         # Validate the attributes on the linked dataset
         elif len(attributes) > 0:
@@ -754,6 +1117,45 @@ class HDF5IO(FORMIO):
         builder.written = True
         return
 
+    def __append_dataset(self, parent, builder):
+        """Write the rows appended to, and the attributes modified on, a dataset that was already written"""
+        dset = parent[builder.name]
+        data = builder.data
+        if isinstance(data, H5DataIO):
+            data = data.data
+        n = dset.shape[0] if len(dset.shape) > 0 else None
+        tail = None
+        if isinstance(data, ExtendedData) and len(data.data) == n:
+            tail = data.extension
+        elif n is not None and not isinstance(data, Dataset) and hasattr(data, '__len__') and len(data) > n:
+            tail = data[n:]
+        if tail is not None and len(tail) > 0:
+            if check_dtype(ref=dset.dtype) is not None or dset.dtype.names is not None:
+                raise ValueError("cannot append to dataset '%s' - appending references is not supported" % dset.name)
+            if dset.maxshape[0] is not None and dset.maxshape[0] < n + len(tail):
+                raise ValueError("cannot append to dataset '%s' - dataset is not resizable; "
+                                 "write it with H5DataIO(maxshape=(None, ...)) to allow appending" % dset.name)
+            dtype = check_dtype(vlen=dset.dtype)
+            if dtype is not None and dtype is not bytes and dtype is not text_type:
+                tail = np.asarray(tail, dtype=dtype)
+            elif dtype is not None:
+                tail = np.array(tail, dtype=object)
+            else:
+                tail = np.asarray(tail)
+            dset.resize(n + len(tail), axis=0)
+            dset[n:] = tail
+            self.__drop_cached_chunks(dset)
+            if isinstance(data, ExtendedData):
+                # the extension is part of the dataset now
+                del data.extension[:]
+        self.set_attributes(dset, self.__get_attributes_to_write(builder))
+        builder.set_modified(False)
+
+    def __drop_cached_chunks(self, dset):
+        '''Remove the chunks of a dataset that was written to from the chunk cache'''
+        if self.__chunk_cache is not None:
+            self.__chunk_cache.drop(dset.file.filename, dset.name)
+
     @classmethod
     def __selection_max_bounds__(cls, selection):
         """Determine the bounds of a numpy selection index tuple"""
@@ -766,6 +1168,33 @@ class HDF5IO(FORMIO):
         elif isinstance(selection, tuple):
             return tuple([cls.__selection_max_bounds__(i) for i in selection])
 
+    @classmethod
+    def __rank_slab(cls, comm, length):
+        """Determine the part of the range [0, length) that the calling MPI rank writes"""
+        step, extra = divmod(length, comm.size)
+        start = comm.rank * step + min(comm.rank, extra)
+        stop = start + step + (1 if comm.rank < extra else 0)
+        return start, stop
+
+    @classmethod
+    def __parallel_io_settings(cls, comm, io_settings):
+        """
+        Combine the dataset creation settings of all MPI ranks, so that all ranks create the same dataset
+
+        The shape is the largest shape on any rank, and an axis of maxshape is unlimited if it is unlimited on
+        any rank. For all other settings, the first value given by any rank is used.
+        """
+        ret = dict()
+        for settings in comm.allgather(io_settings):
+            for key, val in settings.items():
+                if key not in ret or ret[key] is None:
+                    ret[key] = val
+                elif key == 'shape' and val is not None:
+                    ret[key] = tuple(max(a, b) for a, b in zip(ret[key], val))
+                elif key == 'maxshape' and val is not None:
+                    ret[key] = tuple(None if a is None or b is None else max(a, b) for a, b in zip(ret[key], val))
+        return ret
+
     @classmethod
     def __scalar_fill__(cls, parent, name, data, options=None):
         dtype = None
@@ -797,14 +1226,23 @@ class HDF5IO(FORMIO):
         :type name: str
         :param data: The data to be written.
         :type data: DataChunkIterator
-        :param options: Dict with options for creating a dataset. available options are 'dtype' and 'io_settings'
+        :param options: Dict with options for creating a dataset. available options are 'dtype', 'io_settings',
+                        'comm', the MPI communicator to use for parallel I/O, 'growth', the policy for
+                        resizing the dataset, and 'compression_workers', the number of threads compressing
+                        chunks (see H5DataIO)
         :type data: dict
 
         """
         io_settings = {}
+        comm = None
+        growth = 'exact'
+        workers = None
         if options is not None:
             if 'io_settings' in options:
                 io_settings = options.get('io_settings')
+            comm = options.get('comm')
+            growth = options.get('growth', growth)
+            workers = options.get('compression_workers')
         # Define the chunking options if the user has not set them explicitly. We need chunking for the iterative write.
         if 'chunks' not in io_settings:
             recommended_chunks = data.recommended_chunk_shape()
@@ -817,35 +1255,109 @@ class HDF5IO(FORMIO):
             io_settings['maxshape'] = data.maxshape
         if 'dtype' not in io_settings:
             io_settings['dtype'] = data.dtype
+        if comm is not None:
+            # datasets must be created collectively
+            io_settings = cls.__parallel_io_settings(comm, io_settings)
         try:
             dset = parent.create_dataset(name, **io_settings)
         except Exception as exc:
             raise_from(Exception("Could not create dataset %s in %s" % (name, parent.name)), exc)
-        for chunk_i in data:
-            # Determine the minimum array dimensions to fit the chunk selection
-            max_bounds = cls.__selection_max_bounds__(chunk_i.selection)
-            if not hasattr(max_bounds, '__len__'):
-                max_bounds = (max_bounds,)
-            # Determine if we need to expand any of the data dimensions
-            expand_dims = [i for i, v in enumerate(max_bounds) if v is not None and v > dset.shape[i]]
-            # Expand the dataset if needed
-            if len(expand_dims) > 0:
-                new_shape = np.asarray(dset.shape)
-                new_shape[expand_dims] = np.asarray(max_bounds)[expand_dims]
-                dset.resize(new_shape)
-            # Process and write the data
-            dset[chunk_i.selection] = chunk_i.data
+        initial_shape = dset.shape
+        extent = [0] * len(dset.shape)     # the extent of the data written so far
+        pool = cls.__compression_pool(dset, workers)
+        try:
+            for chunk_i in data:
+                cls.__write_chunk(dset, chunk_i, extent, growth, comm, pool)
+        except Exception:
+            # stop any background thread reading ahead for the chunks
+            if isinstance(data, ThreadedDataChunkIterator):
+                data.close()
+            raise
+        finally:
+            if pool is not None:
+                pool.terminate()
+        # Trim any space allocated beyond the data that was written
+        final_shape = tuple(max(s, e) for s, e in zip(initial_shape, extent))
+        if final_shape != dset.shape:
+            dset.resize(final_shape)
         return dset
 
+    @classmethod
+    def __write_chunk(cls, dset, chunk, extent, growth, comm, pool=None):
+        """
+        Write a DataChunk to a dataset, expanding the dataset if needed
+
+        :param extent: the extent of the data written so far, updated in place
+        :param pool: the thread pool compressing chunks of the dataset, or None to let HDF5 compress them
+        """
+        # Determine the minimum array dimensions to fit the chunk selection
+        max_bounds = cls.__selection_max_bounds__(chunk.selection)
+        if not hasattr(max_bounds, '__len__'):
+            max_bounds = (max_bounds,)
+        for i, v in enumerate(max_bounds):
+            if v is not None and v > extent[i]:
+                extent[i] = v
+        # Determine if we need to expand any of the data dimensions
+        expand_dims = [i for i, v in enumerate(max_bounds) if v is not None and v > dset.shape[i]]
+        # Expand the dataset if needed
+        if len(expand_dims) > 0:
+            if comm is not None:
+                # resizing is a collective operation, so all ranks would need to resize at the same time
+                msg = ("cannot write %s in parallel: selection %s is outside of the dataset shape %s - "
+                       "use a DataChunkIterator with a known maxshape or set the shape explicitly"
+                       % (dset.name, str(chunk.selection), str(dset.shape)))
+                raise ValueError(msg)
+            dset.resize(cls.__grow_shape(dset, max_bounds, expand_dims, growth))
+        # Process and write the data
+        if pool is not None:
+            block = np.asarray(chunk.data)
+            offset = cls.__selection_offset(chunk.selection, block.shape) if block.ndim == dset.ndim else None
+            if offset is not None:
+                cls.__write_block(dset, block, offset, pool)
+                return
+        dset[chunk.selection] = chunk.data
+
+    @classmethod
+    def __grow_shape(cls, dset, max_bounds, expand_dims, growth):
+        """
+        Determine the new shape of a dataset that needs to be expanded to fit max_bounds
+
+        :param growth: 'exact' to grow to max_bounds, 'chunk' to round up to a multiple of the chunk shape, or
+                       'geometric' to at least double the size of each expanded dimension
+        """
+        new_shape = list(dset.shape)
+        for i in expand_dims:
+            size = max_bounds[i]
+            if growth == 'geometric':
+                size = max(size, 2 * dset.shape[i])
+            elif growth == 'chunk' and dset.chunks is not None:
+                size = -(-size // dset.chunks[i]) * dset.chunks[i]
+            if dset.maxshape[i] is not None:
+                size = min(size, dset.maxshape[i])
+            new_shape[i] = size
+        return tuple(new_shape)
+
     @classmethod
     def __list_fill__(cls, parent, name, data, options=None):
         # define the io settings and data type if necessary
         io_settings = {}
         dtype = None
+        comm = None
+        workers = None
         if options is not None:
             dtype = options.get('dtype')
             io_settings = options.get('io_settings')
-        if not isinstance(dtype, type):
+            comm = options.get('comm')
+            workers = options.get('compression_workers')
+        if isinstance(data, DtypeView):
+            # write the original array, and let HDF5 convert the values while writing
+            if dtype is None:
+                dtype = data.dtype
+            data = data.data
+        if dtype is None and cls.__is_numeric(data):
+            # numeric arrays carry their own type, so there is no need to inspect the elements
+            dtype = data.dtype
+        elif not isinstance(dtype, type):
             try:
                 dtype = cls.__resolve_dtype__(dtype, data)
             except Exception as exc:
@@ -854,8 +1366,10 @@ class HDF5IO(FORMIO):
         # define the data shape
         if 'shape' in io_settings:
             data_shape = io_settings.pop('shape')
-        elif isinstance(dtype, np.dtype):
+        elif isinstance(dtype, np.dtype) and dtype.names is not None:
             data_shape = (len(data),)
+        elif isinstance(data, np.ndarray):
+            data_shape = data.shape
         else:
             data_shape = get_shape(data)
         # Create the dataset
@@ -870,37 +1384,206 @@ class HDF5IO(FORMIO):
             new_shape = list(dset.shape)
             new_shape[0] = len(data)
             dset.resize(new_shape)
+        # Each MPI rank writes its own slab of the data
+        start, stop = (0, len(data)) if comm is None else cls.__rank_slab(comm, len(data))
+        pool = cls.__compression_pool(dset, workers)
         try:
-            dset[:] = data
-        except Exception as e:
-            raise e
+            cls.__write_slabs(dset, data, start, stop, pool)
+        finally:
+            if pool is not None:
+                pool.terminate()
         return dset
 
+    # the maximum number of bytes converted at once when writing data that is not a contiguous numeric array
+    __slab_bytes = 64 * 2**20
+
+    @classmethod
+    def __is_numeric(cls, data):
+        """Check if data is a numeric array that HDF5 can read from directly"""
+        return isinstance(data, np.ndarray) and data.dtype.kind in 'iuf'
+
+    @classmethod
+    def __write_slabs(cls, dset, data, start, stop, pool=None):
+        """
+        Write data[start:stop] to dset[start:stop]
+
+        Contiguous numeric arrays are handed to HDF5 as they are, and HDF5 converts the values to the type of
+        the dataset while writing. Other numeric data is converted and written in slabs of at most
+        __slab_bytes, so that no copy of the complete data is made. Everything else is assigned in one go.
+        If pool is given, the chunks are compressed by its threads (see __write_block).
+        """
+        if stop <= start:
+            return
+        if dset.dtype.kind not in 'iuf' or dset.dtype.names is not None:
+            if start == 0 and stop == dset.shape[0]:
+                dset[:] = data
+            else:
+                dset[start:stop] = data[start:stop]
+            return
+        zeros = (0,) * (dset.ndim - 1)
+        if cls.__is_numeric(data) and data.shape[1:] == dset.shape[1:]:
+            if pool is not None:
+                cls.__write_block(dset, data[start:stop], (start,) + zeros, pool)
+                return
+            if data.flags.c_contiguous:
+                selection = np.s_[start:stop]
+                dset.write_direct(data, source_sel=selection, dest_sel=selection)
+                return
+        row_bytes = dset.dtype.itemsize * int(np.prod(dset.shape[1:]))
+        step = max(1, cls.__slab_bytes // max(1, row_bytes))
+        if pool is not None:
+            # write whole chunks, so that they can be compressed in parallel
+            step = -(-step // dset.chunks[0]) * dset.chunks[0]
+        for slab_start in range(start, stop, step):
+            slab_stop = min(slab_start + step, stop)
+            slab = np.ascontiguousarray(data[slab_start:slab_stop], dtype=dset.dtype)
+            if slab.shape[1:] != dset.shape[1:]:
+                dset[slab_start:slab_stop] = slab
+            elif pool is not None:
+                cls.__write_block(dset, slab, (slab_start,) + zeros, pool)
+            else:
+                dset.write_direct(slab, dest_sel=np.s_[slab_start:slab_stop])
+            del slab  # release the slab before the next one is allocated
+
+    @classmethod
+    def __compression_pool(cls, dset, workers):
+        """
+        Create a pool of workers threads for compressing the chunks of dset, or return None if workers is None
+        or the chunks of dset cannot be compressed outside of HDF5
+        """
+        if workers is None or dset.chunks is None:
+            return None
+        # only gzip, optionally preceded by the shuffle filter, is implemented here
+        if dset.compression != 'gzip' or dset.fletcher32 or dset.scaleoffset is not None:
+            return None
+        if dset.dtype.kind not in 'iuf':
+            return None
+        return ThreadPool(workers)
+
+    @classmethod
+    def __selection_offset(cls, selection, shape):
+        """
+        Get the offset of a selection of contiguous elements, or None if the selection is not contiguous
+        or does not match the given shape
+        """
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+        if len(selection) > len(shape):
+            return None
+        selection = selection + (slice(None),) * (len(shape) - len(selection))
+        offset = list()
+        for sel, size in zip(selection, shape):
+            if not isinstance(sel, slice) or sel.step not in (None, 1):
+                return None
+            start = sel.start or 0
+            if start < 0 or (sel.stop is not None and sel.stop - start != size):
+                return None
+            offset.append(start)
+        return tuple(offset)
+
+    @classmethod
+    def __write_block(cls, dset, block, offset, pool):
+        """
+        Write the array block to the gzip-compressed dataset dset, starting at offset
+
+        The chunks of dset that block covers entirely are compressed by the threads of pool, and written
+        with write_direct_chunk. HDF5 writes the remaining parts of block, which cover chunks partially.
+        """
+        chunks = dset.chunks
+        stop = [o + n for o, n in zip(offset, block.shape)]
+        # the range of the chunks that are covered entirely
+        lo = [-(-o // c) * c for o, c in zip(offset, chunks)]
+        hi = [max(b, e // c * c) for b, e, c in zip(lo, stop, chunks)]
+        if any(b == e for b, e in zip(lo, hi)):
+            dset[tuple(slice(o, e) for o, e in zip(offset, stop))] = block
+            return
+        dtype = dset.dtype
+        level = dset.compression_opts
+        shuffle = dset.shuffle
+
+        def compress(chunk_offset):
+            chunk = np.ascontiguousarray(block[tuple(slice(s - o, s - o + c)
+                                                     for s, o, c in zip(chunk_offset, offset, chunks))], dtype=dtype)
+            if shuffle:
+                # the shuffle filter stores the first byte of all elements, then the second byte, and so on
+                chunk = chunk.view(np.uint8).reshape(-1, dtype.itemsize).T
+            return chunk_offset, zlib.compress(chunk.tobytes(), level)
+
+        chunk_offsets = itertools.product(*[range(b, e, c) for b, e, c in zip(lo, hi, chunks)])
+        for chunk_offset, compressed in pool.imap(compress, chunk_offsets):
+            dset.id.write_direct_chunk(chunk_offset, compressed)
+        # write the remainder of the block, one region before and one after the chunks in each dimension
+        start = list(offset)
+        for i in range(len(offset)):
+            for region_start, region_stop in ((start[i], lo[i]), (hi[i], stop[i])):
+                if region_start < region_stop:
+                    region = [slice(s, e) for s, e in zip(start, stop)]
+                    region[i] = slice(region_start, region_stop)
+                    dset[tuple(region)] = block[tuple(slice(r.start - o, r.stop - o) for r, o in zip(region, offset))]
+            start[i], stop[i] = lo[i], hi[i]
+
     @docval({'name': 'container', 'type': (Builder, Container, ReferenceBuilder), 'doc': 'the object to reference'},
             {'name': 'region', 'type': (slice, list, tuple), 'doc': 'the region reference indexing object',
              'default': None},
             returns='the reference', rtype=Reference)
     def __get_ref(self, **kwargs):
         container, region = getargs('container', 'region', kwargs)
-        if isinstance(container, Builder):
-            if isinstance(container, LinkBuilder):
-                builder = container.target_builder
-            else:
-                builder = container
-        elif isinstance(container, ReferenceBuilder):
-            builder = container.builder
-        else:
-            builder = self.manager.build(container)
-        path = self.__get_path(builder)
+        builder = self.__get_builder(container)
         if isinstance(container, RegionBuilder):
             region = container.region
         if region is not None:
-            dset = self.__file[path]
+            dset = self.__file[self.__get_path(builder)]
             if not isinstance(dset, Dataset):
                 raise ValueError('cannot create region reference without Dataset')
-            return self.__file[path].regionref[region]
+            return dset.regionref[region]
         else:
-            return self.__file[path].ref
+            return self.__get_obj_ref(builder)
+
+    def __get_builder(self, container):
+        if isinstance(container, Builder):
+            if isinstance(container, LinkBuilder):
+                return container.builder
+            return container
+        elif isinstance(container, ReferenceBuilder):
+            return container.builder
+        return self.manager.build(container)
+
+    def __get_obj_ref(self, builder):
+        ref = self.__obj_refs.get(id(builder))
+        if ref is None:
+            ref = self.__file[self.__get_path(builder)].ref
+            self.__obj_refs[id(builder)] = ref
+        return ref
+
+    def __get_targets(self, items):
+        '''
+        Get the distinct builders referred to by the given Containers/Builders
+        '''
+        ret = dict()
+        for item in items:
+            if id(item) not in ret:
+                ret[id(item)] = self.__get_builder(item)
+        return list({id(b): b for b in ret.values()}.values())
+
+    def __get_refs(self, items, dtype=H5_REF):
+        '''
+        Get an array of references to the given Containers/Builders
+
+        Each distinct object is only resolved once, and the references are returned in a single
+        array, so that they can be written with one call.
+        '''
+        ret = np.empty(len(items), dtype=dtype)
+        resolved = dict()
+        for i, item in enumerate(items):
+            if isinstance(item, RegionBuilder):
+                ret[i] = self.__get_ref(item)
+                continue
+            ref = resolved.get(id(item))
+            if ref is None:
+                ref = self.__get_obj_ref(self.__get_builder(item))
+                resolved[id(item)] = ref
+            ret[i] = ref
+        return ret
 
     def __is_ref(self, dtype):
         if isinstance(dtype, DtypeSpec):
@@ -910,21 +1593,15 @@ class HDF5IO(FORMIO):
         else:
             return dtype == DatasetBuilder.OBJECT_REF_TYPE or dtype == DatasetBuilder.REGION_REF_TYPE
 
-    def __queue_ref(self, func):
+    def __queue_ref(self, func, builder=None, targets=()):
         '''Set aside filling dset with references
 
-        dest[sl] = func()
-
         Args:
-           dset: the h5py.Dataset that the references need to be added to
-           sl: the np.s_ (slice) object for indexing into dset
-           func: a function to call to return the chunk of data, with
-                 references filled in
+           func: a function to call to fill in the references
+           builder: the builder of the dataset that func writes, if any
+           targets: the builders that func writes references to
         '''
-        # TODO: come up with more intelligent way of
-        # queueing reference resolution, based on reference
-        # dependency
-        self.__ref_queue.append(func)
+        self.__ref_queue.append((builder, targets, func))
 
     def __rec_get_ref(self, l):
         ret = list()
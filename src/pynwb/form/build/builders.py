@@ -1,6 +1,5 @@
 import numpy as np
 from h5py import RegionReference
-import copy as _copy
 import itertools as _itertools
 import posixpath as _posixpath
 from abc import ABCMeta
@@ -9,9 +8,29 @@ from collections import Iterable
 
 from ..utils import docval, getargs, popargs, call_docval_func, fmt_docval_args
 from six import with_metaclass
+from six.moves import intern as _intern
+
+
+def _same_value(a, b):
+    '''Whether or not two attribute values are the same, without comparing the Builders they refer to'''
+    if a is b:
+        return True
+    if isinstance(a, ReferenceBuilder) or isinstance(b, ReferenceBuilder):
+        if not (isinstance(a, ReferenceBuilder) and isinstance(b, ReferenceBuilder)) or a.builder is not b.builder:
+            return False
+        if isinstance(a, RegionBuilder) or isinstance(b, RegionBuilder):
+            return _same_value(a.get('region'), b.get('region'))
+        return True
+    try:
+        return bool(a == b)
+    except ValueError:
+        # arrays with more than one element
+        return False
 
 
 class Builder(with_metaclass(ABCMeta, dict)):
+    # Builders do not have a __dict__, so that files with many objects can be represented with little memory
+    __slots__ = ('__name', '__parent', '__source', '__written', '__modified')
 
     @docval({'name': 'name', 'type': str, 'doc': 'the name of the group'},
             {'name': 'parent', 'type': 'Builder', 'doc': 'the parent builder of this Builder', 'default': None},
@@ -20,7 +39,7 @@ class Builder(with_metaclass(ABCMeta, dict)):
     def __init__(self, **kwargs):
         name, parent, source = getargs('name', 'parent', 'source', kwargs)
         super(Builder, self).__init__()
-        self.__name = name
+        self.__name = _intern(name)
         self.__parent = parent
         if source is not None:
             self.__source = source
@@ -29,6 +48,7 @@ class Builder(with_metaclass(ABCMeta, dict)):
         else:
             self.__source = None
         self.__written = False
+        self.__modified = False
 
     @property
     def path(self):
@@ -53,6 +73,32 @@ class Builder(with_metaclass(ABCMeta, dict)):
             raise ValueError("cannot change written to not written")
         self.__written = s
 
+    @property
+    def modified(self):
+        ''' Whether or not this Builder, or any Builder below it, changed after it was written '''
+        return self.__modified
+
+    @docval({'name': 'modified', 'type': bool,
+             'doc': 'whether or not this Builder has been modified', 'default': True})
+    def set_modified(self, **kwargs):
+        '''Mark this Builder as modified or unmodified
+
+        Marking a Builder as modified also marks all of its parents as modified, so that the modified
+        Builders can be found by descending from the root.
+        '''
+        modified = getargs('modified', kwargs)
+        self.__modified = modified
+        if modified:
+            parent = self.__parent
+            while parent is not None and not parent.__modified:
+                parent.__modified = True
+                parent = parent.__parent
+
+    @property
+    def _record_changes(self):
+        ''' Whether or not changes to this Builder need to be recorded, i.e. whether it has been written '''
+        return self.__written
+
     @property
     def name(self):
         ''' The name of this Builder '''
@@ -86,6 +132,7 @@ class Builder(with_metaclass(ABCMeta, dict)):
 
 
 class BaseBuilder(Builder):
+    __slots__ = ('__modified_attributes',)
     __attribute = 'attributes'
 
     @docval({'name': 'name', 'type': str, 'doc': 'the name of the group'},
@@ -98,6 +145,7 @@ class BaseBuilder(Builder):
         name, attributes, parent, source = getargs('name', 'attributes', 'parent', 'source', kwargs)
         super(BaseBuilder, self).__init__(name, parent, source)
         super(BaseBuilder, self).__setitem__(BaseBuilder.__attribute, dict())
+        self.__modified_attributes = None
         for name, val in attributes.items():
             self.set_attribute(name, val)
 
@@ -106,12 +154,35 @@ class BaseBuilder(Builder):
         ''' The attributes stored in this Builder object '''
         return super(BaseBuilder, self).__getitem__(BaseBuilder.__attribute)
 
+    @property
+    def modified_attributes(self):
+        ''' The names of the attributes that were set to a new value after this Builder was written '''
+        return tuple(self.__modified_attributes or ())
+
+    @docval({'name': 'modified', 'type': bool,
+             'doc': 'whether or not this Builder has been modified', 'default': True})
+    def set_modified(self, **kwargs):
+        '''Mark this Builder as modified or unmodified
+
+        Marking a Builder as unmodified also forgets which of its attributes were modified.
+        '''
+        modified = getargs('modified', kwargs)
+        super(BaseBuilder, self).set_modified(modified)
+        if not modified:
+            self.__modified_attributes = None
+
     @docval({'name': 'name', 'type': str, 'doc': 'the name of the attribute'},
             {'name': 'value', 'type': None, 'doc': 'the attribute value'})
     def set_attribute(self, **kwargs):
         ''' Set an attribute for this group. '''
         name, value = getargs('name', 'value', kwargs)
-        super(BaseBuilder, self).__getitem__(BaseBuilder.__attribute)[name] = value
+        attributes = super(BaseBuilder, self).__getitem__(BaseBuilder.__attribute)
+        if self._record_changes and not (name in attributes and _same_value(attributes[name], value)):
+            if self.__modified_attributes is None:
+                self.__modified_attributes = set()
+            self.__modified_attributes.add(name)
+            self.set_modified()
+        attributes[_intern(name)] = value
         # self.obj_type[name] = BaseBuilder.__attribute
 
     @docval({'name': 'builder', 'type': 'BaseBuilder', 'doc': 'the BaseBuilder to merge attributes from '})
@@ -124,6 +195,7 @@ class BaseBuilder(Builder):
 
 
 class GroupBuilder(BaseBuilder):
+    __slots__ = ('obj_type',)
     __link = 'links'
     __group = 'groups'
     __dataset = 'datasets'
@@ -155,7 +227,6 @@ class GroupBuilder(BaseBuilder):
         super(GroupBuilder, self).__setitem__(GroupBuilder.__group, dict())
         super(GroupBuilder, self).__setitem__(GroupBuilder.__dataset, dict())
         super(GroupBuilder, self).__setitem__(GroupBuilder.__link, dict())
-        self.__name = name
         for group in groups:
             self.set_group(group)
         for dataset in datasets:
@@ -241,10 +312,17 @@ class GroupBuilder(BaseBuilder):
                 else:
                     raise KeyError("'%s' already exists as %s in %s, cannot set as %s" %
                                    (name, self.obj_type[name], self.name, obj_type))
+        existing = super(GroupBuilder, self).__getitem__(obj_type).get(name)
+        if isinstance(existing, LinkBuilder) and isinstance(builder, LinkBuilder) and existing.written and \
+                existing.builder is builder.builder:
+            # keep the link that was written rather than the same link rebuilt
+            return
         super(GroupBuilder, self).__getitem__(obj_type)[name] = builder
         self.obj_type[name] = obj_type
         if builder.parent is None:
             builder.parent = self
+        if existing is not builder and self._record_changes:
+            self.set_modified()
 
     @docval({'name': 'name', 'type': str, 'doc': 'the name of this dataset'},
             {'name': 'data', 'type': ('array_data', 'scalar_data', 'data', 'DatasetBuilder', Iterable),
@@ -355,8 +433,7 @@ class GroupBuilder(BaseBuilder):
            datasets, attributes, and links sub-dictionaries.
         '''
         try:
-            key_ar = _posixpath.normpath(key).split('/')
-            return self.__get_rec(key_ar)
+            return self.__get_rec(key)
         except KeyError:
             raise KeyError(key)
 
@@ -365,19 +442,21 @@ class GroupBuilder(BaseBuilder):
            datasets, attributes, and links sub-dictionaries.
         '''
         try:
-            key_ar = _posixpath.normpath(key).split('/')
-            return self.__get_rec(key_ar)
+            return self.__get_rec(key)
         except KeyError:
             return default
 
-    def __get_rec(self, key_ar):
-        # recursive helper for __getitem__
-        if len(key_ar) == 1:
-            return super(GroupBuilder, self).__getitem__(self.obj_type[key_ar[0]])[key_ar[0]]
-        else:
-            if key_ar[0] in super(GroupBuilder, self).__getitem__(GroupBuilder.__group):
-                return super(GroupBuilder, self).__getitem__(GroupBuilder.__group)[key_ar[0]].__get_rec(key_ar[1:])
-        raise KeyError(key_ar[0])
+    def __get_rec(self, key):
+        # helper for __getitem__ that descends into subgroups for each part of a path
+        if '/' not in key:
+            return super(GroupBuilder, self).__getitem__(self.obj_type[key])[key]
+        if '.' in key or '//' in key or key.endswith('/'):
+            key = _posixpath.normpath(key)
+        key_ar = key.split('/')
+        builder = self
+        for name in key_ar[:-1]:
+            builder = super(GroupBuilder, builder).__getitem__(GroupBuilder.__group)[name]
+        return builder.__get_rec(key_ar[-1])
 
     def __setitem__(self, args, val):
         raise NotImplementedError('__setitem__')
@@ -413,7 +492,109 @@ class GroupBuilder(BaseBuilder):
                                 super(GroupBuilder, self).__getitem__(GroupBuilder.__link).values())
 
 
+class LazyGroupBuilder(GroupBuilder):
+    '''
+    A GroupBuilder that reads its contents from the backend the first time they are needed
+
+    Until then, only the name, parent and source of the group are known. Accessing the attributes,
+    subgroups, datasets or links (directly, or through any of the dict-like methods of GroupBuilder)
+    calls *loader* once. *loader* must return a dict with the keys 'attributes', 'groups',
+    'datasets' and 'links', formatted like the corresponding arguments to GroupBuilder.
+    '''
+
+    __slots__ = ('__loader', '__loading', '__obj_type')
+    __contents = ('attributes', 'groups', 'datasets', 'links')
+
+    @docval({'name': 'name', 'type': str, 'doc': 'the name of the group'},
+            {'name': 'loader', 'type': None, 'doc': 'a callable that returns the contents of this group'},
+            {'name': 'parent', 'type': GroupBuilder, 'doc': 'the parent builder of this Builder', 'default': None},
+            {'name': 'source', 'type': str,
+             'doc': 'the source of the data represented in this Builder', 'default': None})
+    def __init__(self, **kwargs):
+        name, loader, parent, source = getargs('name', 'loader', 'parent', 'source', kwargs)
+        self.__loader = None
+        self.__loading = False
+        super(LazyGroupBuilder, self).__init__(name, parent=parent, source=source)
+        for key in LazyGroupBuilder.__contents:
+            super(GroupBuilder, self).__delitem__(key)
+        self.__loader = loader
+
+    @property
+    def loaded(self):
+        ''' Whether or not the contents of this group have been read '''
+        return self.__loader is None
+
+    def load(self):
+        ''' Read the contents of this group, if they have not been read yet '''
+        loader = self.__loader
+        if loader is None:
+            return
+        self.__loader = None
+        self.__loading = True
+        try:
+            contents = loader()
+            for key in LazyGroupBuilder.__contents:
+                super(GroupBuilder, self).__setitem__(key, dict())
+            for name, val in contents.get('attributes', dict()).items():
+                self.set_attribute(name, val)
+            for group in contents.get('groups', list()):
+                self.set_group(group)
+            for dataset in contents.get('datasets', list()):
+                if dataset is not None:
+                    self.set_dataset(dataset)
+            for link in contents.get('links', list()):
+                self.set_link(link)
+        finally:
+            self.__loading = False
+
+    @property
+    def _record_changes(self):
+        # the contents that are read from the backend are not changes
+        return super(LazyGroupBuilder, self)._record_changes and not self.__loading
+
+    def __missing__(self, key):
+        # dict.__getitem__ calls this when the contents have not been read yet
+        if self.__loader is None:
+            raise KeyError(key)
+        self.load()
+        return super(GroupBuilder, self).__getitem__(key)
+
+    @property
+    def obj_type(self):
+        self.load()
+        return self.__obj_type
+
+    @obj_type.setter
+    def obj_type(self, val):
+        self.__obj_type = val
+
+    def __len__(self):
+        self.load()
+        return super(LazyGroupBuilder, self).__len__()
+
+    def __iter__(self):
+        self.load()
+        return super(LazyGroupBuilder, self).__iter__()
+
+    def __eq__(self, other):
+        self.load()
+        if isinstance(other, LazyGroupBuilder):
+            other.load()
+        return super(LazyGroupBuilder, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        if not self.loaded:
+            return '%s(%r, <not loaded>)' % (self.__class__.__name__, self.name)
+        return super(LazyGroupBuilder, self).__repr__()
+
+
 class DatasetBuilder(BaseBuilder):
+    __slots__ = ('__chunks', '__maxshape', '__dtype')
     OBJECT_REF_TYPE = 'object'
     REGION_REF_TYPE = 'region'
 
@@ -435,14 +616,12 @@ class DatasetBuilder(BaseBuilder):
             'name', 'data', 'dtype', 'attributes', 'maxshape', 'chunks', 'parent', 'source', kwargs)
         super(DatasetBuilder, self).__init__(name, attributes, parent, source)
         self['data'] = data
-        self['attributes'] = _copy.copy(attributes)
         self.__chunks = chunks
         self.__maxshape = maxshape
         if isinstance(data, BaseBuilder):
             if dtype is None:
                 dtype = self.OBJECT_REF_TYPE
         self.__dtype = dtype
-        self.__name = name
 
     @property
     def data(self):
@@ -483,12 +662,16 @@ class DatasetBuilder(BaseBuilder):
     def deep_update(self, **kwargs):
         '''Merge data and attributes from given DatasetBuilder into this DatasetBuilder'''
         dataset = getargs('dataset', kwargs)
-        if dataset.data:
+        if dataset.data is not None:
             self['data'] = dataset.data  # TODO: figure out if we want to add a check for overwrite
-        self['attributes'].update(dataset.attributes)
+            if self._record_changes:
+                self.set_modified()
+        for name, value in dataset.attributes.items():
+            self.set_attribute(name, value)
 
 
 class LinkBuilder(Builder):
+    __slots__ = ()
 
     @docval({'name': 'builder', 'type': (DatasetBuilder, GroupBuilder), 'doc': 'the target of this link'},
             {'name': 'name', 'type': str, 'doc': 'the name of the dataset', 'default': None},
@@ -508,6 +691,7 @@ class LinkBuilder(Builder):
 
 
 class ReferenceBuilder(dict):
+    __slots__ = ()
 
     @docval({'name': 'builder', 'type': (DatasetBuilder, GroupBuilder), 'doc': 'the Dataset this region applies to'})
     def __init__(self, **kwargs):
@@ -521,6 +705,7 @@ class ReferenceBuilder(dict):
 
 
 class RegionBuilder(ReferenceBuilder):
+    __slots__ = ()
 
     @docval({'name': 'region', 'type': (slice, tuple, list, RegionReference),
              'doc': 'the region i.e. slice or indices into the target Dataset'},
@@ -11,7 +11,7 @@ from ..utils import docval, getargs, ExtenderMeta, get_docval, fmt_docval_args,
 from ..container import Container, Data, DataRegion
 from ..spec import Spec, AttributeSpec, DatasetSpec, GroupSpec, LinkSpec, NAME_WILDCARD, NamespaceCatalog, RefSpec,\
                    SpecReader
-from ..data_utils import DataIO, AbstractDataChunkIterator
+from ..data_utils import DataIO, DtypeView, AbstractDataChunkIterator, GrowableArray
 from ..spec.spec import BaseStorageSpec
 from .builders import DatasetBuilder, GroupBuilder, LinkBuilder, Builder, ReferenceBuilder, RegionBuilder, BaseBuilder
 from .warnings import OrphanContainerWarning, MissingRequiredWarning
@@ -163,6 +163,9 @@ class BuildManager(object):
                 # TODO: if Datasets attributes are allowed to be modified, we need to
                 # figure out how to handle that starting here.
                 result = self.__type_map.build(container, self, builder=result, source=source)
+            elif result.written and isinstance(container, Data):
+                # rows may have been appended to a dataset that was already written
+                result.deep_update(DatasetBuilder(result.name, container.data))
         return result
 
     @docval({"name": "container", "type": Container, "doc": "the Container to save as prebuilt"},
@@ -389,6 +392,19 @@ class ObjectMapper(with_metaclass(ExtenderMeta, object)):
             else:
                 return g.type
 
+    @classmethod
+    def __numeric_array(cls, value):
+        """Convert a non-empty, flat list of numbers to an array, or return None if that is not possible"""
+        if len(value) == 0:
+            return None
+        try:
+            ret = np.asarray(value)
+        except (TypeError, ValueError):
+            return None
+        if ret.ndim != 1 or ret.dtype.kind not in 'biuf':
+            return None
+        return ret
+
     @classmethod
     def convert_dtype(cls, spec, value):
         """
@@ -407,6 +423,9 @@ class ObjectMapper(with_metaclass(ExtenderMeta, object)):
             return None, dt
         if isinstance(value, DataIO):
             return value, cls.convert_dtype(spec, value.data)[1]
+        if isinstance(value, GrowableArray):
+            # write the array that the values are stored in, without copying it
+            value = value.array
         if spec.dtype is None:
             return value, None
         if spec.dtype == 'numeric':
@@ -417,17 +436,24 @@ class ObjectMapper(with_metaclass(ExtenderMeta, object)):
         ret = None
         ret_dtype = None
         spec_dtype = cls.__dtypes[spec.dtype]
+        if isinstance(value, (tuple, list)) and spec_dtype not in (_unicode, _ascii):
+            # convert lists of numbers at once, rather than one element at a time
+            array = cls.__numeric_array(value)
+            if array is not None:
+                dtype_func = cls.__resolve_dtype(array.dtype, spec_dtype)
+                return type(value)(array.astype(dtype_func, copy=False)), dtype_func
         if isinstance(value, np.ndarray):
             if spec_dtype is _unicode:
-                ret = value.astype('U')
+                ret = value if value.dtype.kind == 'U' else value.astype('U')
                 ret_dtype = "utf8"
             elif spec_dtype is _ascii:
-                ret = value.astype('S')
+                ret = value if value.dtype.kind == 'S' else value.astype('S')
                 ret_dtype = "ascii"
             else:
                 dtype_func = cls.__resolve_dtype(value.dtype, spec_dtype)
-                ret = value.astype(dtype_func)
-                ret_dtype = ret.dtype.type
+                # avoid copying the data, which is converted lazily if necessary
+                ret = value if value.dtype == np.dtype(dtype_func) else DtypeView(value, dtype_func)
+                ret_dtype = dtype_func
         elif isinstance(value, (tuple, list)):
             ret = list()
             for elem in value:
@@ -798,7 +824,7 @@ class ObjectMapper(with_metaclass(ExtenderMeta, object)):
         return builder
 
     def __is_reftype(self, data):
-        tmp = data
+        tmp = data.data if isinstance(data, DataIO) else data
         while hasattr(tmp, '__len__') and not isinstance(tmp, (Container, text_type, binary_type)):
             tmptmp = None
             for t in tmp:
@@ -1207,16 +1233,37 @@ class TypeMap(object):
         self.__container_types = OrderedDict()
         self.__data_types = dict()
         self.__default_mapper_cls = getargs('mapper_cls', kwargs)
+        # whether the tables above are shared with a copy of this TypeMap
+        self.__shared = False
 
     @property
     def namespace_catalog(self):
         return self.__ns_catalog
 
     def __copy__(self):
+        '''Copy this TypeMap without copying its tables.
+
+        The copy shares the registered container classes and ObjectMappers, and the already constructed
+        ObjectMappers, with this TypeMap. The first registration on either of them copies its tables.
+        '''
         ret = TypeMap(copy(self.__ns_catalog), self.__default_mapper_cls)
-        ret.merge(self)
+        ret.__mappers = self.__mappers
+        ret.__mapper_cls = self.__mapper_cls
+        ret.__container_types = self.__container_types
+        ret.__data_types = self.__data_types
+        self.__shared = True
+        ret.__shared = True
         return ret
 
+    def __copy_on_write(self):
+        if not self.__shared:
+            return
+        self.__mappers = copy(self.__mappers)
+        self.__mapper_cls = copy(self.__mapper_cls)
+        self.__container_types = OrderedDict((ns, copy(types)) for ns, types in self.__container_types.items())
+        self.__data_types = copy(self.__data_types)
+        self.__shared = False
+
     def __deepcopy__(self, memo):
         # XXX: From @nicain: All of a sudden legacy tests started
         #      needing this argument in deepcopy. Doesn't hurt anything, though.
@@ -1250,6 +1297,16 @@ class TypeMap(object):
             {'name': 'reader',
              'type': SpecReader,
              'doc': 'the class to user for reading specifications', 'default': None},
+            {'name': 'cache_dir', 'type': str,
+             'doc': 'a directory to cache the loaded namespaces in. The cache is used instead of the YAML files '
+                    'if none of them changed', 'default': None},
+            {'name': 'cache_key', 'type': str,
+             'doc': 'a key identifying the code the namespaces are loaded with, e.g. its version. A cache written '
+                    'with a different key is not used', 'default': None},
+            {'name': 'write_cache', 'type': bool,
+             'doc': 'whether to write the cache if it does not exist. A cache in cache_dir that is not written, e.g. '
+                    'one installed with a package, is trusted like the code that reads it, so it is read whichever '
+                    'user owns it', 'default': True},
             returns="the namespaces loaded from the given file", rtype=tuple)
     def load_namespaces(self, **kwargs):
         '''Load namespaces from a namespace file.
@@ -1501,6 +1558,7 @@ class TypeMap(object):
                     break
 
             mapper = mapper_cls(spec)
+            self.__copy_on_write()
             self.__mappers[container_cls] = mapper
         return mapper
 
@@ -1511,6 +1569,7 @@ class TypeMap(object):
         ''' Map a container class to a data_type '''
         namespace, data_type, container_cls = getargs('namespace', 'data_type', 'container_cls', kwargs)
         spec = self.__ns_catalog.get_spec(namespace, data_type)    # make sure the spec exists
+        self.__copy_on_write()
         self.__container_types.setdefault(namespace, dict())
         self.__container_types[namespace][data_type] = container_cls
         self.__data_types.setdefault(container_cls, (namespace, data_type))
@@ -1525,7 +1584,11 @@ class TypeMap(object):
         container_cls, mapper_cls = getargs('container_cls', 'mapper_cls', kwargs)
         if self.get_container_cls_dt(container_cls) == (None, None):
             raise ValueError('cannot register map for type %s - no data_type found' % container_cls)
+        self.__copy_on_write()
         self.__mapper_cls[container_cls] = mapper_cls
+        # forget the ObjectMappers constructed for this class and its subclasses
+        for cls in [c for c in self.__mappers if issubclass(c, container_cls)]:
+            del self.__mappers[cls]
 
     @docval({"name": "container", "type": Container, "doc": "the container to convert to a Builder"},
             {"name": "manager", "type": BuildManager,
@@ -28,10 +28,18 @@ class Container(with_metaclass(abc.ABCMeta, object)):
     @docval({'name': 'modified', 'type': bool,
              'doc': 'whether or not this Container has been modified', 'default': True})
     def set_modified(self, **kwargs):
+        '''Mark this Container as modified or unmodified
+
+        Marking a Container as modified also marks all of its ancestors as modified, so that the
+        modified Containers of a file can be found by descending from the root.
+        '''
         modified = getargs('modified', kwargs)
         self.__modified = modified
-        if modified and self.parent is not None:
-            self.parent.set_modified()
+        if modified:
+            parent = self.__parent
+            while isinstance(parent, Container):
+                parent.__modified = True
+                parent = parent.__parent
 
     @property
     def children(self):
@@ -91,6 +99,9 @@ class Container(with_metaclass(abc.ABCMeta, object)):
                     self.__parent.add_candidate(parent_container)
         else:
             self.__parent = parent_container
+            if self.__modified and isinstance(parent_container, Container):
+                # a new child modifies its parent
+                self.set_modified()
 
 
 class Data(Container):
@@ -1,12 +1,18 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
 from collections import Iterable
 from operator import itemgetter
+import itertools
+import sys
+import threading
+from timeit import default_timer
 
 import numpy as np
-from six import with_metaclass, text_type, binary_type
+from six import with_metaclass, text_type, binary_type, integer_types, reraise
+from six.moves import queue
 
 from .container import Data, DataRegion
 from .utils import docval, getargs, popargs, docval_macro, get_data_shape
+from .query import FORMDataset
 
 
 def __get_shape_helper(data):
@@ -266,6 +272,101 @@ class DataChunkIterator(AbstractDataChunkIterator):
         return self.__dtype
 
 
+class ArrayDataChunkIterator(AbstractDataChunkIterator):
+    """
+    Iterator over n-dimensional blocks of an array that are aligned with the chunks of the dataset
+
+    Unlike DataChunkIterator, which assembles each chunk from the values along the first dimension, this
+    iterator slices blocks of buffer_shape out of the array directly. For a numpy.ndarray the blocks are views,
+    i.e., no data is copied before it is written. For an h5py.Dataset (or any other array-like supporting numpy
+    slicing) each block is read with a single slab read. The blocks are traversed in C order, and each block is
+    a multiple of chunk_shape, so that each write covers whole HDF5 chunks.
+
+    The shape and dtype are taken from the array without reading any data.
+    """
+
+    __default_buffer_bytes = 1 << 20
+
+    @docval({'name': 'data', 'type': None,
+             'doc': 'the array to iterate over. Objects without a shape and dtype (e.g., lists) are converted '
+                    'with numpy.asarray'},
+            {'name': 'chunk_shape', 'type': tuple,
+             'doc': 'the shape of the HDF5 chunks. Defaults to the chunks of data if it is a chunked '
+                    'h5py.Dataset, otherwise to a shape of about 1 MB', 'default': None},
+            {'name': 'buffer_shape', 'type': tuple,
+             'doc': 'the shape of the blocks to iterate over. Must be a multiple of chunk_shape in each '
+                    'dimension. Defaults to chunk_shape', 'default': None})
+    def __init__(self, **kwargs):
+        data, chunk_shape, buffer_shape = getargs('data', 'chunk_shape', 'buffer_shape', kwargs)
+        if not (hasattr(data, 'shape') and hasattr(data, 'dtype') and hasattr(data, '__getitem__')):
+            data = np.asarray(data)
+        self.data = data
+        shape = tuple(data.shape)
+        if len(shape) == 0:
+            raise ValueError("cannot iterate over a scalar")
+        if chunk_shape is None:
+            chunk_shape = getattr(data, 'chunks', None)
+            if chunk_shape is None:
+                chunk_shape = self.__guess_chunk_shape(shape, np.dtype(data.dtype).itemsize)
+        if len(chunk_shape) != len(shape):
+            raise ValueError("chunk_shape %s does not match the shape of the data %s" % (chunk_shape, shape))
+        # a chunk cannot be larger than a fixed-size dataset
+        self.__chunk_shape = tuple(max(1, min(c, s)) for c, s in zip(chunk_shape, shape))
+        if buffer_shape is None:
+            buffer_shape = self.__chunk_shape
+        else:
+            if len(buffer_shape) != len(shape):
+                raise ValueError("buffer_shape %s does not match the shape of the data %s" % (buffer_shape, shape))
+            if any(b % c != 0 for b, c in zip(buffer_shape, self.__chunk_shape)):
+                raise ValueError("buffer_shape %s must be a multiple of chunk_shape %s"
+                                 % (buffer_shape, self.__chunk_shape))
+        self.__buffer_shape = tuple(buffer_shape)
+        self.__shape = shape
+        self.__dtype = np.dtype(data.dtype)
+        n_blocks = [-(-s // b) for s, b in zip(shape, self.__buffer_shape)]
+        self.__blocks = itertools.product(*[range(n) for n in n_blocks])
+
+    @classmethod
+    def __guess_chunk_shape(cls, shape, itemsize):
+        # halve the largest dimension until a chunk holds no more than about 1 MB
+        chunk = [max(1, s) for s in shape]
+        while int(np.prod(chunk)) * itemsize > cls.__default_buffer_bytes and max(chunk) > 1:
+            i = int(np.argmax(chunk))
+            chunk[i] = -(-chunk[i] // 2)
+        return tuple(chunk)
+
+    def __iter__(self):
+        """Return the iterator object"""
+        return self
+
+    def __next__(self):
+        """Return the next block of the array, or raise StopIteration if all blocks have been returned
+
+        :returns: DataChunk object with the data and selection of the current block
+        :rtype: DataChunk
+        """
+        block = next(self.__blocks)
+        selection = tuple(slice(i * b, min((i + 1) * b, s))
+                          for i, b, s in zip(block, self.__buffer_shape, self.__shape))
+        return DataChunk(data=self.data[selection], selection=selection)
+
+    next = __next__
+
+    def recommended_chunk_shape(self):
+        return self.__chunk_shape
+
+    def recommended_data_shape(self):
+        return self.__shape
+
+    @property
+    def maxshape(self):
+        return self.__shape
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+
 class DataChunk(object):
     """
     Class used to describe a data chunk. Used in DataChunkIterator to describe
@@ -292,6 +393,123 @@ class DataChunk(object):
         return getattr(self.data, attr)
 
 
+class ThreadedDataChunkIterator(AbstractDataChunkIterator):
+    """
+    Iterator that reads the chunks of another AbstractDataChunkIterator on a background thread.
+
+    Up to queue_depth chunks are read ahead into a bounded queue, so that producing the next chunk
+    (e.g., reading it from an acquisition file or decompressing it) overlaps with writing the current
+    chunk. Since h5py, zlib and numpy release the GIL for most of their work, wrapping a slow iterator
+    in a ThreadedDataChunkIterator brings the time to write a dataset from the sum of the time to produce
+    and the time to write the chunks closer to the larger of the two.
+
+    The time each side spent waiting for the other is reported in :py:attr:`stats`.
+    """
+
+    __done = object()
+
+    @docval({'name': 'data', 'type': AbstractDataChunkIterator, 'doc': 'the iterator to read chunks from'},
+            {'name': 'queue_depth', 'type': int,
+             'doc': 'the maximum number of chunks to read ahead of the consumer', 'default': 2})
+    def __init__(self, **kwargs):
+        self.data, self.queue_depth = getargs('data', 'queue_depth', kwargs)
+        if self.queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1, got %d" % self.queue_depth)
+        self.__queue = queue.Queue(maxsize=self.queue_depth)
+        self.__stop = threading.Event()
+        self.__thread = None
+        self.__finished = False
+        self.__stats = {'chunks': 0, 'read_time': 0.0, 'producer_wait': 0.0, 'consumer_wait': 0.0}
+
+    @property
+    def stats(self):
+        """
+        Statistics about the iteration so far:
+
+        * chunks: the number of chunks returned
+        * read_time: the time (in seconds) spent reading chunks from the wrapped iterator
+        * producer_wait: the time the background thread spent waiting for space in the queue, i.e.,
+          the time reading was stalled by the consumer
+        * consumer_wait: the time the consumer spent waiting for a chunk, i.e., the time
+          writing was stalled by reading
+        """
+        return dict(self.__stats)
+
+    def __put(self, item):
+        # wait for space in the queue, but give up if the consumer has stopped iterating
+        while not self.__stop.is_set():
+            try:
+                self.__queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __produce(self):
+        try:
+            while not self.__stop.is_set():
+                start = default_timer()
+                try:
+                    chunk = next(self.data)
+                except StopIteration:
+                    break
+                read = default_timer()
+                self.__stats['read_time'] += read - start
+                if not self.__put((chunk, None)):
+                    return
+                self.__stats['producer_wait'] += default_timer() - read
+            self.__put((self.__done, None))
+        except Exception:
+            self.__put((self.__done, sys.exc_info()))
+
+    def __iter__(self):
+        """Return the iterator object"""
+        return self
+
+    def __next__(self):
+        """Return the next data chunk, reading ahead on the background thread"""
+        if self.__finished:
+            raise StopIteration
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__produce, name='ThreadedDataChunkIterator')
+            self.__thread.daemon = True
+            self.__thread.start()
+        start = default_timer()
+        chunk, exc_info = self.__queue.get()
+        self.__stats['consumer_wait'] += default_timer() - start
+        if chunk is self.__done:
+            self.__finished = True
+            self.__thread.join()
+            if exc_info is not None:
+                reraise(*exc_info)
+            raise StopIteration
+        self.__stats['chunks'] += 1
+        return chunk
+
+    next = __next__
+
+    def close(self):
+        """Stop reading ahead and wait for the background thread to exit"""
+        self.__finished = True
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def recommended_chunk_shape(self):
+        return self.data.recommended_chunk_shape()
+
+    def recommended_data_shape(self):
+        return self.data.recommended_data_shape()
+
+    @property
+    def maxshape(self):
+        return self.data.maxshape
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+
 def assertEqualShape(data1,
                      data2,
                      axes1=None,
@@ -460,6 +678,269 @@ class ShapeValidatorResult(object):
         return self.__getattribute__(item)
 
 
+@docval_macro('array_data')
+class DtypeView(object):
+    """
+    A read-only view of an array that converts values to another dtype as they are accessed
+
+    Unlike ``numpy.ndarray.astype``, creating the view does not copy the array. Only the selected elements
+    are converted, so that the array can be converted one chunk at a time, e.g., while it is written.
+    """
+
+    @docval({'name': 'data', 'type': np.ndarray, 'doc': 'the array to convert'},
+            {'name': 'dtype', 'type': None, 'doc': 'the dtype to convert to'})
+    def __init__(self, **kwargs):
+        data, dtype = getargs('data', 'dtype', kwargs)
+        self.__data = data
+        self.__dtype = np.dtype(dtype)
+
+    @property
+    def data(self):
+        """The array that is converted"""
+        return self.__data
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def shape(self):
+        return self.__data.shape
+
+    @property
+    def ndim(self):
+        return self.__data.ndim
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __getitem__(self, item):
+        ret = self.__data[item]
+        if isinstance(ret, np.ndarray):
+            return ret.astype(self.__dtype)
+        return self.__dtype.type(ret)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __array__(self, dtype=None):
+        return self.__data.astype(self.__dtype if dtype is None else dtype)
+
+
+@docval_macro('array_data')
+class ExtendedData(object):
+    """
+    Array data with rows appended to it, e.g., an ``h5py.Dataset`` read from a file
+
+    The appended rows are kept in a list and the array is not read or copied. When the data is written
+    to the dataset it was read from, only the appended rows are written to the end of the dataset.
+    """
+
+    @docval({'name': 'data', 'type': ('array_data', FORMDataset), 'doc': 'the array to append rows to'})
+    def __init__(self, **kwargs):
+        self.__data = getargs('data', kwargs)
+        self.__extension = list()
+
+    @property
+    def data(self):
+        """The array the rows are appended to"""
+        return self.__data
+
+    @property
+    def extension(self):
+        """The list of rows appended to the array"""
+        return self.__extension
+
+    @property
+    def dtype(self):
+        return getattr(self.__data, 'dtype', None)
+
+    def append(self, arg):
+        self.__extension.append(arg)
+
+    def extend(self, arg):
+        self.__extension.extend(arg)
+
+    def __len__(self):
+        return len(self.__data) + len(self.__extension)
+
+    def __iter__(self):
+        return itertools.chain(iter(self.__data), iter(self.__extension))
+
+    def __getitem__(self, item):
+        n = len(self.__data)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            head = self.__data[start:min(stop, n)] if start < n else None
+            tail = self.__extension[max(start - n, 0):max(stop - n, 0)]
+            if head is None:
+                return tail
+            if len(tail) == 0:
+                return head
+            if isinstance(head, np.ndarray):
+                return np.concatenate((head, np.asarray(tail, dtype=head.dtype)))
+            return list(head) + tail
+        if isinstance(item, (int, np.integer)):
+            if item < 0:
+                item += len(self)
+            if item < n:
+                return self.__data[item]
+            return self.__extension[item - n]
+        raise TypeError("cannot index %s with %s" % (type(self).__name__, type(item).__name__))
+
+
+@docval_macro('array_data')
+class GrowableArray(object):
+    """
+    A one-dimensional array of numbers that values can be appended to
+
+    The values are stored in a NumPy array that is reallocated with twice the size when it is full, so
+    appending a value takes amortized constant time, and each value takes only the size of its dtype. The
+    dtype is inferred from the first value that is added, and never changes. Adding a value that is not a
+    number, or whose dtype cannot be stored in the array without converting it to another kind, e.g., a float
+    added to integers, raises a TypeError.
+    """
+
+    __numeric_kinds = 'biuf'
+    __scalar_types = (bool, float, np.number, np.bool_) + integer_types
+    # the types of values that can be stored in an array of the dtypes inferred from Python values without
+    # checking their dtype
+    __exact_types = {np.dtype(bool): (bool, np.bool_),
+                     np.dtype(np.int64): integer_types,
+                     np.dtype(np.float64): (float,)}
+
+    @docval({'name': 'dtype', 'type': (type, np.dtype, str), 'doc': 'the dtype of the values', 'default': None},
+            {'name': 'capacity', 'type': int, 'doc': 'the number of values to allocate space for', 'default': 16})
+    def __init__(self, **kwargs):
+        dtype, capacity = getargs('dtype', 'capacity', kwargs)
+        self.__capacity = max(capacity, 1)
+        self.__buffer = None
+        self.__len = 0
+        if dtype is not None:
+            self.__allocate(self.__check_dtype(np.dtype(dtype)), self.__capacity)
+
+    @classmethod
+    def can_store(cls, value):
+        """Whether or not the given value is a number that can be stored in a GrowableArray"""
+        return isinstance(value, cls.__scalar_types)
+
+    @classmethod
+    def can_store_all(cls, values):
+        """Whether or not the given values are a one-dimensional array of numbers, or a list of numbers of the same
+        type, that can be stored in a GrowableArray"""
+        if isinstance(values, np.ndarray):
+            return values.ndim == 1 and values.dtype.kind in cls.__numeric_kinds
+        if not isinstance(values, (list, tuple)):
+            return False
+        types = set(type(v) for v in values)
+        return len(types) == 1 and cls.can_store(values[0])
+
+    @classmethod
+    def __check_dtype(cls, dtype):
+        if dtype.kind not in cls.__numeric_kinds:
+            raise TypeError("GrowableArray can only store numbers, not values of dtype %s" % dtype)
+        return dtype
+
+    def __allocate(self, dtype, capacity):
+        buffer = np.empty(capacity, dtype=dtype)
+        if self.__buffer is not None:
+            buffer[:self.__len] = self.__buffer[:self.__len]
+        self.__buffer = buffer
+
+    def __reserve(self, dtype, n):
+        # make room for n more values of the given dtype
+        dtype = self.__check_dtype(dtype)
+        if self.__buffer is None:
+            self.__allocate(dtype, max(self.__capacity, n))
+            return
+        if dtype != self.__buffer.dtype and (dtype.kind != self.__buffer.dtype.kind or
+                                             not np.can_cast(dtype, self.__buffer.dtype)):
+            raise TypeError("cannot add values of dtype %s to a GrowableArray of dtype %s"
+                            % (dtype, self.__buffer.dtype))
+        needed = self.__len + n
+        if needed > len(self.__buffer):
+            self.__allocate(self.__buffer.dtype, max(2 * len(self.__buffer), needed))
+
+    @property
+    def dtype(self):
+        """The dtype of the values, or None if no values have been added yet"""
+        return None if self.__buffer is None else self.__buffer.dtype
+
+    @property
+    def array(self):
+        """The values, as a view of the NumPy array that they are stored in"""
+        if self.__buffer is None:
+            return np.empty(0)
+        return self.__buffer[:self.__len]
+
+    @property
+    def shape(self):
+        return (self.__len,)
+
+    @property
+    def ndim(self):
+        return 1
+
+    def append(self, arg):
+        buffer = self.__buffer
+        if buffer is None or self.__len == len(buffer) or type(arg) not in self.__exact_types.get(buffer.dtype, ()):
+            if not self.can_store(arg):
+                raise TypeError("GrowableArray can only store numbers, not %s" % type(arg).__name__)
+            self.__reserve(np.asarray(arg).dtype, 1)
+            buffer = self.__buffer
+        try:
+            buffer[self.__len] = arg
+        except OverflowError:
+            raise TypeError("cannot add %s to a GrowableArray of dtype %s" % (arg, buffer.dtype))
+        self.__len += 1
+
+    def extend(self, arg):
+        if len(arg) == 0:
+            return
+        if not self.can_store_all(arg):
+            raise TypeError("GrowableArray can only be extended with a one-dimensional array of numbers, "
+                            "or a list of numbers of the same type")
+        values = np.asarray(arg)
+        self.__reserve(values.dtype, len(values))
+        self.__buffer[self.__len:self.__len + len(values)] = values
+        self.__len += len(values)
+
+    def tolist(self):
+        """Get the values as a list of Python numbers"""
+        return self.array.tolist()
+
+    def __array__(self, dtype=None):
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
+
+    def __len__(self):
+        return self.__len
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __getitem__(self, item):
+        return self.array[item]
+
+    def __eq__(self, other):
+        # compare like a list, i.e. return a single bool
+        if isinstance(other, GrowableArray):
+            other = other.array
+        try:
+            return len(self) == len(other) and bool(np.all(self.array == np.asarray(other)))
+        except TypeError:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.tolist())
+
+
 @docval_macro('data')
 class DataIO(with_metaclass(ABCMeta, object)):
 
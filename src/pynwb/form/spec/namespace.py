@@ -7,6 +7,10 @@ import string
 from warnings import warn
 from itertools import chain
 from abc import ABCMeta, abstractmethod
+import sys
+import hashlib
+import pickle
+import tempfile
 from six import with_metaclass, raise_from
 
 
@@ -212,17 +216,35 @@ class NamespaceCatalog(object):
         self.__loaded_specs = dict()
         self.__included_specs = dict()
         self.__included_sources = dict()
+        # whether the dicts above are shared with a copy of this catalog
+        self.__shared = False
 
     def __copy__(self):
+        '''Copy this catalog without copying its namespaces.
+
+        The copy shares the loaded namespaces and specs with this catalog. The first namespace added
+        to either of them copies its tables, but the specs themselves are never copied.
+        '''
         ret = NamespaceCatalog(self.__group_spec_cls,
                                self.__dataset_spec_cls,
                                self.__spec_namespace_cls)
-        ret.__namespaces = copy(self.__namespaces)
-        ret.__loaded_specs = copy(self.__loaded_specs)
-        ret.__included_specs = copy(self.__included_specs)
-        ret.__included_sources = copy(self.__included_sources)
+        ret.__namespaces = self.__namespaces
+        ret.__loaded_specs = self.__loaded_specs
+        ret.__included_specs = self.__included_specs
+        ret.__included_sources = self.__included_sources
+        self.__shared = True
+        ret.__shared = True
         return ret
 
+    def __copy_on_write(self):
+        if not self.__shared:
+            return
+        self.__namespaces = copy(self.__namespaces)
+        self.__loaded_specs = copy(self.__loaded_specs)
+        self.__included_specs = copy(self.__included_specs)
+        self.__included_sources = {ns: list(sources) for ns, sources in self.__included_sources.items()}
+        self.__shared = False
+
     @property
     @docval(returns='a tuple of the available namespaces', rtype=tuple)
     def namespaces(self):
@@ -251,6 +273,7 @@ class NamespaceCatalog(object):
         name, namespace = getargs('name', 'namespace', kwargs)
         if name in self.__namespaces:
             raise KeyError("namespace '%s' already exists" % name)
+        self.__copy_on_write()
         self.__namespaces[name] = namespace
 
     @docval({'name': 'name', 'type': str, 'doc': 'the name of this namespace'},
@@ -394,6 +417,56 @@ class NamespaceCatalog(object):
                            self.__spec_namespace_cls.build_namespace(catalog=catalog, **namespace))
         return included_types
 
+    # bump when the layout of the cached namespaces changes
+    __cache_version = 1
+
+    def __cache_path(self, cache_dir, namespace_path, namespaces, reader, resolve, cache_key):
+        """Get the path of the cache file for the given namespaces, or None if they cannot be cached
+
+        The name of the file includes a hash of the Python version, the cache key, the namespace file and all
+        spec files it sources, so that changing any of them invalidates the cache.
+        """
+        h = hashlib.sha1()
+        h.update(str((self.__cache_version, pickle.HIGHEST_PROTOCOL, sys.version, cache_key, resolve)).encode('utf-8'))
+        for cls in (self.__group_spec_cls, self.__dataset_spec_cls, self.__spec_namespace_cls):
+            h.update(('%s.%s' % (cls.__module__, cls.__name__)).encode('utf-8'))
+        with open(namespace_path, 'rb') as f:
+            h.update(f.read())
+        for ns in namespaces:
+            for s in ns['schema']:
+                source = s.get('source')
+                if source is None or source in self.__loaded_specs:
+                    # specs included from other namespaces must be shared with them
+                    return None
+                with open(os.path.join(reader.source, source), 'rb') as f:
+                    h.update(f.read())
+        name = os.path.splitext(os.path.basename(namespace_path))[0]
+        return os.path.join(cache_dir, '%s-%s.pkl' % (name, h.hexdigest()))
+
+    def __read_cache(self, cache_path, check_owner):
+        try:
+            with open(cache_path, 'rb') as f:
+                if check_owner and hasattr(os, 'getuid') and os.fstat(f.fileno()).st_uid != os.getuid():
+                    # unpickling runs arbitrary code, so only trust files written by the current user
+                    warn("ignoring namespace cache '%s' because it is not owned by the current user" % cache_path)
+                    return None
+                return pickle.load(f)
+        except Exception:
+            # a missing, stale or corrupt cache falls back to reading the YAML files
+            return None
+
+    def __write_cache(self, cache_path, cached):
+        try:
+            cache_dir = os.path.dirname(cache_path)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, cache_path)
+        except Exception as e:
+            warn("could not write namespace cache '%s': %s" % (cache_path, e))
+
     @docval({'name': 'namespace_path', 'type': str, 'doc': 'the path to the file containing the namespaces(s) to load'},
             {'name': 'resolve',
              'type': bool,
@@ -401,22 +474,37 @@ class NamespaceCatalog(object):
             {'name': 'reader',
              'type': SpecReader,
              'doc': 'the class to user for reading specifications', 'default': None},
+            {'name': 'cache_dir', 'type': str,
+             'doc': 'a directory to cache the loaded namespaces in. The cache is used instead of the YAML files '
+                    'if none of them changed', 'default': None},
+            {'name': 'cache_key', 'type': str,
+             'doc': 'a key identifying the code the namespaces are loaded with, e.g. its version. A cache written '
+                    'with a different key is not used', 'default': None},
+            {'name': 'write_cache', 'type': bool,
+             'doc': 'whether to write the cache if it does not exist. A cache in cache_dir that is not written, e.g. '
+                    'one installed with a package, is trusted like the code that reads it, so it is read whichever '
+                    'user owns it', 'default': True},
             returns='a dictionary describing the dependencies of loaded namespaces', rtype=dict)
     def load_namespaces(self, **kwargs):
         """Load the namespaces in the given file"""
-        namespace_path, resolve, reader = getargs('namespace_path', 'resolve', 'reader', kwargs)
+        namespace_path, resolve, reader, cache_dir, cache_key, write_cache = getargs(
+            'namespace_path', 'resolve', 'reader', 'cache_dir', 'cache_key', 'write_cache', kwargs)
         if reader is None:
             # load namespace definition from file
             if not os.path.exists(namespace_path):
                 msg = "namespace file '%s' not found" % namespace_path
                 raise IOError(msg)
             reader = YAMLSpecReader(indir=os.path.dirname(namespace_path))
+        elif cache_dir is not None and not isinstance(reader, YAMLSpecReader):
+            warn("namespaces read with %s cannot be cached" % type(reader).__name__)
+            cache_dir = None
         ns_path_key = os.path.join(reader.source, os.path.basename(namespace_path))
         ret = self.__included_specs.get(ns_path_key)
         if ret is None:
             ret = dict()
         else:
             return ret
+        self.__copy_on_write()
         namespaces = reader.read_namespace(namespace_path)
         types_key = self.__spec_namespace_cls.types_key()
         to_load = list()
@@ -425,8 +513,30 @@ class NamespaceCatalog(object):
                 warn("ignoring namespace '%s' because it already exists" % ns['name'])
             else:
                 to_load.append(ns)
-        # now load specs into namespace
-        for ns in to_load:
-            ret[ns['name']] = self.__load_namespace(ns, reader, types_key, resolve=resolve)
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = self.__cache_path(cache_dir, namespace_path, to_load, reader, resolve, cache_key)
+        cached = None
+        if cache_path is not None:
+            cached = self.__read_cache(cache_path, check_owner=write_cache)
+        if cached is not None:
+            for ns in cached['namespaces']:
+                self.add_namespace(ns.name, ns)
+            self.__loaded_specs.update(cached['loaded_specs'])
+            for ns_name, sources in cached['included_sources'].items():
+                self.__included_sources.setdefault(ns_name, list()).extend(sources)
+            ret = cached['dependencies']
+        else:
+            # now load specs into namespace
+            for ns in to_load:
+                ret[ns['name']] = self.__load_namespace(ns, reader, types_key, resolve=resolve)
+            if cache_path is not None and write_cache:
+                sources = [s['source'] for ns in to_load for s in ns['schema']]
+                cached = {'namespaces': [self.__namespaces[ns['name']] for ns in to_load],
+                          'loaded_specs': {s: self.__loaded_specs[s] for s in sources},
+                          'included_sources': {ns['name']: self.__included_sources.get(ns['name'], list())
+                                               for ns in to_load},
+                          'dependencies': ret}
+                self.__write_cache(cache_path, cached)
         self.__included_specs[ns_path_key] = ret
         return ret
@@ -1,5 +1,6 @@
 import copy as _copy
 import itertools as _itertools
+import threading as _threading
 from abc import ABCMeta
 
 import h5py
@@ -110,99 +111,159 @@ def __format_type(argtype):
         raise ValueError("argtype must be a type, str, list, or tuple")
 
 
-def __parse_args(validator, args, kwargs, enforce_type=True, enforce_shape=True, allow_extra=False):   # noqa: 901
+__immutable_types = (type(None), bool, float, complex, text_type, binary_type, type, np.generic) + six.integer_types
+
+
+def __is_immutable(value):
+    """Check whether a docval default value can be shared between calls without copying it"""
+    if isinstance(value, (tuple, frozenset)):
+        return all(__is_immutable(v) for v in value)
+    return isinstance(value, __immutable_types)
+
+
+def __default_copier(default):
+    """
+    Get the function used to give each call its own copy of a docval default value
+
+    :return: None if the default value can be shared between calls, otherwise a function that takes
+             the default value and returns a copy of it
     """
-    Internal helper function used by the docval decorator to parse and validate function arguments
+    if __is_immutable(default):
+        return None
+    if type(default) in (list, dict, set) and len(default) == 0:
+        return lambda d: d.__class__()
+    return _copy.deepcopy
+
+
+def __compile_type_check(argtype, allow_none=False):
+    """
+    Internal helper function used by the docval decorator to build the type check for a single argument
+
+    Whether a value passes :py:func:`__type_okay` only depends on the class of the value, so the result
+    is cached per class. Subsequent calls with a value of the same class cost a single dict lookup.
+
+    :param argtype: the resolved type of the argument
+    :param allow_none: whether or not None is a valid value for the argument
 
-    :param validator: List of dicts from docval with the description of the arguments
-    :param args: List of the values of positional arguments supplied by the caller
-    :param kwargs: Dict keyword arguments supplied by the caller where keys are the argument name and
-                   values are the argument value.
+    :return: a function that returns True if the given value is a valid value for the argument
+    """
+    cache = dict()
+
+    def _check(value):
+        if value is None:
+            return allow_none
+        cls = value.__class__
+        ret = cache.get(cls)
+        if ret is None:
+            ret = __type_okay(value, argtype)
+            cache[cls] = ret
+        return ret
+    return _check
+
+
+def __compile_args(validator, enforce_type=True, enforce_shape=True, allow_extra=False, offset=0):   # noqa: C901
+    """
+    Internal helper function used by the docval decorator to compile the validator of a function into
+    a function that binds and validates the arguments of a call.
+
+    All work that only depends on the validator (sorting positional and keyword arguments, resolving
+    type checks, determining which default values need to be copied) is done once here rather than
+    on every call.
+
+    :param validator: List of dicts from docval with the description of the arguments, sorted such that
+                      positional arguments come before keyword arguments
     :param enforce_type: Boolean indicating whether the type of arguments should be enforced
     :param enforce_shape: Boolean indicating whether the dimensions of array arguments
                           should be enforced if possible.
+    :param allow_extra: Boolean indicating whether arguments not in the validator are allowed
+    :param offset: the number of leading positional arguments to skip, e.g. 1 to skip *self*
 
-    :return: Dict with:
-        * 'args' : Dict all arguments where keys are the names and values are the values of the arguments.
-        * 'errors' : List of string with error messages
+    :return: a function with the signature ``parse(args, kwargs, validate)`` that returns a tuple with
+             1) a dict of all arguments where keys are the names and values are the values of the arguments,
+             2) a list of type error messages and 3) a list of value error messages. If *validate* is False,
+             types and shapes are not checked.
     """
-    ret = dict()
-    type_errors = list()
-    value_errors = list()
-    argsi = 0
-    extras = dict(kwargs)
-    try:
-        it = iter(validator)
-        arg = next(it)
-        # catch unsupported keys
-        allowable_terms = ('name', 'doc', 'type', 'shape', 'default', 'help')
+    allowable_terms = ('name', 'doc', 'type', 'shape', 'default', 'help')
+    for arg in validator:
         unsupported_terms = set(arg.keys()) - set(allowable_terms)
         if unsupported_terms:
-            raise ValueError('docval for {}: {} are not supported by docval'.format(arg['name'],
-                                                                                    list(unsupported_terms)))
+            msg = 'docval for {}: {} are not supported by docval'.format(arg['name'], list(unsupported_terms))
+
+            def _unsupported(args, kwargs, validate=True):
+                raise ValueError(msg)
+            return _unsupported
+
+    pos = list()
+    kw = list()
+    for arg in validator:
+        argtype = __format_type(arg['type'])
+        shape = arg.get('shape') if enforce_shape else None
+        if 'default' in arg:
+            default = arg['default']
+            check = __compile_type_check(arg['type'], default is None) if enforce_type else None
+            kw.append((arg['name'], argtype, check, shape, default, __default_copier(default)))
+        else:
+            check = __compile_type_check(arg['type']) if enforce_type else None
+            pos.append((arg['name'], argtype, check, shape))
+    names = frozenset(arg['name'] for arg in validator)
+    npos = len(pos)
+
+    def parse(args, kwargs, validate=True):
+        ret = dict()
+        type_errors = list()
+        value_errors = list()
+        nargs = len(args) - offset
         # process positional arguments
-        while True:
-            #
-            if 'default' in arg:
-                break
-            argname = arg['name']
-            argval_set = False
+        for i in range(npos):
+            argname, argtype, check, shape = pos[i]
             if argname in kwargs:
-                argval = kwargs.get(argname)
-                extras.pop(argname, None)
-                argval_set = True
-            elif argsi < len(args):
-                argval = args[argsi]
-                argval_set = True
-
-            if not argval_set:
-                type_errors.append("missing argument '%s'" % argname)
+                argval = kwargs[argname]
+            elif i < nargs:
+                argval = args[i + offset]
             else:
-                if argname in ret:
-                    type_errors.append("'got multiple arguments for '%s" % argname)
-                else:
-                    if enforce_type:
-                        if not __type_okay(argval, arg['type']):
-                            fmt_val = (argname, type(argval).__name__, __format_type(arg['type']))
-                            type_errors.append("incorrect type for '%s' (got '%s', expected '%s')" % fmt_val)
-                    if enforce_shape and 'shape' in arg:
-                        if not __shape_okay_multi(argval, arg['shape']):
-                            fmt_val = (argname, get_data_shape(argval), arg['shape'])
-                            value_errors.append("incorrect shape for '%s' (got '%s, expected '%s')" % fmt_val)
-                    ret[argname] = argval
-            argsi += 1
-            arg = next(it)
-        while True:
-            argname = arg['name']
+                type_errors.append("missing argument '%s'" % argname)
+                continue
+            if validate:
+                if check is not None and not check(argval):
+                    fmt_val = (argname, type(argval).__name__, argtype)
+                    type_errors.append("incorrect type for '%s' (got '%s', expected '%s')" % fmt_val)
+                if shape is not None and not __shape_okay_multi(argval, shape):
+                    fmt_val = (argname, get_data_shape(argval), shape)
+                    value_errors.append("incorrect shape for '%s' (got '%s, expected '%s')" % fmt_val)
+            ret[argname] = argval
+        # process keyword arguments
+        argsi = npos
+        for argname, argtype, check, shape, default, copy_default in kw:
             if argname in kwargs:
-                ret[argname] = kwargs.get(argname)
-                extras.pop(argname, None)
-            elif len(args) > argsi:
-                ret[argname] = args[argsi]
+                argval = kwargs[argname]
+            elif argsi < nargs:
+                argval = args[argsi + offset]
                 argsi += 1
+            elif copy_default is not None:
+                argval = copy_default(default)
             else:
-                ret[argname] = arg['default']
-            argval = ret[argname]
-            if enforce_type:
-                if not __type_okay(argval, arg['type'], arg['default'] is None):
-                    fmt_val = (argname, type(argval).__name__, __format_type(arg['type']))
+                argval = default
+            ret[argname] = argval
+            if validate:
+                if check is not None and not check(argval):
+                    fmt_val = (argname, type(argval).__name__, argtype)
                     type_errors.append("incorrect type for '%s' (got '%s', expected '%s')" % fmt_val)
-            if enforce_shape and 'shape' in arg and argval is not None:
-                if not __shape_okay_multi(argval, arg['shape']):
-                    fmt_val = (argname, get_data_shape(argval), arg['shape'])
+                if shape is not None and argval is not None and not __shape_okay_multi(argval, shape):
+                    fmt_val = (argname, get_data_shape(argval), shape)
                     value_errors.append("incorrect shape for '%s' (got '%s, expected '%s')" % fmt_val)
-            arg = next(it)
-    except StopIteration:
-        pass
-    if not allow_extra:
-        for key in extras.keys():
-            type_errors.append("unrecognized argument: '%s'" % key)
-    else:
-        # TODO: Extras get stripped out if function arguments are composed with fmt_docval_args.
-        # allow_extra needs to be tracked on a function so that fmt_docval_args doesn't strip them out
-        for key in extras.keys():
-            ret[key] = extras[key]
-    return {'args': ret, 'type_errors': type_errors, 'value_errors': value_errors}
+        if kwargs and not names.issuperset(kwargs):
+            for key in kwargs:
+                if key in names:
+                    continue
+                if allow_extra:
+                    # TODO: Extras get stripped out if function arguments are composed with fmt_docval_args.
+                    # allow_extra needs to be tracked on a function so that fmt_docval_args doesn't strip them out
+                    ret[key] = kwargs[key]
+                else:
+                    type_errors.append("unrecognized argument: '%s'" % key)
+        return ret, type_errors, value_errors
+
+    return parse
 
 
 def __sort_args(validator):
@@ -219,6 +280,30 @@ def __sort_args(validator):
 docval_attr_name = '__docval__'
 __docval_args_loc = 'args'
 
+__production_mode = [False]
+__call_state = _threading.local()
+
+
+def set_production_mode(enabled=True):
+    '''set_production_mode(enabled=True)
+    Enable or disable docval production mode
+
+    By default, docval checks the type and shape of the arguments of every call to a decorated function.
+    In production mode, arguments are only checked at public API boundaries, i.e. for calls that do not
+    originate from within another docval-decorated function. For example, the arguments passed to
+    :py:meth:`~pynwb.core.DynamicTable.add_row` are checked, but the calls it makes to
+    :py:meth:`~pynwb.core.VectorData.add_row` are not. Missing and unrecognized arguments are always
+    reported, and default values are always filled in.
+    '''
+    __production_mode[0] = bool(enabled)
+
+
+def get_production_mode():
+    '''get_production_mode()
+    Return True if docval production mode is enabled. See :py:func:`set_production_mode`
+    '''
+    return __production_mode[0]
+
 
 # TODO: write unit tests for get_docval* functions
 def get_docval(func):
@@ -329,6 +414,11 @@ def docval(*validator, **options):
            arg1, arg2, kwarg1 = getargs('arg1', 'arg2', 'kwarg1', **kwargs)
            ...
 
+    Each validator is compiled once, when the decorator is applied, into a function that binds the
+    arguments of a call. Type checks are cached per argument and value class, and mutable default values
+    are only copied when they are used. See :py:func:`set_production_mode` to limit checking to calls
+    made at public API boundaries.
+
     :param enforce_type: Enforce types of input parameters (Default=True)
     :param returns: String describing the return values
     :param rtype: String describing the data type of the return values
@@ -360,40 +450,32 @@ def docval(*validator, **options):
                 pos.append(a)
         loc_val = pos+kw
         _docval[__docval_args_loc] = loc_val
-        if is_method:
-            def func_call(*args, **kwargs):
-                self = args[0]
-                parsed = __parse_args(
-                            _copy.deepcopy(loc_val),
-                            args[1:],
-                            kwargs,
-                            enforce_type=enforce_type,
-                            enforce_shape=enforce_shape,
-                            allow_extra=allow_extra)
-
-                for error_type, ExceptionType in (('type_errors', TypeError),
-                                                  ('value_errors', ValueError)):
-                    parse_err = parsed.get(error_type)
-                    if parse_err:
-                        msg = ', '.join(parse_err)
-                        raise_from(ExceptionType(msg), None)
-
-                return func(self, **parsed['args'])
-        else:
-            def func_call(*args, **kwargs):
-                parsed = __parse_args(_copy.deepcopy(loc_val),
-                                      args,
-                                      kwargs,
-                                      enforce_type=enforce_type,
-                                      allow_extra=allow_extra)
-                for error_type, ExceptionType in (('type_errors', TypeError),
-                                                  ('value_errors', ValueError)):
-                    parse_err = parsed.get(error_type)
-                    if parse_err:
-                        msg = ', '.join(parse_err)
-                        raise_from(ExceptionType(msg), None)
-
-                return func(**parsed['args'])
+        parse = __compile_args(loc_val,
+                               enforce_type=enforce_type,
+                               enforce_shape=enforce_shape,
+                               allow_extra=allow_extra,
+                               offset=1 if is_method else 0)
+
+        def call(args, kwargs, validate):
+            parsed, type_errors, value_errors = parse(args, kwargs, validate)
+            if type_errors:
+                raise_from(TypeError(', '.join(type_errors)), None)
+            if value_errors:
+                raise_from(ValueError(', '.join(value_errors)), None)
+            if is_method:
+                return func(args[0], **parsed)
+            return func(**parsed)
+
+        def func_call(*args, **kwargs):
+            if not __production_mode[0]:
+                return call(args, kwargs, True)
+            # in production mode, only validate calls that do not originate from another docval function
+            depth = getattr(__call_state, 'depth', 0)
+            __call_state.depth = depth + 1
+            try:
+                return call(args, kwargs, depth == 0)
+            finally:
+                __call_state.depth = depth
         _rtype = rtype
         if isinstance(rtype, type):
             _rtype = rtype.__name__
@@ -452,6 +452,20 @@ class SweepTable(DynamicTable):
         # but this seems to be not possible
         self.add_row(**kwargs)
 
+    @docval({'name': 'pcs', 'type': (list, tuple), 'doc': 'PatchClampSeries to add to the table, ' +
+            'which must all have a valid sweep_number'})
+    def add_entries(self, pcs):
+        """
+        Add each of the passed PatchClampSeries to the sweep table, with one row for each series.
+        """
+
+        for p in pcs:
+            if not isinstance(p, PatchClampSeries):
+                raise TypeError("expected PatchClampSeries, got %s" % type(p).__name__)
+        self.add_rows(data={'sweep_number': np.array([p.sweep_number for p in pcs], dtype=np.int64),
+                            'series': list(pcs)},
+                      index={'series': np.arange(1, len(pcs) + 1)})
+
     def get_series(self, sweep_number):
         """
         Return a list of PatchClampSeries for the given sweep number.
@@ -13,7 +13,8 @@ __TYPE_MAP = TypeMap(__NS_CATALOG)
 
 # load the core namespace i.e. base NWB specification
 __resources = _get_resources()
-__TYPE_MAP.load_namespaces(__resources['namespace_path'])
+__TYPE_MAP.load_namespaces(__resources['namespace_path'], cache_dir=__resources['cache_dir'],
+                           cache_key=__resources['cache_key'], write_cache=False)
 __TYPE_MAP.merge(get_type_map())
 
 # Register new ObjectMapper with the new TypeMap:
@@ -226,6 +226,38 @@ class Units(DynamicTable):
         Add a unit to this table
         """
         super(Units, self).add_row(**kwargs)
+        self.__set_electrode_table()
+
+    @docval({'name': 'spike_times', 'type': 'array_data', 'default': None,
+             'doc': 'the spike times of each unit, or the spike times of all units if the offsets of the spike times '
+                    'of each unit are given in *index*'},
+            {'name': 'obs_intervals', 'type': 'array_data', 'default': None,
+             'doc': 'the observation intervals (valid times) of each unit, or the observation intervals of all units '
+                    'if the offsets of the intervals of each unit are given in *index*'},
+            {'name': 'electrodes', 'type': 'array_data', 'default': None,
+             'doc': 'the electrodes that each unit came from, or the electrodes of all units if the offsets of the '
+                    'electrodes of each unit are given in *index*'},
+            {'name': 'electrode_group', 'type': 'array_data', 'default': None,
+             'doc': 'the electrode group that each unit came from'},
+            {'name': 'waveform_mean', 'type': 'array_data', 'doc': 'the spike waveform mean for each unit',
+             'default': None},
+            {'name': 'waveform_sd', 'type': 'array_data', 'default': None,
+             'doc': 'the spike waveform standard deviation for each unit'},
+            {'name': 'id', 'type': 'array_data', 'default': None,
+             'doc': 'the id for each unit'},
+            {'name': 'index', 'type': dict, 'default': None,
+             'doc': 'the offsets of the end of each unit in the values of each indexed column'},
+            allow_extra=True)
+    def add_units(self, **kwargs):
+        """
+        Add many units to this table at once. See :py:meth:`~pynwb.core.DynamicTable.add_rows` for more details.
+        """
+        row_ids, index = popargs('id', 'index', kwargs)
+        data = {k: v for k, v in kwargs.items() if v is not None}
+        super(Units, self).add_rows(data=data, id=row_ids, index=index)
+        self.__set_electrode_table()
+
+    def __set_electrode_table(self):
         if 'electrodes' in self:
             elec_col = self['electrodes'].target
             if elec_col.table is None:
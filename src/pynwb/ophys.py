@@ -274,6 +274,28 @@ class PlaneSegmentation(DynamicTable):
             rkwargs['voxel_mask'] = voxel_mask
         return super(PlaneSegmentation, self).add_row(**rkwargs)
 
+    @docval({'name': 'pixel_mask', 'type': 'array_data', 'default': None,
+             'doc': 'the pixel mask of each 2D ROI, or the pixel masks of all ROIs if the offsets of the pixels of '
+                    'each ROI are given in *index*'},
+            {'name': 'voxel_mask', 'type': 'array_data', 'default': None,
+             'doc': 'the voxel mask of each 3D ROI, or the voxel masks of all ROIs if the offsets of the voxels of '
+                    'each ROI are given in *index*'},
+            {'name': 'image_mask', 'type': 'array_data', 'default': None,
+             'doc': 'the image mask of each ROI'},
+            {'name': 'id', 'type': 'array_data', 'doc': 'the ID for each ROI', 'default': None},
+            {'name': 'index', 'type': dict, 'default': None,
+             'doc': 'the offsets of the end of each ROI in the values of each indexed column'},
+            allow_extra=True)
+    def add_rois(self, **kwargs):
+        """
+        Add many ROIs at once. See :py:meth:`~pynwb.core.DynamicTable.add_rows` for more details.
+        """
+        row_ids, index = popargs('id', 'index', kwargs)
+        if all(kwargs[k] is None for k in ('pixel_mask', 'voxel_mask', 'image_mask')):
+            raise ValueError("Must provide 'image_mask' and/or 'pixel_mask'")
+        data = {k: v for k, v in kwargs.items() if v is not None}
+        return super(PlaneSegmentation, self).add_rows(data=data, id=row_ids, index=index)
+
     @docval({'name': 'description', 'type': str, 'doc': 'a brief description of what the region is'},
             {'name': 'region', 'type': (slice, list, tuple), 'doc': 'the indices of the table', 'default': slice(None)},
             {'name': 'name', 'type': str, 'doc': 'the name of the ROITableRegion', 'default': 'rois'})
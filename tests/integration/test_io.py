@@ -9,10 +9,12 @@ from pynwb import NWBFile, TimeSeries, get_manager, NWBHDF5IO
 
 from pynwb.form.backends.hdf5 import HDF5IO, H5DataIO
 from pynwb.form.data_utils import DataChunkIterator
+from pynwb.form.utils import docval, get_docval
 from pynwb.form.build import GroupBuilder, DatasetBuilder
 from pynwb.form.spec import NamespaceCatalog
 from pynwb.spec import NWBGroupSpec, NWBDatasetSpec, NWBNamespace
 from pynwb.ecephys import ElectricalSeries, LFP
+from pynwb.core import DynamicTable, VectorData, ElementIdentifiers
 
 import numpy as np
 
@@ -235,8 +237,25 @@ class TestHDF5WriterWithInjectedFile(unittest.TestCase):
                     self.assertDictEqual(original_spec, cached_spec)
 
 
+class WriteCountingIO(NWBHDF5IO):
+    """An NWBHDF5IO that records the names of the groups it writes"""
+
+    def __init__(self, *args, **kwargs):
+        super(WriteCountingIO, self).__init__(*args, **kwargs)
+        self.group_names = list()
+
+    @docval(*get_docval(HDF5IO.write_group))
+    def write_group(self, **kwargs):
+        self.group_names.append(kwargs['builder'].name)
+        return super(WriteCountingIO, self).write_group(**kwargs)
+
+
 class TestAppend(unittest.TestCase):
 
+    def tearDown(self):
+        if os.path.exists('test_append.nwb'):
+            os.remove('test_append.nwb')
+
     def test_append(self):
 
         FILENAME = 'test_append.nwb'
@@ -277,6 +296,85 @@ class TestAppend(unittest.TestCase):
             nwb = io.read()
             np.testing.assert_equal(nwb.acquisition['timeseries2'].data[:], ts2.data)
 
+    def test_append_writes_only_modified(self):
+        nwb = NWBFile(session_description='hi', identifier='hi', session_start_time=datetime(1970, 1, 1, 12,
+                                                                                             tzinfo=tzutc()))
+        proc_mod = nwb.create_processing_module(name='test_proc_mod', description='')
+        proc_mod.add_data_interface(TimeSeries('ts1', data=[1., 2., 3.], unit='m', rate=1.0))
+        with NWBHDF5IO('test_append.nwb', mode='w') as io:
+            io.write(nwb)
+
+        with WriteCountingIO('test_append.nwb', mode='a') as io:
+            nwb = io.read()
+            nwb.add_acquisition(TimeSeries('ts2', data=[4., 5., 6.], unit='m', rate=1.0))
+            io.write(nwb)
+            self.assertIn('ts2', io.group_names)
+            self.assertNotIn('test_proc_mod', io.group_names)
+            self.assertFalse(io.read_builder().modified)
+
+        with NWBHDF5IO('test_append.nwb', mode='r') as io:
+            nwb = io.read()
+            np.testing.assert_equal(nwb.acquisition['ts2'].data[:], [4., 5., 6.])
+            np.testing.assert_equal(nwb.modules['test_proc_mod']['ts1'].data[:], [1., 2., 3.])
+
+    def make_table(self):
+        nwb = NWBFile(session_description='hi', identifier='hi', session_start_time=datetime(1970, 1, 1, 12,
+                                                                                             tzinfo=tzutc()))
+        table = DynamicTable('table', 'a table',
+                             id=ElementIdentifiers('id', H5DataIO([0, 1], maxshape=(None,))),
+                             columns=[VectorData('foo', 'a float column', H5DataIO([1.0, 2.0], maxshape=(None,))),
+                                      VectorData('bar', 'a text column', H5DataIO(['a', 'b'], maxshape=(None,)))])
+        nwb.add_acquisition(table)
+        return nwb
+
+    def test_append_rows(self):
+        with NWBHDF5IO('test_append.nwb', mode='w') as io:
+            io.write(self.make_table())
+
+        with NWBHDF5IO('test_append.nwb', mode='a') as io:
+            nwb = io.read()
+            nwb.acquisition['table'].add_row(foo=3.0, bar='c')
+            io.write(nwb)
+            nwb.acquisition['table'].add_row(foo=4.0, bar='d')
+            io.write(nwb)
+
+        with NWBHDF5IO('test_append.nwb', mode='r') as io:
+            table = io.read().acquisition['table']
+            np.testing.assert_equal(table.id.data[:], [0, 1, 2, 3])
+            np.testing.assert_equal(table['foo'].data[:], [1.0, 2.0, 3.0, 4.0])
+            self.assertListEqual(list(table['bar'].data[:]), ['a', 'b', 'c', 'd'])
+
+    def test_append_rows_chunk_cache(self):
+        nwb = NWBFile(session_description='hi', identifier='hi', session_start_time=datetime(1970, 1, 1, 12,
+                                                                                             tzinfo=tzutc()))
+        ids = H5DataIO(list(range(15)), maxshape=(None,))
+        data = H5DataIO(np.arange(15.), maxshape=(None,), chunks=(10,), compression='gzip')
+        nwb.add_acquisition(DynamicTable('table', 'a table', id=ElementIdentifiers('id', ids),
+                                         columns=[VectorData('foo', 'a float column', data)]))
+        with NWBHDF5IO('test_append.nwb', mode='w') as io:
+            io.write(nwb)
+
+        with NWBHDF5IO('test_append.nwb', mode='a', chunk_cache_size=2**20) as io:
+            table = io.read().acquisition['table']
+            np.testing.assert_equal(table['foo'].data[:], np.arange(15.))
+            self.assertEqual(len(io.chunk_cache), 2)
+            table.add_row(foo=15.0)
+            io.write(table.get_ancestor('NWBFile'))
+            self.assertEqual(len(io.chunk_cache), 0)
+            np.testing.assert_equal(table['foo'].data[:], np.arange(16.))
+
+    def test_append_rows_not_resizable(self):
+        nwb = self.make_table()
+        nwb.add_trial(start_time=0., stop_time=1.)
+        with NWBHDF5IO('test_append.nwb', mode='w') as io:
+            io.write(nwb)
+
+        with NWBHDF5IO('test_append.nwb', mode='a') as io:
+            nwb = io.read()
+            nwb.add_trial(start_time=1., stop_time=2.)
+            with self.assertRaisesRegex(ValueError, 'not resizable'):
+                io.write(nwb)
+
 
 class TestH5DataIO(unittest.TestCase):
     """
@@ -373,3 +471,158 @@ class TestH5DataIO(unittest.TestCase):
         self.assertEqual(dset.compression_opts, 5)
         self.assertEqual(dset.shuffle, True)
         self.assertEqual(dset.fletcher32, True)
+
+
+class TestReadReferences(unittest.TestCase):
+
+    scan_metadata = False
+    cache_metadata = False
+
+    def setUp(self):
+        self.path = "test_read_references.h5"
+        nwbfile = NWBFile('a file with references', 'test_read_references', datetime.now(tzlocal()))
+        device = nwbfile.create_device('device')
+        groups = [nwbfile.create_electrode_group('group%d' % i, 'a group', 'a location', device) for i in range(2)]
+        for i in range(6):
+            nwbfile.add_electrode(x=1.0, y=2.0, z=3.0, imp=-1.0, location='a location', filtering='none',
+                                  group=groups[i % 2])
+        ts = TimeSeries('ts_name', np.arange(100.), 'A', timestamps=np.arange(100.))
+        nwbfile.add_acquisition(ts)
+        nwbfile.add_epoch(1.0, 5.0, ['a'], [ts])
+        nwbfile.add_epoch(6.0, 9.0, ['b'], [ts])
+        with NWBHDF5IO(self.path, 'w') as io:
+            io.write(nwbfile, cache_metadata=self.cache_metadata)
+        self.io = NWBHDF5IO(self.path, 'r', scan_metadata=self.scan_metadata)
+        self.nwbfile = self.io.read()
+
+    def tearDown(self):
+        self.io.close()
+        os.remove(self.path)
+
+    def test_object_references(self):
+        data = self.nwbfile.electrodes['group'].data
+        groups = data[:]
+        self.assertEqual([g.name for g in groups], ['group0', 'group1'] * 3)
+        self.assertIs(groups[0], groups[2])
+        self.assertIs(data[3], groups[1])
+        self.assertEqual([g.name for g in data[[4, 1]]], ['group0', 'group1'])
+        self.assertEqual(len(self.io.ref_cache), 2)
+
+    def test_object_references_selections(self):
+        data = self.nwbfile.electrodes['group'].data
+        self.assertEqual([data[i].name for i in range(6)], ['group0', 'group1'] * 3)
+        self.assertEqual(data[-1].name, 'group1')
+        self.assertEqual([g.name for g in data[5:0:-2]], ['group1', 'group1', 'group1'])
+        self.assertEqual([g.name for g in data[1:5:3]], ['group1', 'group0'])
+        self.assertEqual(data[3:3], [])
+        with self.assertRaises(IndexError):
+            data[6]
+
+    def test_compound_references(self):
+        data = self.nwbfile.epochs['timeseries'].target.data
+        rows = data[:]
+        self.assertEqual(rows['idx_start'].tolist(), [1, 6])
+        self.assertEqual(rows['count'].tolist(), [4, 3])
+        self.assertIs(rows['timeseries'][0], self.nwbfile.acquisition['ts_name'])
+        self.assertIs(rows['timeseries'][1], self.nwbfile.acquisition['ts_name'])
+        self.assertIs(data[1][2], self.nwbfile.acquisition['ts_name'])
+
+    def test_close_clears_cache(self):
+        self.nwbfile.electrodes['group'].data[:]
+        self.assertEqual(len(self.io.ref_cache), 2)
+        self.io.close()
+        self.assertEqual(len(self.io.ref_cache), 0)
+
+
+class TestReadReferencesScanMetadata(TestReadReferences):
+
+    scan_metadata = True
+
+    def test_read(self):
+        self.assertTrue(self.io.scan_metadata)
+        ts = self.nwbfile.acquisition['ts_name']
+        self.assertEqual(ts.unit, 'A')
+        self.assertTrue(np.array_equal(ts.data[:], np.arange(100.)))
+        self.assertTrue(np.array_equal(ts.timestamps[:], np.arange(100.)))
+        self.assertEqual(sorted(self.nwbfile.electrode_groups), ['group0', 'group1'])
+        self.assertIs(self.nwbfile.electrode_groups['group0'].device, self.nwbfile.devices['device'])
+
+
+class TestReadReferencesMetadataRecord(TestReadReferences):
+
+    cache_metadata = True
+
+    def test_read(self):
+        self.assertIn('.metadataloc', self.io._file.attrs)
+        ts = self.nwbfile.acquisition['ts_name']
+        self.assertEqual(ts.unit, 'A')
+        self.assertTrue(np.array_equal(ts.data[:], np.arange(100.)))
+        self.assertEqual(sorted(self.nwbfile.electrode_groups), ['group0', 'group1'])
+        self.assertIs(self.nwbfile.electrode_groups['group0'].device, self.nwbfile.devices['device'])
+
+    def test_read_from_record(self):
+        self.io.close()
+        with File(self.path, 'a') as f:
+            # writing over an attribute in place does not change the file, so the recorded value is read
+            f['acquisition/ts_name/data'].attrs.modify('conversion', 2.0)
+        with NWBHDF5IO(self.path, 'r') as io:
+            self.assertEqual(io.read().acquisition['ts_name'].conversion, 1.0)
+
+    def test_out_of_date(self):
+        self.io.close()
+        with File(self.path, 'a') as f:
+            f['acquisition/ts_name'].attrs['comments'] = 'a longer comment ' * 100
+        with NWBHDF5IO(self.path, 'r') as io:
+            with self.assertWarnsRegex(UserWarning, 'out of date'):
+                nwbfile = io.read()
+            self.assertEqual(nwbfile.acquisition['ts_name'].comments, 'a longer comment ' * 100)
+
+    def test_deleted(self):
+        self.io.close()
+        with NWBHDF5IO(self.path, 'a') as io:
+            nwbfile = io.read()
+            nwbfile.add_acquisition(TimeSeries('ts2', np.arange(10.), 'A', rate=1.0))
+            io.write(nwbfile, cache_metadata=True)
+        with File(self.path, 'a') as f:
+            # deleting an object does not grow the file
+            del f['acquisition/ts2']
+        with NWBHDF5IO(self.path, 'r') as io:
+            with self.assertWarnsRegex(UserWarning, 'out of date'):
+                nwbfile = io.read()
+            self.assertEqual(sorted(nwbfile.acquisition), ['ts_name'])
+
+    def test_added_attribute(self):
+        self.io.close()
+        with File(self.path, 'a') as f:
+            f['acquisition/ts_name/data'].attrs.modify('resolution', 0.5)
+            del f['acquisition/ts_name/data'].attrs['conversion']
+        with NWBHDF5IO(self.path, 'r') as io:
+            with self.assertWarnsRegex(UserWarning, 'out of date'):
+                self.assertEqual(io.read().acquisition['ts_name'].resolution, 0.5)
+
+    def test_stale_record(self):
+        self.io.close()
+        with NWBHDF5IO(self.path, 'a') as io:
+            nwbfile = io.read()
+            nwbfile.add_acquisition(TimeSeries('ts2', np.arange(10.), 'A', rate=1.0))
+            io.write(nwbfile, cache_metadata=True)
+        with File(self.path, 'a') as f:
+            # deleting an object does not grow the file, so the record is read until the group of the object is
+            del f['acquisition/ts2/data']
+        with NWBHDF5IO(self.path, 'r') as io:
+            builder = io.read_builder()
+            with self.assertWarnsRegex(UserWarning, "contents of '/acquisition/ts2' changed"):
+                self.assertEqual(sorted(builder['acquisition/ts2'].datasets), ['starting_time'])
+            self.assertEqual(sorted(builder['acquisition'].groups), ['ts2', 'ts_name'])
+
+    def test_append_deletes_record(self):
+        self.io.close()
+        with NWBHDF5IO(self.path, 'a') as io:
+            nwbfile = io.read()
+            nwbfile.add_acquisition(TimeSeries('ts2', np.arange(10.), 'A', rate=1.0))
+            io.write(nwbfile)
+        with File(self.path, 'r') as f:
+            self.assertNotIn('.metadataloc', f.attrs)
+            self.assertNotIn('.metadata', f)
+        with NWBHDF5IO(self.path, 'r') as io:
+            self.assertEqual(sorted(io.read().acquisition), ['ts2', 'ts_name'])
@@ -1,6 +1,6 @@
 import unittest2 as unittest
 
-from pynwb.form.build import GroupBuilder, DatasetBuilder, LinkBuilder
+from pynwb.form.build import GroupBuilder, LazyGroupBuilder, DatasetBuilder, LinkBuilder
 
 
 class GroupBuilderSetterTests(unittest.TestCase):
@@ -191,6 +191,31 @@ class GroupBuilderGetterTests(unittest.TestCase):
             self.assertItemsEqual(values, self.gb.values())
 
 
+class BuilderCompactTests(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        builders = (GroupBuilder('gb'), LazyGroupBuilder('gb', dict), DatasetBuilder('db', [1, 2, 3]),
+                    LinkBuilder(GroupBuilder('target'), 'link'))
+        for builder in builders:
+            self.assertFalse(hasattr(builder, '__dict__'), type(builder).__name__)
+
+    def test_names_interned(self):
+        name = ''.join(['data', 'set'])
+        db = DatasetBuilder(name, attributes={''.join(['at', 'tr']): 1})
+        self.assertIs(db.name, 'dataset')
+        self.assertIs(list(db.attributes)[0], 'attr')
+
+    def test_get_path(self):
+        db = DatasetBuilder('dataset', [1, 2, 3])
+        gb = GroupBuilder('gb', groups=[GroupBuilder('group1', groups=[GroupBuilder('group2', datasets=[db])])])
+        self.assertIs(gb['group1/group2/dataset'], db)
+        self.assertIs(gb['group1/./group2//dataset'], db)
+        self.assertIs(gb['group1/group2/../group2/dataset'], db)
+        self.assertIsNone(gb.get('group1/dataset'))
+        with self.assertRaises(KeyError):
+            gb['group1/missing/dataset']
+
+
 class GroupBuilderIsEmptyTests(unittest.TestCase):
 
     def test_is_empty_true(self):
@@ -309,5 +334,108 @@ class DatasetBuilderDeepUpdateTests(unittest.TestCase):
         self.assertIn('attr1', db1.attributes)
 
 
+class LazyGroupBuilderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+    def loader(self):
+        self.calls += 1
+        return {'attributes': {'attr1': 'value1'},
+                'groups': [GroupBuilder('subgroup')],
+                'datasets': [DatasetBuilder('dataset', [1, 2, 3])],
+                'links': [LinkBuilder(GroupBuilder('target'), 'link')]}
+
+    def test_not_loaded(self):
+        gb = LazyGroupBuilder('gb', self.loader)
+        self.assertFalse(gb.loaded)
+        self.assertEqual(gb.name, 'gb')
+        self.assertEqual(self.calls, 0)
+
+    def test_load_on_access(self):
+        gb = LazyGroupBuilder('gb', self.loader)
+        self.assertIn('subgroup', gb.groups)
+        self.assertTrue(gb.loaded)
+        self.assertEqual(gb.attributes, {'attr1': 'value1'})
+        self.assertIs(gb['subgroup'].parent, gb)
+        self.assertIn('dataset', gb)
+        self.assertIn('link', gb.links)
+        self.assertEqual(self.calls, 1)
+
+    def test_set_before_load(self):
+        gb = LazyGroupBuilder('gb', self.loader)
+        gb.set_group(GroupBuilder('subgroup2'))
+        self.assertEqual(set(gb.groups.keys()), {'subgroup', 'subgroup2'})
+        self.assertEqual(self.calls, 1)
+
+    def test_equal(self):
+        gb = LazyGroupBuilder('gb', self.loader)
+        expected = GroupBuilder('gb', groups=[GroupBuilder('subgroup')], attributes={'attr1': 'value1'},
+                                datasets=[DatasetBuilder('dataset', [1, 2, 3])])
+        expected.set_link(gb.links['link'])
+        self.assertEqual(gb, expected)
+
+    def test_load_not_modified(self):
+        gb = LazyGroupBuilder('gb', self.loader)
+        gb.written = True
+        gb.load()
+        self.assertFalse(gb.modified)
+        self.assertEqual(gb.modified_attributes, tuple())
+
+
+class BuilderModifiedTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = DatasetBuilder('dataset', [1, 2, 3], attributes={'attr1': 'value1'})
+        self.subgroup = GroupBuilder('subgroup', datasets={'dataset': self.dataset})
+        self.gb = GroupBuilder('gb', groups={'subgroup': self.subgroup})
+        for bldr in (self.gb, self.subgroup, self.dataset):
+            bldr.written = True
+
+    def test_new_not_modified(self):
+        self.assertFalse(self.gb.modified)
+        self.assertFalse(self.dataset.modified)
+
+    def test_set_attribute_new_value(self):
+        self.dataset.set_attribute('attr1', 'value2')
+        self.assertEqual(self.dataset.modified_attributes, ('attr1',))
+        self.assertTrue(self.dataset.modified)
+        self.assertTrue(self.subgroup.modified)
+        self.assertTrue(self.gb.modified)
+
+    def test_set_attribute_same_value(self):
+        self.dataset.set_attribute('attr1', 'value1')
+        self.assertFalse(self.dataset.modified)
+        self.assertFalse(self.gb.modified)
+
+    def test_set_attribute_not_written(self):
+        gb = GroupBuilder('gb')
+        gb.set_attribute('attr1', 'value1')
+        self.assertFalse(gb.modified)
+        self.assertEqual(gb.modified_attributes, tuple())
+
+    def test_set_group(self):
+        self.subgroup.set_group(GroupBuilder('subgroup2'))
+        self.assertTrue(self.subgroup.modified)
+        self.assertTrue(self.gb.modified)
+        self.assertFalse(self.dataset.modified)
+
+    def test_set_same_group(self):
+        self.gb.set_group(self.subgroup)
+        self.assertFalse(self.gb.modified)
+
+    def test_deep_update(self):
+        self.dataset.deep_update(DatasetBuilder('dataset', [1, 2, 3, 4]))
+        self.assertEqual(self.dataset.data, [1, 2, 3, 4])
+        self.assertTrue(self.dataset.modified)
+        self.assertTrue(self.gb.modified)
+
+    def test_set_unmodified(self):
+        self.dataset.set_attribute('attr1', 'value2')
+        self.dataset.set_modified(False)
+        self.assertFalse(self.dataset.modified)
+        self.assertEqual(self.dataset.modified_attributes, tuple())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest2 as unittest
+from copy import copy
 
 from pynwb.form.spec import GroupSpec, AttributeSpec, DatasetSpec, SpecCatalog, SpecNamespace, NamespaceCatalog
 from pynwb.form.build import GroupBuilder, DatasetBuilder, ObjectMapper, BuildManager, TypeMap
@@ -59,6 +60,10 @@ class Foo(Container):
     pass
 
 
+class Baz(Container):
+    pass
+
+
 class TestGetSubSpec(unittest.TestCase):
 
     def setUp(self):
@@ -132,6 +137,62 @@ class TestTypeMap(unittest.TestCase):
         self.assertIs(mapper.spec, self.bar_spec)
         self.assertIsInstance(mapper, MyMap)
 
+    def test_get_map_register_after_get_map(self):
+        class MyMap(ObjectMapper):
+            pass
+        container_inst = Bar('my_bar', list(range(10)), 'value1', 10)
+        self.type_map.get_map(container_inst)
+        self.type_map.register_map(Bar, MyMap)
+        self.assertIsInstance(self.type_map.get_map(container_inst), MyMap)
+
+    def test_copy_shares_mappers(self):
+        container_inst = Bar('my_bar', list(range(10)), 'value1', 10)
+        mapper = self.type_map.get_map(container_inst)
+        type_map = copy(self.type_map)
+        self.assertIs(type_map.get_map(container_inst), mapper)
+        self.assertIs(type_map.namespace_catalog.get_namespace(CORE_NAMESPACE), self.namespace)
+
+    def test_copy_register_map(self):
+        class MyMap(ObjectMapper):
+            pass
+        container_inst = Bar('my_bar', list(range(10)), 'value1', 10)
+        type_map = copy(self.type_map)
+        type_map.register_map(Bar, MyMap)
+        self.assertIsInstance(type_map.get_map(container_inst), MyMap)
+        self.assertNotIsInstance(self.type_map.get_map(container_inst), MyMap)
+
+    def test_copy_register_on_original(self):
+        class MyMap(ObjectMapper):
+            pass
+        container_inst = Bar('my_bar', list(range(10)), 'value1', 10)
+        type_map = copy(self.type_map)
+        self.type_map.register_map(Bar, MyMap)
+        self.assertIsInstance(self.type_map.get_map(container_inst), MyMap)
+        self.assertNotIsInstance(type_map.get_map(container_inst), MyMap)
+
+    def test_copy_get_map_not_shared(self):
+        container_inst = Bar('my_bar', list(range(10)), 'value1', 10)
+        type_map = copy(self.type_map)
+        # a mapper constructed after copying is not added to the tables of the other TypeMap
+        mapper = type_map.get_map(container_inst)
+        self.assertIs(type_map.get_map(container_inst), mapper)
+        self.assertIsNot(self.type_map.get_map(container_inst), mapper)
+
+    def test_copy_add_namespace(self):
+        baz_spec = GroupSpec('A test group specification with data type Baz', data_type_def='Baz')
+        spec_catalog = SpecCatalog()
+        spec_catalog.register_spec(baz_spec, 'ext.yaml')
+        namespace = SpecNamespace('an extension namespace', 'test_ext', [{'source': 'ext.yaml'}],
+                                  catalog=spec_catalog)
+        type_map = copy(self.type_map)
+        type_map.namespace_catalog.add_namespace('test_ext', namespace)
+        type_map.register_container_type('test_ext', 'Baz', Baz)
+        self.assertEqual(type_map.namespace_catalog.namespaces, (CORE_NAMESPACE, 'test_ext'))
+        self.assertEqual(self.type_map.namespace_catalog.namespaces, (CORE_NAMESPACE,))
+        self.assertEqual(type_map.get_container_cls_dt(Baz), ('test_ext', 'Baz'))
+        self.assertEqual(self.type_map.get_container_cls_dt(Baz), (None, None))
+        self.assertEqual(type_map.get_container_cls_dt(Bar), (CORE_NAMESPACE, 'Bar'))
+
 
 class TestDynamicContainer(unittest.TestCase):
 
@@ -4,6 +4,9 @@ from pynwb.form.spec import AttributeSpec, DatasetSpec, SpecCatalog, SpecNamespa
 from pynwb.form.build import DatasetBuilder, ObjectMapper, BuildManager, TypeMap
 from pynwb.form import Data
 from pynwb.form.utils import docval, getargs
+from pynwb.form.data_utils import DtypeView
+
+import numpy as np
 
 CORE_NAMESPACE = 'test_core'
 
@@ -54,3 +57,56 @@ class TestDataMap(unittest.TestCase):
         builder = self.mapper.build(container, self.manager)
         expected = DatasetBuilder('my_baz', list(range(10)), attributes={'baz_attr': 'abcdefghijklmnopqrstuvwxyz'})
         self.assertDictEqual(builder, expected)
+
+
+class TestConvertDtype(unittest.TestCase):
+
+    def test_array_no_copy(self):
+        spec = DatasetSpec('an example dataset', 'int32', name='data')
+        value = np.arange(10, dtype=np.int32)
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, value)
+        self.assertIs(ret, value)
+        self.assertIs(ret_dtype, np.int32)
+
+    def test_array_higher_precision(self):
+        spec = DatasetSpec('an example dataset', 'float32', name='data')
+        value = np.arange(10, dtype=np.float64)
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, value)
+        self.assertIs(ret, value)
+        self.assertIs(ret_dtype, np.float64)
+
+    def test_array_lazy_conversion(self):
+        spec = DatasetSpec('an example dataset', 'int32', name='data')
+        value = np.arange(10, dtype=np.int16)
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, value)
+        self.assertIsInstance(ret, DtypeView)
+        self.assertIs(ret.data, value)
+        self.assertIs(ret_dtype, np.int32)
+        self.assertEqual(np.asarray(ret).dtype, np.dtype('int32'))
+
+    def test_text_array_no_copy(self):
+        spec = DatasetSpec('an example dataset', 'text', name='data')
+        value = np.array(['a', 'b', 'c'])
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, value)
+        self.assertIs(ret, value)
+        self.assertEqual(ret_dtype, 'utf8')
+
+    def test_list(self):
+        spec = DatasetSpec('an example dataset', 'float64', name='data')
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, [1.0, 2.5, 4])
+        self.assertIsInstance(ret, list)
+        self.assertListEqual(ret, [1.0, 2.5, 4.0])
+        self.assertTrue(all(isinstance(x, np.float64) for x in ret))
+        self.assertIs(ret_dtype, np.float64)
+
+    def test_nested_list(self):
+        spec = DatasetSpec('an example dataset', 'int32', name='data')
+        ret, ret_dtype = ObjectMapper.convert_dtype(spec, [[1, 2], [3, 4]])
+        self.assertListEqual(ret, [[1, 2], [3, 4]])
+        self.assertTrue(all(isinstance(x, np.int64) for row in ret for x in row))
+        self.assertIs(ret_dtype, np.int64)
+
+    def test_list_wrong_type(self):
+        spec = DatasetSpec('an example dataset', 'int32', name='data')
+        with self.assertRaises(ValueError):
+            ObjectMapper.convert_dtype(spec, [1.5, 2.5])
@@ -2,8 +2,11 @@ import unittest2 as unittest
 import ruamel.yaml as yaml
 import json
 import os
+import shutil
+import tempfile
 
 from pynwb.form.spec import AttributeSpec, DatasetSpec, GroupSpec, SpecNamespace, NamespaceCatalog
+from pynwb.form.spec.namespace import YAMLSpecReader
 
 
 class TestSpecLoad(unittest.TestCase):
@@ -112,3 +115,97 @@ class TestSpecLoad(unittest.TestCase):
         src_dsets = {s.name for s in self.ext_datasets}
         ext_dsets = {s.name for s in es_spec.datasets}
         self.assertSetEqual(src_dsets, ext_dsets)
+
+
+class CountingSpecReader(YAMLSpecReader):
+
+    specs_read = 0
+
+    def read_spec(self, spec_path):
+        self.specs_read += 1
+        return super(CountingSpecReader, self).read_spec(spec_path)
+
+
+class TestSpecLoadCache(TestSpecLoad):
+
+    def setUp(self):
+        super(TestSpecLoadCache, self).setUp()
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestSpecLoadCache, self).tearDown()
+        shutil.rmtree(self.cache_dir)
+
+    def get_cache_files(self):
+        return [f for f in os.listdir(self.cache_dir) if f.endswith('.pkl')]
+
+    def test_cache_written(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        self.assertEqual(len(self.get_cache_files()), 1)
+
+    def test_cache_read(self):
+        expected = self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        reader = CountingSpecReader(indir=os.path.dirname(self.namespace_path))
+        ns_catalog = NamespaceCatalog()
+        received = ns_catalog.load_namespaces(self.namespace_path, reader=reader, cache_dir=self.cache_dir)
+        self.assertEqual(received, expected)
+        self.assertEqual(reader.specs_read, 0)
+        self.assertEqual(ns_catalog.namespaces, (self.NS_NAME,))
+        self.assertEqual(ns_catalog.get_namespace_sources(self.NS_NAME), (self.specs_path,))
+        self.assertEqual(ns_catalog.get_types(self.specs_path), ('EphysData', 'VoltageArray', 'SpikeData'))
+        self.assertEqual(ns_catalog.get_spec(self.NS_NAME, 'SpikeData'),
+                         self.ns_catalog.get_spec(self.NS_NAME, 'SpikeData'))
+        self.assertEqual(ns_catalog.get_hierarchy(self.NS_NAME, 'SpikeData'), ('SpikeData', 'EphysData'))
+
+    def test_cache_invalidated(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        with open(self.specs_path, 'r') as f:
+            specs = yaml.safe_load(f)
+        specs['groups'][1]['doc'] = 'a modified test group extension'
+        with open(self.specs_path, 'w') as f:
+            yaml.safe_dump(specs, f, default_flow_style=False)
+        ns_catalog = NamespaceCatalog()
+        ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        self.assertEqual(ns_catalog.get_spec(self.NS_NAME, 'SpikeData').doc, 'a modified test group extension')
+        self.assertEqual(len(self.get_cache_files()), 2)
+
+    def test_cache_corrupt(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        with open(os.path.join(self.cache_dir, self.get_cache_files()[0]), 'wb') as f:
+            f.write(b'not a pickle')
+        ns_catalog = NamespaceCatalog()
+        ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        self.assertEqual(ns_catalog.get_spec(self.NS_NAME, 'SpikeData'),
+                         self.ns_catalog.get_spec(self.NS_NAME, 'SpikeData'))
+
+    def test_cache_not_written(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir, write_cache=False)
+        self.assertEqual(self.get_cache_files(), [])
+
+    def test_cache_key(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir, cache_key='1.0')
+        reader = CountingSpecReader(indir=os.path.dirname(self.namespace_path))
+        ns_catalog = NamespaceCatalog()
+        ns_catalog.load_namespaces(self.namespace_path, reader=reader, cache_dir=self.cache_dir, cache_key='2.0')
+        self.assertGreater(reader.specs_read, 0)
+        self.assertEqual(len(self.get_cache_files()), 2)
+
+    @unittest.skipIf(not hasattr(os, 'getuid') or os.getuid() != 0, 'changing the owner of a file requires root')
+    def test_cache_other_owner(self):
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        os.chown(os.path.join(self.cache_dir, self.get_cache_files()[0]), 12345, 12345)
+        reader = CountingSpecReader(indir=os.path.dirname(self.namespace_path))
+        ns_catalog = NamespaceCatalog()
+        with self.assertWarnsRegex(UserWarning, 'not owned by the current user'):
+            ns_catalog.load_namespaces(self.namespace_path, reader=reader, cache_dir=self.cache_dir)
+        self.assertGreater(reader.specs_read, 0)
+
+    @unittest.skipIf(not hasattr(os, 'getuid') or os.getuid() != 0, 'changing the owner of a file requires root')
+    def test_cache_other_owner_not_written(self):
+        # e.g., a cache installed with a package
+        self.ns_catalog.load_namespaces(self.namespace_path, cache_dir=self.cache_dir)
+        os.chown(os.path.join(self.cache_dir, self.get_cache_files()[0]), 12345, 12345)
+        reader = CountingSpecReader(indir=os.path.dirname(self.namespace_path))
+        ns_catalog = NamespaceCatalog()
+        ns_catalog.load_namespaces(self.namespace_path, reader=reader, cache_dir=self.cache_dir, write_cache=False)
+        self.assertEqual(reader.specs_read, 0)
@@ -7,8 +7,9 @@ from six import text_type
 
 from pynwb.form.backends.hdf5 import HDF5IO
 from pynwb.form.build import GroupBuilder, DatasetBuilder, LinkBuilder, BuildManager
+from pynwb.form.build import LazyGroupBuilder
 
-from pynwb import TimeSeries, get_type_map
+from pynwb import TimeSeries, get_type_map, get_manager
 
 from numbers import Number
 
@@ -264,6 +265,58 @@ class TestHDF5Writer(GroupBuilderTestCase):
         self.assertBuilderEqual(builder, self.builder)
         io.close()
 
+    def test_read_builder_lazy(self):
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=self.manager, mode='r')
+        builder = io.read_builder()
+        self.assertIsInstance(builder, LazyGroupBuilder)
+        self.assertFalse(builder.loaded)
+        acquisition = builder.groups['acquisition']
+        self.assertTrue(builder.loaded)
+        self.assertFalse(acquisition.loaded)
+        self.assertFalse(builder.groups['stimulus'].loaded)
+        self.assertIs(builder['acquisition/timeseries/test_timeseries'].parent, acquisition.groups['timeseries'])
+        self.assertFalse(builder.groups['stimulus'].loaded)
+        io.close()
+
+    def test_read_link_target_parent(self):
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=self.manager, mode='r')
+        builder = io.read_builder()
+        target = builder['processing/test_module/test_timeseries_link'].builder
+        self.assertEqual(target.path, 'root/acquisition/timeseries/test_timeseries')
+        self.assertIs(target, builder['acquisition/timeseries/test_timeseries'])
+        io.close()
+
+    def test_get_container_path(self):
+        self.ts_builder.set_attribute('namespace', 'core')
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=get_manager(), mode='r')
+        ts = io.get_container('/acquisition/timeseries/test_timeseries')
+        self.assertIsInstance(ts, TimeSeries)
+        self.assertEqual(list(ts.data), list(range(100, 200, 10)))
+        self.assertFalse(io.read_builder().groups['stimulus'].loaded)
+        io.close()
+
+    def test_get_builder(self):
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=self.manager, mode='r')
+        builder = io.get_builder('acquisition/timeseries/test_timeseries')
+        root = io.read_builder()
+        self.assertIs(builder, root['acquisition/timeseries/test_timeseries'])
+        self.assertIs(io.get_builder('/acquisition/timeseries/test_timeseries'), builder)
+        self.assertIs(io.get_builder('/'), root)
+        self.assertFalse(root.groups['stimulus'].loaded)
+        io.close()
+
     def test_overwrite_written(self):
         self.maxDiff = None
         io = HDF5IO(self.path, manager=self.manager, mode='a')
@@ -272,3 +325,27 @@ class TestHDF5Writer(GroupBuilderTestCase):
         with self.assertRaisesRegex(ValueError, "cannot change written to not written"):
             builder.written = False
         io.close()
+
+    def test_read_builder_scan_metadata(self):
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=self.manager, mode='r', scan_metadata=True)
+        builder = io.read_builder()
+        self.assertIsInstance(builder, LazyGroupBuilder)
+        self.assertBuilderEqual(builder, self.builder)
+        target = builder['processing/test_module/test_timeseries_link'].builder
+        self.assertIs(target, builder['acquisition/timeseries/test_timeseries'])
+        self.assertIs(target.parent, builder['acquisition/timeseries'])
+        io.close()
+
+    def test_read_link_target_parent_scan_metadata(self):
+        io = HDF5IO(self.path, manager=self.manager, mode='a')
+        io.write_builder(self.builder)
+        io.close()
+        io = HDF5IO(self.path, manager=self.manager, mode='r', scan_metadata=True)
+        builder = io.read_builder()
+        target = builder['processing/test_module/test_timeseries_link'].builder
+        self.assertEqual(target.path, 'root/acquisition/timeseries/test_timeseries')
+        self.assertFalse(builder.groups['acquisition'].loaded)
+        io.close()
@@ -1,12 +1,17 @@
 import os
 import unittest2 as unittest
 
-from pynwb.form.data_utils import DataChunkIterator
+from pynwb.form.data_utils import DataChunkIterator, AbstractDataChunkIterator, DataChunk, ThreadedDataChunkIterator
+from pynwb.form.data_utils import ArrayDataChunkIterator, DtypeView
 from pynwb.form.backends.hdf5.h5tools import HDF5IO
 from pynwb.form.backends.hdf5 import H5DataIO
-from pynwb.form.build import DatasetBuilder
+from pynwb.form.backends.hdf5.h5_utils import H5Dataset, H5StrDataset, ChunkCache, H5RegionSlicer,\
+                                             H5MetadataScan
+from pynwb.form.build import GroupBuilder, DatasetBuilder, RegionBuilder
 from pynwb.form.spec.namespace import NamespaceCatalog
-from h5py import SoftLink, HardLink, ExternalLink, File
+from pynwb.form.spec import DtypeSpec, RefSpec
+import h5py
+from h5py import SoftLink, HardLink, ExternalLink, File, special_dtype, h5r, h5s
 from pynwb.file import NWBFile
 from pynwb.base import TimeSeries
 from pynwb import NWBHDF5IO
@@ -20,6 +25,13 @@ import warnings
 import numpy as np
 from datetime import datetime
 from dateutil.tz import tzlocal
+from collections import namedtuple
+
+try:
+    from mpi4py import MPI
+    SKIP_MPI = not h5py.get_config().mpi
+except ImportError:
+    SKIP_MPI = True
 
 
 class H5IOTest(unittest.TestCase):
@@ -85,6 +97,54 @@ class H5IOTest(unittest.TestCase):
         self.assertTrue(np.all(my_dset[:] == a))
         self.assertTupleEqual(my_dset.shape, a.shape)
 
+    def __shapes_during_fill(self, n, growth):
+        # record the shape of the dataset each time a chunk is requested
+        shapes = list()
+
+        def samples():
+            for i in range(n):
+                if 'test_dataset' in self.f:
+                    shapes.append(self.f['test_dataset'].shape[0])
+                yield i
+        dci = DataChunkIterator(data=samples(), buffer_size=1)
+        options = None if growth is None else {'growth': growth}
+        my_dset = HDF5IO.__chunked_iter_fill__(self.f, 'test_dataset', dci, options=options)
+        self.assertListEqual(my_dset[:].tolist(), list(range(n)))
+        return shapes
+
+    def test__chunked_iter_fill_geometric_growth(self):
+        shapes = self.__shapes_during_fill(1000, 'geometric')
+        self.assertEqual(self.f['test_dataset'].shape, (1000,))
+        self.assertLessEqual(len(set(shapes)), 12)
+
+    def test__chunked_iter_fill_exact_growth(self):
+        shapes = self.__shapes_during_fill(100, 'exact')
+        self.assertEqual(self.f['test_dataset'].shape, (100,))
+        self.assertEqual(len(set(shapes)), 99)
+
+    def test__chunked_iter_fill_chunk_growth(self):
+        dci = DataChunkIterator(data=iter(range(25)), buffer_size=10)
+        io_settings = {'chunks': (8,), 'maxshape': (None,)}
+        my_dset = HDF5IO.__chunked_iter_fill__(self.f, 'test_dataset', dci,
+                                               options={'growth': 'chunk', 'io_settings': io_settings})
+        self.assertListEqual(my_dset[:].tolist(), list(range(25)))
+
+    def test__chunked_iter_fill_growth_maxshape(self):
+        dci = DataChunkIterator(data=iter(range(10)), buffer_size=3, maxshape=(10,))
+        my_dset = HDF5IO.__chunked_iter_fill__(self.f, 'test_dataset', dci, options={'growth': 'geometric'})
+        self.assertListEqual(my_dset[:].tolist(), list(range(10)))
+
+    def test__chunked_iter_fill_default_growth(self):
+        shapes = self.__shapes_during_fill(10, None)
+        self.assertListEqual(shapes, list(range(1, 10)))
+
+    def test_h5dataio_default_growth(self):
+        self.assertEqual(H5DataIO(DataChunkIterator(data=iter(range(10)))).growth, 'exact')
+
+    def test_write_dataset_bad_growth(self):
+        with self.assertRaisesRegex(ValueError, "growth must be one of"):
+            H5DataIO(DataChunkIterator(data=iter(range(10))), growth='linear')
+
     ##########################################
     #  write_dataset tests: scalars
     ##########################################
@@ -164,6 +224,46 @@ class H5IOTest(unittest.TestCase):
         self.assertTrue(np.all(dset[:] == a.data))
         self.assertEqual(dset.fillvalue, -1)
 
+    def test_write_dataset_array_keeps_dtype(self):
+        a = np.arange(10, dtype=np.int16)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', a, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertEqual(dset.dtype, np.int16)
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_array_converted_dtype(self):
+        a = np.arange(10, dtype=np.float64) / 4
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', a, attributes={}, dtype='float'))
+        dset = self.f['test_dataset']
+        self.assertEqual(dset.dtype, np.float32)
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_array_not_contiguous(self):
+        a = np.arange(60).reshape(10, 6)[::2, 1::2]
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', a, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_dtype_view(self):
+        a = np.arange(10, dtype=np.int16)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', DtypeView(a, np.int32), attributes={},
+                                                     dtype=np.int32))
+        dset = self.f['test_dataset']
+        self.assertEqual(dset.dtype, np.int32)
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_list_fill_slabs(self):
+        a = np.arange(60).reshape(10, 2, 3)
+        slab_bytes = HDF5IO._HDF5IO__slab_bytes
+        HDF5IO._HDF5IO__slab_bytes = 3 * a[0].size * np.dtype('float32').itemsize
+        try:
+            dset = self.io.__list_fill__(self.f, 'test_dataset', a.tolist(),
+                                         options={'dtype': 'float', 'io_settings': {}})
+        finally:
+            HDF5IO._HDF5IO__slab_bytes = slab_bytes
+        self.assertEqual(dset.dtype, np.float32)
+        self.assertTrue(np.all(dset[:] == a))
+
     ##########################################
     #  write_dataset tests: tables
     ##########################################
@@ -238,6 +338,23 @@ class H5IOTest(unittest.TestCase):
         dset = self.f['test_dataset']
         self.assertListEqual(dset[:].tolist(), list(range(10)))
 
+    def test_write_dataset_threaded_data_chunk_iterator(self):
+        dci = ThreadedDataChunkIterator(DataChunkIterator(data=np.arange(100).reshape(25, 4), buffer_size=7))
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', dci, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertListEqual(dset[:].tolist(), np.arange(100).reshape(25, 4).tolist())
+        self.assertEqual(dci.stats['chunks'], 4)
+
+    def test_write_dataset_array_data_chunk_iterator(self):
+        a = np.arange(60 * 8).reshape(60, 8)
+        self.io.write_dataset(self.f, DatasetBuilder('source', a, attributes={}))
+        adci = ArrayDataChunkIterator(self.f['source'], chunk_shape=(16, 4))
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', adci, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertEqual(dset.chunks, (16, 4))
+        self.assertEqual(dset.shape, (60, 8))
+        self.assertListEqual(dset[:].tolist(), a.tolist())
+
     def test_write_dataset_data_chunk_iterator_with_compression(self):
         dci = DataChunkIterator(data=np.arange(10), buffer_size=2)
         wrapped_dci = H5DataIO(data=dci,
@@ -274,6 +391,58 @@ class H5IOTest(unittest.TestCase):
         self.assertEqual(dset.shuffle, True)
         self.assertEqual(dset.fletcher32, True)
 
+    ##########################################
+    #  write_dataset tests: compression_workers
+    ##########################################
+    def test_write_dataset_compression_workers(self):
+        a = np.arange(1000, dtype=np.int32).reshape(100, 10)
+        wrapped = H5DataIO(a, chunks=(30, 4), compression='gzip', compression_opts=6, compression_workers=2)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', wrapped, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertEqual(dset.compression, 'gzip')
+        self.assertEqual(dset.compression_opts, 6)
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_compression_workers_shuffle(self):
+        a = np.arange(1000, dtype=np.float64).reshape(100, 10)
+        wrapped = H5DataIO(a, chunks=(30, 4), compression='gzip', shuffle=True, compression_workers=2)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', wrapped, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertTrue(dset.shuffle)
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_compression_workers_list(self):
+        a = np.arange(1000, dtype=np.int64).reshape(100, 10)
+        wrapped = H5DataIO(a.tolist(), chunks=(30, 4), compression='gzip', compression_workers=2)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', wrapped, attributes={}))
+        self.assertTrue(np.all(self.f['test_dataset'][:] == a))
+
+    def test_write_dataset_compression_workers_data_chunk_iterator(self):
+        a = np.arange(1000, dtype=np.int16).reshape(100, 10)
+        wrapped = H5DataIO(DataChunkIterator(a, buffer_size=25), chunks=(10, 10), compression='gzip',
+                           compression_workers=2)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', wrapped, attributes={}))
+        dset = self.f['test_dataset']
+        self.assertTupleEqual(dset.shape, (100, 10))
+        self.assertTrue(np.all(dset[:] == a))
+
+    def test_write_dataset_compression_workers_fletcher32(self):
+        a = np.arange(100, dtype=np.int32)
+        wrapped = H5DataIO(a, chunks=(30,), compression='gzip', fletcher32=True, compression_workers=2)
+        self.io.write_dataset(self.f, DatasetBuilder('test_dataset', wrapped, attributes={}))
+        self.assertTrue(np.all(self.f['test_dataset'][:] == a))
+
+    def test_compression_workers_without_gzip(self):
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            dset = H5DataIO(np.arange(30), compression_workers=2)
+            self.assertEqual(len(w), 1)
+        self.assertIsNone(dset.compression_workers)
+
+    def test_compression_workers_bad_value(self):
+        with self.assertRaises(ValueError):
+            H5DataIO(np.arange(30), compression='gzip', compression_workers=0)
+
     #############################################
     #  H5DataIO general
     #############################################
@@ -362,6 +531,567 @@ class H5IOTest(unittest.TestCase):
         with self.assertRaisesRegex(Exception, r"cannot add \S+ to [/\S]+ - could not determine type"):
             self.io.__list_fill__(self.f, 'empty_dataset', [])
 
+    ##########################################
+    #  write_builder tests: references
+    ##########################################
+    def __ref_builder(self):
+        root = GroupBuilder('root')
+        targets = [root.add_dataset('target%d' % i, list(range(i, i + 5))) for i in range(3)]
+        group = root.add_group('target_group')
+        return root, targets, group
+
+    def test_write_object_references(self):
+        root, targets, group = self.__ref_builder()
+        data = [targets[i % 3] for i in range(30)] + [group]
+        root.add_dataset('refs', data, dtype='object')
+        self.io.write_builder(root)
+        dset = self.f['refs']
+        self.assertEqual([self.f[r].name for r in dset[()]],
+                         ['/target%d' % (i % 3) for i in range(30)] + ['/target_group'])
+
+    def test_write_region_references(self):
+        root, targets, group = self.__ref_builder()
+        data = [RegionBuilder(slice(0, 2), targets[0]), RegionBuilder(slice(1, 4), targets[2])]
+        root.add_dataset('regions', data, dtype='region')
+        self.io.write_builder(root)
+        dset = self.f['regions']
+        self.assertEqual(self.f['target0'][dset[0]].tolist(), [0, 1])
+        self.assertEqual(self.f['target2'][dset[1]].tolist(), [3, 4, 5])
+
+    def test_write_table_references(self):
+        root, targets, group = self.__ref_builder()
+        dt = [DtypeSpec('a', 'a column', 'int32'), DtypeSpec('b', 'b column', RefSpec('Data', 'object'))]
+        data = [(i, targets[i % 3]) for i in range(10)]
+        root.add_dataset('table', data, dtype=dt)
+        self.io.write_builder(root)
+        dset = self.f['table']
+        self.assertEqual(dset['a'].tolist(), list(range(10)))
+        self.assertEqual([self.f[r].name for r in dset['b']], ['/target%d' % (i % 3) for i in range(10)])
+
+    def test_write_references_to_references(self):
+        root, targets, group = self.__ref_builder()
+        refs = root.add_dataset('refs', [targets[0], targets[1]], dtype='object')
+        root.add_dataset('ref_refs', [refs, refs], dtype='object')
+        regions = root.add_dataset('ref_regions', [RegionBuilder(slice(0, 1), refs)], dtype='region')
+        root.set_attribute('ref_attr', regions)
+        self.io.write_builder(root)
+        self.assertEqual(self.f[self.f['ref_refs'][1]].name, '/refs')
+        self.assertEqual(self.f[self.f['refs'][self.f['ref_regions'][0]][0]].name, '/target0')
+        self.assertEqual(self.f[self.f.attrs['ref_attr']].name, '/ref_regions')
+
+    ##########################################
+    #  __list_fill__ tests: parallel slabs
+    ##########################################
+    def test_list_fill_rank_slabs(self):
+        Rank = namedtuple('Rank', ['rank', 'size'])
+        data = np.arange(10)
+        for rank in range(4):
+            HDF5IO.__list_fill__(self.f, 'rank%d' % rank, data, options={'comm': Rank(rank, 4), 'io_settings': {}})
+        written = [self.f['rank%d' % rank][()] for rank in range(4)]
+        expected = [(0, 3), (3, 6), (6, 8), (8, 10)]
+        for rank, (start, stop) in enumerate(expected):
+            self.assertEqual(written[rank][start:stop].tolist(), data[start:stop].tolist())
+        # every element is written by exactly one rank
+        self.assertEqual(sum(stop - start for start, stop in expected), len(data))
+
+
+class RankChunkIterator(AbstractDataChunkIterator):
+    """Yield the rows of a 1D array that belong to one MPI rank, one row at a time"""
+
+    def __init__(self, data, rank, size):
+        self.data = data
+        self.rows = iter(range(rank, len(data), size))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        i = next(self.rows)
+        return DataChunk(data=self.data[i:i+1], selection=np.s_[i:i+1])
+
+    next = __next__
+
+    def recommended_chunk_shape(self):
+        return None
+
+    def recommended_data_shape(self):
+        return self.data.shape
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def maxshape(self):
+        return self.data.shape
+
+
+@unittest.skipIf(SKIP_MPI, 'MPI-enabled h5py and mpi4py are required for parallel I/O')
+class TestParallelWrite(unittest.TestCase):
+    """Tests for parallel writes. Run with e.g. mpirun -n 4 python -m pytest <this file>"""
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        path = tempfile.mktemp(suffix='.h5') if self.comm.rank == 0 else None
+        self.path = self.comm.bcast(path, root=0)
+        self.data = np.arange(10 * self.comm.size + 3)
+
+    def tearDown(self):
+        self.comm.Barrier()
+        if self.comm.rank == 0 and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, data):
+        root = GroupBuilder('root')
+        root.add_group('group', attributes={'attr': 'value'})
+        root.add_dataset('data', data)
+        io = HDF5IO(self.path, mode='w', comm=self.comm)
+        io.write_builder(root)
+        io.close()
+        self.comm.Barrier()
+        with File(self.path, 'r') as f:
+            self.assertEqual(f['group'].attrs['attr'], 'value')
+            self.assertEqual(f['data'][()].tolist(), self.data.tolist())
+
+    def test_list_fill(self):
+        self.write(self.data)
+
+    def test_chunked_iter_fill(self):
+        self.write(RankChunkIterator(self.data, self.comm.rank, self.comm.size))
+
+
+HAVE_READ_DIRECT_CHUNK = hasattr(h5py.h5d.DatasetID, 'read_direct_chunk')
+
+
+@unittest.skipIf(HAVE_READ_DIRECT_CHUNK, 'read_direct_chunk is available')
+class TestParallelReadUnavailable(unittest.TestCase):
+
+    def test_read_workers_ignored(self):
+        path = tempfile.mktemp(suffix='.h5')
+        File(path, 'w').close()
+        try:
+            with self.assertWarnsRegex(UserWarning, 'ignoring read_workers'):
+                io = HDF5IO(path, mode='r', read_workers=2)
+            self.assertIsNone(io.read_workers)
+            self.assertIsNone(io.read_pool)
+            io.close()
+        finally:
+            os.remove(path)
+
+
+@unittest.skipUnless(HAVE_READ_DIRECT_CHUNK, 'read_direct_chunk requires h5py 2.10 or newer')
+class TestParallelRead(unittest.TestCase):
+    """Tests for decompressing chunks in parallel when reading"""
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix='.h5')
+        self.data = np.arange(1030 * 37, dtype=np.float64).reshape(1030, 37)
+        with File(self.path, 'w') as f:
+            f.create_dataset('gzip', data=self.data, chunks=(100, 8), compression='gzip')
+            f.create_dataset('shuffle', data=self.data, chunks=(100, 8), compression='gzip', shuffle=True)
+            f.create_dataset('partial', shape=(1030, 37), dtype=np.float64, chunks=(100, 8), compression='gzip',
+                             fillvalue=-1)
+            f['partial'][:500] = self.data[:500]
+            f.create_dataset('plain', data=self.data, chunks=(100, 8))
+        self.io = HDF5IO(self.path, mode='r', read_workers=2)
+        self.builder = self.io.read_builder()
+
+    def tearDown(self):
+        self.io.close()
+        os.remove(self.path)
+
+    def check(self, name, expected):
+        dset = self.builder[name].data
+        self.assertIsInstance(dset, H5Dataset)
+        self.assertTupleEqual(dset.shape, expected.shape)
+        for key in (np.s_[:], np.s_[5:777, 3:30], np.s_[7], np.s_[:, 9], np.s_[-20:], np.s_[3:4, 5:6],
+                    np.s_[::2]):
+            self.assertTrue(np.array_equal(dset[key], expected[key]))
+
+    def test_read_workers(self):
+        self.assertEqual(self.io.read_workers, 2)
+
+    def test_read_pool(self):
+        self.check('gzip', self.data)
+        pool = self.io.read_pool
+        self.assertIsNotNone(pool)
+        self.check('shuffle', self.data)
+        self.assertIs(self.io.read_pool, pool)
+        self.io.close()
+        with self.assertRaises(ValueError):     # the pool is not running
+            pool.map(abs, [-1])
+
+    def test_read_gzip(self):
+        self.check('gzip', self.data)
+
+    def test_read_shuffle(self):
+        self.check('shuffle', self.data)
+
+    def test_read_unwritten_chunks(self):
+        expected = np.full(self.data.shape, -1, dtype=np.float64)
+        expected[:500] = self.data[:500]
+        self.check('partial', expected)
+
+    def test_read_uncompressed(self):
+        self.assertIsInstance(self.builder['plain'].data, h5py.Dataset)
+
+
+class TestChunkCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ChunkCache(100)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_put_get(self):
+        chunk = np.zeros(5, dtype=np.int64)
+        self.cache.put('a', chunk)
+        self.assertIs(self.cache.get('a'), chunk)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.size, 40)
+
+    def test_evict_least_recently_used(self):
+        for key in 'abc':
+            self.cache.put(key, np.zeros(4, dtype=np.int64))
+        self.cache.get('a')
+        self.cache.put('d', np.zeros(4, dtype=np.int64))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.size, 96)
+
+    def test_chunk_too_large(self):
+        self.cache.put('a', np.zeros(20, dtype=np.int64))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_drop(self):
+        self.cache.put((('file.h5', '/a', (10,)), (0,)), np.zeros(5, dtype=np.int64))
+        self.cache.put((('file.h5', '/a', (20,)), (10,)), np.zeros(2, dtype=np.int64))
+        self.cache.put((('file.h5', '/b', (10,)), (0,)), np.zeros(5, dtype=np.int64))
+        self.cache.drop('file.h5', '/a')
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 40)
+        self.assertIsNotNone(self.cache.get((('file.h5', '/b', (10,)), (0,))))
+
+    def test_clear(self):
+        self.cache.put('a', np.zeros(5, dtype=np.int64))
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+
+class TestChunkCacheRead(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix='.h5')
+        self.data = np.arange(1030 * 37, dtype=np.float64).reshape(1030, 37)
+        with File(self.path, 'w') as f:
+            f.create_dataset('gzip', data=self.data, chunks=(100, 8), compression='gzip', maxshape=(None, 37))
+            f.create_dataset('plain', data=self.data, chunks=(100, 8))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_cache_hits(self):
+        io = HDF5IO(self.path, mode='r', chunk_cache_size=2**20)
+        dset = io.read_builder()['gzip'].data
+        self.assertIsInstance(dset, H5Dataset)
+        self.assertTrue(np.array_equal(dset[10:20, 3], self.data[10:20, 3]))
+        self.assertEqual(io.chunk_cache.misses, 1)
+        self.assertTrue(np.array_equal(dset[15:150], self.data[15:150]))
+        self.assertEqual(io.chunk_cache.hits, 1)
+        self.assertEqual(io.chunk_cache.misses, 10)
+        self.assertTrue(np.array_equal(dset[:], self.data))
+        self.assertEqual(io.chunk_cache.hits, 11)
+        io.close()
+        self.assertEqual(len(io.chunk_cache), 0)
+
+    def test_cache_eviction(self):
+        io = HDF5IO(self.path, mode='r', chunk_cache_size=100 * 8 * 8 * 2)
+        dset = io.read_builder()['gzip'].data
+        self.assertTrue(np.array_equal(dset[:, :16], self.data[:, :16]))
+        self.assertLessEqual(io.chunk_cache.size, io.chunk_cache.capacity)
+        # the first chunk was evicted, and the last chunk is still cached
+        misses = io.chunk_cache.misses
+        self.assertEqual(dset[0, 0], self.data[0, 0])
+        self.assertEqual(io.chunk_cache.misses, misses + 1)
+        self.assertEqual(dset[-1, 15], self.data[-1, 15])
+        self.assertEqual(io.chunk_cache.misses, misses + 1)
+        io.close()
+
+    def test_resized(self):
+        io = HDF5IO(self.path, mode='a', chunk_cache_size=2**20)
+        dset = io.read_builder()['gzip'].data
+        self.assertTrue(np.array_equal(dset[1000:], self.data[1000:]))
+        dset.dataset.resize(1040, axis=0)
+        dset.dataset[1030:] = 1.0
+        # the cached edge chunk is not used for the larger dataset
+        self.assertTrue(np.array_equal(dset[1000:1030], self.data[1000:]))
+        self.assertTrue(np.array_equal(dset[1030:], np.ones((10, 37))))
+        io.close()
+
+    def test_uncompressed(self):
+        io = HDF5IO(self.path, mode='r', chunk_cache_size=2**20)
+        self.assertIsInstance(io.read_builder()['plain'].data, h5py.Dataset)
+        io.close()
+
+    def test_global_cache_size(self):
+        NWBHDF5IO.set_chunk_cache_size(2**20)
+        try:
+            io = NWBHDF5IO(self.path, mode='r')
+            self.assertEqual(io.chunk_cache.capacity, 2**20)
+            io.close()
+            io = NWBHDF5IO(self.path, mode='r', chunk_cache_size=2**10)
+            self.assertEqual(io.chunk_cache.capacity, 2**10)
+            io.close()
+        finally:
+            NWBHDF5IO.set_chunk_cache_size(None)
+        io = NWBHDF5IO(self.path, mode='r')
+        self.assertIsNone(io.chunk_cache)
+        io.close()
+
+
+class TestStrDatasetRead(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix='.h5')
+        self.data = ['row %d' % i for i in range(5000)]
+        with File(self.path, 'w') as f:
+            f.create_dataset('text', data=np.array(self.data, dtype=object), dtype=special_dtype(vlen=str))
+        self.io = HDF5IO(self.path, mode='r')
+        self.dset = self.io.read_builder()['text'].data
+
+    def tearDown(self):
+        self.io.close()
+        os.remove(self.path)
+
+    def test_lazy(self):
+        self.assertIsInstance(self.dset, H5StrDataset)
+        self.assertEqual(len(self.dset), 5000)
+
+    def test_int(self):
+        self.assertEqual(self.dset[3], 'row 3')
+        self.assertEqual(self.dset[-1], 'row 4999')
+
+    def test_slice(self):
+        self.assertEqual(list(self.dset[10:15]), self.data[10:15])
+
+    def test_list(self):
+        idx = [4999, 3, 3, -2, 2000, 0]
+        self.assertEqual(list(self.dset[idx]), [self.data[i] for i in idx])
+
+    def test_array_far_apart(self):
+        idx = np.array([0, 4000, 1, 2500])
+        self.assertEqual(list(self.dset[idx]), [self.data[i] for i in idx])
+
+    def test_mask(self):
+        mask = np.zeros(5000, dtype=bool)
+        mask[[5, 4000]] = True
+        self.assertEqual(list(self.dset[mask]), ['row 5', 'row 4000'])
+
+    def test_empty(self):
+        self.assertEqual(len(self.dset[[]]), 0)
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.dset[[1, 5000]]
+
+    def test_iter(self):
+        self.assertEqual(list(self.dset), self.data)
+
+    def test_array(self):
+        self.assertTrue(np.array_equal(np.asarray(self.dset), self.data))
+
+    def test_compare(self):
+        expected = np.zeros(5000, dtype=bool)
+        expected[3] = True
+        np.testing.assert_array_equal(self.dset == 'row 3', expected)
+        np.testing.assert_array_equal(self.dset != 'row 3', ~expected)
+
+
+class TestH5RegionSlicer(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix='.h5')
+        self.file = File(self.path, 'w')
+        self.vector = self.file.create_dataset('vector', data=np.arange(1000.))
+        self.matrix = self.file.create_dataset('matrix', data=np.arange(3000).reshape(1000, 3))
+
+    def tearDown(self):
+        self.file.close()
+        os.remove(self.path)
+
+    def region(self, dset, *hyperslabs):
+        space = dset.id.get_space()
+        space.select_none()
+        for start, count in hyperslabs:
+            space.select_hyperslab(start, count, op=h5s.SELECT_OR)
+        return h5r.create(self.file.id, dset.name.encode('utf-8'), h5r.DATASET_REGION, space)
+
+    def assertSlicesEqual(self, dset, region):
+        expected = dset[region]
+        slicer = H5RegionSlicer(dset, region)
+        self.assertEqual(len(slicer), len(expected))
+        n = len(expected)
+        keys = [slice(None), Ellipsis, 0, -1, n // 2, slice(1, n - 1), slice(None, None, -1), slice(n - 1, 0, -3),
+                [0, n - 1, 0], np.array([n - 1, 1]), np.arange(n) % 2 == 0]
+        if expected.ndim == 2:
+            keys.extend([(0, 0), (slice(1, 4), 0), ([2, 0], slice(None))])
+        for key in keys:
+            with self.subTest(key=key):
+                received = slicer[key]
+                self.assertEqual(np.shape(received), np.shape(expected[key]))
+                self.assertTrue(np.array_equal(received, expected[key]))
+
+    def test_all(self):
+        self.assertSlicesEqual(self.vector, self.vector.regionref[:])
+
+    def test_slice(self):
+        self.assertSlicesEqual(self.vector, self.vector.regionref[10:500])
+
+    def test_strided_slice(self):
+        self.assertSlicesEqual(self.vector, self.vector.regionref[10:900:7])
+
+    def test_points(self):
+        self.assertSlicesEqual(self.vector, self.vector.regionref[[3, 7, 200, 800]])
+
+    def test_union(self):
+        self.assertSlicesEqual(self.vector, self.region(self.vector, ((0,), (10,)), ((500,), (20,))))
+
+    def test_rows(self):
+        self.assertSlicesEqual(self.matrix, self.matrix.regionref[100:700])
+
+    def test_rows_and_columns(self):
+        self.assertSlicesEqual(self.matrix, self.matrix.regionref[100:700:3, ::2])
+
+    def test_column_union(self):
+        self.assertSlicesEqual(self.matrix, self.region(self.matrix, ((0, 0), (10, 1)), ((0, 2), (10, 1))))
+
+    def test_not_a_product(self):
+        # read in full, like a selection of points of a multidimensional dataset
+        self.assertSlicesEqual(self.matrix, self.region(self.matrix, ((0, 0), (10, 1)), ((500, 1), (20, 2))))
+
+    def test_out_of_range(self):
+        slicer = H5RegionSlicer(self.vector, self.vector.regionref[10:20])
+        with self.assertRaises(IndexError):
+            slicer[10]
+        with self.assertRaises(IndexError):
+            slicer[[0, 10]]
+
+    def test_reads_only_indexed_rows(self):
+        class CountingDataset(H5Dataset):
+            rows_read = 0
+
+            def __getitem__(self, key):
+                ret = super(CountingDataset, self).__getitem__(key)
+                CountingDataset.rows_read += len(np.atleast_1d(ret))
+                return ret
+
+        io = HDF5IO(self.path, mode='r', file=self.file)
+        slicer = H5RegionSlicer(CountingDataset(self.vector, io), self.vector.regionref[100:900])
+        self.assertEqual(slicer[5], 105.)
+        self.assertEqual(list(slicer[[0, 799]]), [100., 899.])
+        self.assertEqual(CountingDataset.rows_read, 3)
+
+
+class TestH5MetadataScan(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mktemp(suffix='.h5')
+        self.file = File(self.path, 'w')
+        self.file.attrs['title'] = 'a file'
+        group = self.file.create_group('group')
+        group.attrs['ints'] = np.arange(3)
+        group.attrs['strs'] = np.array(['a', 'b'], dtype=special_dtype(vlen=str))
+        group.attrs['ref'] = self.file.ref
+        dset = group.create_dataset('data', data=np.arange(10))
+        dset.attrs['unit'] = 'seconds'
+        self.file['alias'] = group                  # a second hard link to the group
+        self.file['soft'] = SoftLink('/group/data')
+        self.file['external'] = ExternalLink('other.h5', '/data')
+        self.file.create_group('ignored').create_dataset('data', data=np.arange(3))
+
+    def tearDown(self):
+        self.file.close()
+        os.remove(self.path)
+
+    def test_links(self):
+        scan = H5MetadataScan(self.file, ['/ignored'])
+        self.assertEqual(sorted(scan.get_links('/')),
+                         [('alias', H5MetadataScan.HARD, '/alias'),
+                          ('external', H5MetadataScan.EXTERNAL, ('other.h5', '/data')),
+                          ('group', H5MetadataScan.HARD, '/alias'),
+                          ('soft', H5MetadataScan.SOFT, '/group/data')])
+        self.assertEqual(scan.get_links('/alias'), [('data', H5MetadataScan.HARD, '/alias/data')])
+        self.assertEqual(scan.get_links('/ignored'), [])
+
+    def test_objects(self):
+        scan = H5MetadataScan(self.file, ['/ignored'])
+        self.assertIsNone(scan.get_object('/ignored'))
+        self.assertIsNone(scan.get_object('/group'))
+        self.assertEqual(scan.get_object('/alias'), self.file['group'].id)
+        self.assertEqual(scan.get_type('/alias'), H5MetadataScan.GROUP)
+        self.assertEqual(scan.get_type('/alias/data'), H5MetadataScan.DATASET)
+        self.assertIsNone(scan.get_type('/ignored'))
+        self.assertEqual(scan.get_layout('/alias/data'), (np.dtype(int), (10,), (10,)))
+        self.assertEqual(scan.get_attributes('/alias/data'), {'unit': 'seconds'})
+        self.assertEqual(scan.get_attributes('/'), {'title': 'a file'})
+        self.assertAttributesEqual(scan.get_attributes('/alias'))
+
+    def assertAttributesEqual(self, attrs):
+        self.assertEqual(sorted(attrs), ['ints', 'ref', 'strs'])
+        self.assertTrue(np.array_equal(attrs['ints'], np.arange(3)))
+        self.assertEqual(list(attrs['strs']), ['a', 'b'])
+        self.assertEqual(self.file[attrs['ref']], self.file['/'])
+
+    def test_get_path(self):
+        scan = H5MetadataScan(self.file)
+        self.assertEqual(scan.get_path(self.file['group/data']), '/alias/data')
+        self.assertEqual(scan.get_path(self.file), '/')
+
+    def test_record(self):
+        self.file['group'].attrs['empty'] = h5py.Empty(np.dtype('f'))
+        self.file['group'].attrs['bytes'] = np.array([b'ab', b'c'])
+        self.file['group'].attrs['refs'] = np.array([self.file.ref, self.file['group/data'].ref],
+                                                    dtype=special_dtype(ref=h5py.Reference))
+        self.file['group/data'].attrs['scalar'] = np.float32(0.5)
+        scan = H5MetadataScan(self.file, ['/ignored'])
+        loaded = H5MetadataScan(self.file, ['/ignored'], record=scan.to_record())
+        for path in ('/', '/alias', '/alias/data'):
+            self.assertEqual(loaded.get_type(path), scan.get_type(path))
+            self.assertEqual(loaded.get_links(path), scan.get_links(path))
+            self.assertEqual(loaded.get_layout(path), scan.get_layout(path))
+            self.assertEqual(loaded.get_object(path), scan.get_object(path))
+        self.assertIsNone(loaded.get_type('/ignored'))
+        self.assertEqual(loaded.get_path(self.file['group/data']), '/alias/data')
+        attrs = loaded.get_attributes('/alias')
+        self.assertEqual(attrs.pop('empty').dtype, np.dtype('f'))
+        self.assertTrue(np.array_equal(attrs.pop('bytes'), np.array([b'ab', b'c'])))
+        self.assertEqual([self.file[r].name for r in attrs.pop('refs')], ['/', '/alias/data'])
+        self.assertAttributesEqual(attrs)
+        scalar = loaded.get_attributes('/alias/data')['scalar']
+        self.assertEqual(scalar, 0.5)
+        self.assertEqual(scalar.dtype, np.float32)
+
+    def test_changed_since_record(self):
+        record = H5MetadataScan(self.file, ['/ignored']).to_record()
+        loaded = H5MetadataScan(self.file, ['/ignored'], record=record)
+        self.assertIsNotNone(loaded.get_object('/'))
+        # objects that are not scanned are not checked
+        self.file['ignored'].attrs['changed'] = True
+        self.file['ignored'].create_dataset('more', data=np.arange(3))
+        self.file['group/data'].attrs['changed'] = True
+        del self.file['soft']
+        loaded = H5MetadataScan(self.file, ['/ignored'], record=record)
+        self.assertIsNotNone(loaded.get_object('/alias'))
+        with self.assertRaisesRegex(KeyError, 'changed since the record was written'):
+            loaded.get_object('/alias/data')
+        with self.assertRaisesRegex(KeyError, 'changed since the record was written'):
+            loaded.get_object('/')
+
 
 class TestCacheSpec(unittest.TestCase):
 
@@ -1,7 +1,7 @@
 import unittest2 as unittest
 from six import text_type
 
-from pynwb.form.utils import docval, fmt_docval_args
+from pynwb.form.utils import docval, fmt_docval_args, set_production_mode, get_production_mode
 
 
 class MyTestClass(object):
@@ -310,6 +310,30 @@ class TestDocValidator(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.test_obj.basic_add2_kw('a string', 100, bar=1000)
 
+    def test_mutable_default_not_shared(self):
+        """Test that docval gives each call its own copy of a mutable default value"""
+        @docval({'name': 'arg1', 'type': list, 'doc': 'a list', 'default': list()})
+        def method(self, **kwargs):
+            return kwargs['arg1']
+
+        first = method(self)
+        first.append(1)
+        self.assertListEqual(method(self), [])
+
+    def test_type_check_cached_per_class(self):
+        """Test that the cached type check distinguishes between value classes"""
+        @docval({'name': 'arg1', 'type': int, 'doc': 'an int'})
+        def method(self, **kwargs):
+            return kwargs['arg1']
+
+        self.assertEqual(method(self, 1), 1)
+        self.assertEqual(method(self, 2), 2)
+        with self.assertRaises(TypeError):
+            method(self, 'a string')
+        self.assertEqual(method(self, 3), 3)
+        with self.assertRaises(TypeError):
+            method(self, 'another string')
+
     def test_unsupported_docval_term(self):
         @docval({'name': 'arg1', 'type': 'array_data', 'doc': 'this is a bad shape', 'unsupported': 'hi!'})
         def method(self, **kwargs):
@@ -318,5 +342,59 @@ class TestDocValidator(unittest.TestCase):
             method(self, arg1=[[1, 1]])
 
 
+class TestDocvalProductionMode(unittest.TestCase):
+
+    def setUp(self):
+        self.test_obj = MyTestClass()
+        set_production_mode(True)
+
+    def tearDown(self):
+        set_production_mode(False)
+
+    def test_get_production_mode(self):
+        self.assertTrue(get_production_mode())
+        set_production_mode(False)
+        self.assertFalse(get_production_mode())
+
+    def test_outer_call_validated(self):
+        """Test that calls at the API boundary are still checked in production mode"""
+        with self.assertRaises(TypeError):
+            self.test_obj.basic_add2('a string', 'bad string')
+
+    def test_nested_call_not_validated(self):
+        """Test that calls from within another docval function are not checked in production mode"""
+        test_obj = self.test_obj
+
+        @docval({'name': 'arg1', 'type': str, 'doc': 'argument1 is a str'}, is_method=False)
+        def outer(**kwargs):
+            return test_obj.basic_add2(kwargs['arg1'], 'bad string')
+
+        self.assertDictEqual(outer('a string'), {'arg1': 'a string', 'arg2': 'bad string'})
+        set_production_mode(False)
+        with self.assertRaises(TypeError):
+            outer('a string')
+
+    def test_nested_call_missing_args(self):
+        """Test that missing arguments are reported for nested calls in production mode"""
+        test_obj = self.test_obj
+
+        @docval({'name': 'arg1', 'type': str, 'doc': 'argument1 is a str'}, is_method=False)
+        def outer(**kwargs):
+            return test_obj.basic_add2(kwargs['arg1'])
+
+        with self.assertRaisesRegex(TypeError, "missing argument 'arg2'"):
+            outer('a string')
+
+    def test_nested_defaults(self):
+        """Test that default values are filled in for nested calls in production mode"""
+        test_obj = self.test_obj
+
+        @docval(is_method=False)
+        def outer(**kwargs):
+            return test_obj.basic_only_kw()
+
+        self.assertDictEqual(outer(), {'arg1': 'a', 'arg2': 1})
+
+
 if __name__ == '__main__':
     unittest.main()
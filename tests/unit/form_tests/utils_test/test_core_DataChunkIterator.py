@@ -1,6 +1,7 @@
 import unittest2 as unittest
+import time
 
-from pynwb.form.data_utils import DataChunkIterator, DataChunk
+from pynwb.form.data_utils import DataChunkIterator, DataChunk, ThreadedDataChunkIterator, ArrayDataChunkIterator
 import numpy as np
 
 
@@ -108,6 +109,62 @@ class DataChunkIteratorTests(unittest.TestCase):
         self.assertEqual(daiter.dtype, a.dtype)
 
 
+class ArrayDataChunkIteratorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.a = np.arange(10 * 6 * 4).reshape(10, 6, 4)
+
+    def assertCovers(self, chunks, shape):
+        # every element is returned by exactly one block
+        counts = np.zeros(shape, dtype=int)
+        for chunk in chunks:
+            counts[chunk.selection] += 1
+            self.assertTrue(np.all(chunk.data == self.a[chunk.selection]))
+        self.assertTrue(np.all(counts == 1))
+
+    def test_shape_dtype(self):
+        adci = ArrayDataChunkIterator(self.a, chunk_shape=(3, 6, 4))
+        self.assertEqual(adci.maxshape, (10, 6, 4))
+        self.assertEqual(adci.recommended_data_shape(), (10, 6, 4))
+        self.assertEqual(adci.recommended_chunk_shape(), (3, 6, 4))
+        self.assertEqual(adci.dtype, self.a.dtype)
+
+    def test_blocks(self):
+        chunks = list(ArrayDataChunkIterator(self.a, chunk_shape=(3, 4, 4)))
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(chunks[1].selection, (slice(0, 3), slice(4, 6), slice(0, 4)))
+        self.assertCovers(chunks, self.a.shape)
+
+    def test_views(self):
+        for chunk in ArrayDataChunkIterator(self.a, chunk_shape=(5, 3, 2)):
+            self.assertTrue(np.shares_memory(chunk.data, self.a))
+
+    def test_buffer_shape(self):
+        chunks = list(ArrayDataChunkIterator(self.a, chunk_shape=(2, 3, 4), buffer_shape=(4, 6, 4)))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0].data.shape, (4, 6, 4))
+        self.assertCovers(chunks, self.a.shape)
+
+    def test_buffer_shape_not_aligned(self):
+        with self.assertRaisesRegex(ValueError, 'must be a multiple of chunk_shape'):
+            ArrayDataChunkIterator(self.a, chunk_shape=(2, 3, 4), buffer_shape=(3, 6, 4))
+
+    def test_default_chunk_shape(self):
+        a = np.zeros((100000, 384), dtype=np.int16)
+        chunk_shape = ArrayDataChunkIterator(a).recommended_chunk_shape()
+        self.assertLessEqual(int(np.prod(chunk_shape)) * a.itemsize, 1 << 20)
+        self.assertEqual(len(chunk_shape), 2)
+
+    def test_chunk_shape_larger_than_data(self):
+        adci = ArrayDataChunkIterator(self.a, chunk_shape=(20, 20, 20))
+        self.assertEqual(adci.recommended_chunk_shape(), (10, 6, 4))
+
+    def test_list(self):
+        adci = ArrayDataChunkIterator(self.a.tolist(), chunk_shape=(4, 6, 4))
+        self.assertEqual(adci.maxshape, (10, 6, 4))
+        self.assertCovers(list(adci), self.a.shape)
+
+
 class DataChunkTests(unittest.TestCase):
 
     def setUp(self):
@@ -125,5 +182,53 @@ class DataChunkTests(unittest.TestCase):
         self.assertEqual(len(temp), 5)
 
 
+class ThreadedDataChunkIteratorTests(unittest.TestCase):
+
+    def test_same_chunks(self):
+        a = np.arange(30).reshape(10, 3)
+        expected = [(c.data.tolist(), c.selection) for c in DataChunkIterator(data=a, buffer_size=3)]
+        tdci = ThreadedDataChunkIterator(DataChunkIterator(data=a, buffer_size=3), queue_depth=1)
+        self.assertEqual([(c.data.tolist(), c.selection) for c in tdci], expected)
+        self.assertEqual(tdci.stats['chunks'], 4)
+        self.assertEqual(list(tdci), [])
+
+    def test_delegate_shape(self):
+        dci = DataChunkIterator(data=np.arange(10, dtype=np.int16), buffer_size=4)
+        tdci = ThreadedDataChunkIterator(dci)
+        self.assertEqual(tdci.maxshape, (10,))
+        self.assertEqual(tdci.dtype, np.dtype(np.int16))
+        self.assertEqual(tdci.recommended_data_shape(), dci.recommended_data_shape())
+        self.assertEqual(tdci.recommended_chunk_shape(), dci.recommended_chunk_shape())
+
+    def test_consumer_wait(self):
+        def slow():
+            for i in range(3):
+                time.sleep(0.05)
+                yield i
+        tdci = ThreadedDataChunkIterator(DataChunkIterator(data=slow()))
+        self.assertEqual([c.data.tolist() for c in tdci], [[0], [1], [2]])
+        self.assertGreater(tdci.stats['consumer_wait'], 0.05)
+        self.assertGreater(tdci.stats['read_time'], 0.05)
+
+    def test_producer_error(self):
+        def failing():
+            yield 1
+            yield 2
+            raise RuntimeError('read failed')
+        tdci = ThreadedDataChunkIterator(DataChunkIterator(data=failing()))
+        with self.assertRaisesRegex(RuntimeError, 'read failed'):
+            list(tdci)
+
+    def test_close(self):
+        tdci = ThreadedDataChunkIterator(DataChunkIterator(data=np.arange(100)), queue_depth=2)
+        next(tdci)
+        tdci.close()
+        self.assertEqual(list(tdci), [])
+
+    def test_bad_queue_depth(self):
+        with self.assertRaises(ValueError):
+            ThreadedDataChunkIterator(DataChunkIterator(data=np.arange(10)), queue_depth=0)
+
+
 if __name__ == '__main__':
     unittest.main()
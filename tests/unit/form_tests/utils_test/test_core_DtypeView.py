@@ -0,0 +1,44 @@
+import unittest2 as unittest
+
+from pynwb.form.data_utils import DtypeView
+import numpy as np
+
+
+class DtypeViewTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.arange(12, dtype=np.int16).reshape(4, 3)
+        self.view = DtypeView(self.data, np.int32)
+
+    def test_no_copy(self):
+        self.assertIs(self.view.data, self.data)
+
+    def test_properties(self):
+        self.assertEqual(self.view.dtype, np.dtype('int32'))
+        self.assertTupleEqual(self.view.shape, (4, 3))
+        self.assertEqual(self.view.ndim, 2)
+        self.assertEqual(len(self.view), 4)
+
+    def test_getitem_slice(self):
+        ret = self.view[1:3]
+        self.assertEqual(ret.dtype, np.dtype('int32'))
+        self.assertTrue(np.all(ret == self.data[1:3]))
+
+    def test_getitem_scalar(self):
+        ret = self.view[1, 2]
+        self.assertIsInstance(ret, np.int32)
+        self.assertEqual(ret, 5)
+
+    def test_iter(self):
+        rows = list(self.view)
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row.dtype == np.dtype('int32') for row in rows))
+
+    def test_array(self):
+        ret = np.asarray(self.view)
+        self.assertEqual(ret.dtype, np.dtype('int32'))
+        self.assertTrue(np.all(ret == self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest2 as unittest
+
+from pynwb.form.data_utils import ExtendedData
+import numpy as np
+
+
+class ExtendedDataTests(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.arange(4)
+        self.ext = ExtendedData(self.data)
+        self.ext.append(4)
+        self.ext.extend([5, 6])
+
+    def test_no_copy(self):
+        self.assertIs(self.ext.data, self.data)
+        self.assertListEqual(self.ext.extension, [4, 5, 6])
+
+    def test_len(self):
+        self.assertEqual(len(self.ext), 7)
+
+    def test_iter(self):
+        self.assertListEqual(list(self.ext), list(range(7)))
+
+    def test_getitem_int(self):
+        self.assertEqual(self.ext[2], 2)
+        self.assertEqual(self.ext[5], 5)
+        self.assertEqual(self.ext[-1], 6)
+
+    def test_getitem_int_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.ext[7]
+
+    def test_getitem_slice(self):
+        np.testing.assert_array_equal(self.ext[1:3], [1, 2])
+        np.testing.assert_array_equal(self.ext[2:6], [2, 3, 4, 5])
+        self.assertListEqual(self.ext[5:], [5, 6])
+        np.testing.assert_array_equal(self.ext[:], np.arange(7))
+
+    def test_getitem_slice_step(self):
+        self.assertListEqual(self.ext[::2], [0, 2, 4, 6])
+
+    def test_getitem_bad_index(self):
+        with self.assertRaises(TypeError):
+            self.ext['a']
+
+    def test_dtype(self):
+        self.assertEqual(self.ext.dtype, self.data.dtype)
@@ -0,0 +1,102 @@
+import unittest2 as unittest
+
+from pynwb.form.data_utils import GrowableArray
+import numpy as np
+
+
+class GrowableArrayTests(unittest.TestCase):
+
+    def test_empty(self):
+        arr = GrowableArray()
+        self.assertEqual(len(arr), 0)
+        self.assertIsNone(arr.dtype)
+        self.assertEqual(arr.array.shape, (0,))
+
+    def test_dtype_from_first_value(self):
+        arr = GrowableArray()
+        arr.append(1)
+        self.assertEqual(arr.dtype, np.dtype('int64'))
+        arr = GrowableArray()
+        arr.append(np.float32(1.5))
+        self.assertEqual(arr.dtype, np.dtype('float32'))
+
+    def test_append_grows(self):
+        arr = GrowableArray(capacity=2)
+        for i in range(100):
+            arr.append(i)
+        self.assertEqual(len(arr), 100)
+        np.testing.assert_array_equal(arr.array, np.arange(100))
+
+    def test_append_other_kind(self):
+        arr = GrowableArray()
+        arr.append(1)
+        with self.assertRaises(TypeError):
+            arr.append(2.5)
+        with self.assertRaises(TypeError):
+            arr.append(True)
+        arr.append(np.int16(2))
+        self.assertEqual(arr.dtype, np.dtype('int64'))
+        self.assertListEqual(arr.tolist(), [1, 2])
+
+    def test_append_overflow(self):
+        arr = GrowableArray()
+        arr.append(2**62 + 1)
+        with self.assertRaises(TypeError):
+            arr.append(2**63)
+        self.assertListEqual(arr.tolist(), [2**62 + 1])
+
+    def test_float32_not_promoted(self):
+        arr = GrowableArray(dtype=np.float32)
+        with self.assertRaises(TypeError):
+            arr.append(0.1)
+        arr.append(np.float32(0.1))
+        self.assertEqual(arr.dtype, np.dtype('float32'))
+
+    def test_append_not_a_number(self):
+        arr = GrowableArray()
+        arr.append(1)
+        with self.assertRaises(TypeError):
+            arr.append('a')
+        with self.assertRaises(TypeError):
+            arr.append([1, 2])
+        self.assertListEqual(arr.tolist(), [1])
+
+    def test_extend(self):
+        arr = GrowableArray(capacity=1)
+        arr.extend([1, 2, 3])
+        arr.extend(np.arange(4, 10, dtype=np.int16))
+        arr.extend([])
+        np.testing.assert_array_equal(arr.array, np.arange(1, 10))
+        self.assertEqual(arr.dtype, np.dtype('int64'))
+
+    def test_extend_not_numbers(self):
+        arr = GrowableArray()
+        with self.assertRaises(TypeError):
+            arr.extend(['a', 'b'])
+        with self.assertRaises(TypeError):
+            arr.extend([[1, 2], [3, 4]])
+        with self.assertRaises(TypeError):
+            arr.extend([1, 2.5])
+        self.assertEqual(len(arr), 0)
+        arr.extend([1, 2])
+        with self.assertRaises(TypeError):
+            arr.extend([2.5])
+        self.assertListEqual(arr.tolist(), [1, 2])
+
+    def test_array_no_copy(self):
+        arr = GrowableArray()
+        arr.extend([1, 2, 3])
+        self.assertTrue(np.shares_memory(arr.array, np.asarray(arr)))
+
+    def test_getitem(self):
+        arr = GrowableArray()
+        arr.extend([1, 2, 3])
+        self.assertEqual(arr[1], 2)
+        np.testing.assert_array_equal(arr[1:], [2, 3])
+
+    def test_eq(self):
+        arr = GrowableArray()
+        arr.extend([1, 2, 3])
+        self.assertEqual(arr, [1, 2, 3])
+        self.assertNotEqual(arr, [1, 2])
+        self.assertNotEqual(arr, [1, 2, 4])
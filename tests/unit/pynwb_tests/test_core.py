@@ -1,12 +1,16 @@
 from datetime import datetime
+import os
+import tempfile
 
+import h5py
 import numpy as np
 import pandas as pd
 from pandas.util.testing import assert_frame_equal
 import unittest2 as unittest
 from dateutil.tz import tzlocal
-from pynwb import NWBFile, TimeSeries, available_namespaces
-from pynwb.core import DynamicTable, VectorData, ElementIdentifiers, NWBTable, DynamicTableRegion
+from pynwb import NWBFile, TimeSeries, available_namespaces, get_manager
+from pynwb.core import DynamicTable, VectorData, VectorIndex, ElementIdentifiers, NWBTable, DynamicTableRegion
+from pynwb.form.data_utils import GrowableArray
 
 
 class TestDynamicTable(unittest.TestCase):
@@ -217,6 +221,284 @@ class TestDynamicTable(unittest.TestCase):
                            index=pd.Index(name='id', data=[0, 1, 2]))
         assert_frame_equal(df, df2)
 
+    def test_add_row_numeric_columns(self):
+        table = self.with_spec()
+        table.add_row(foo=1, bar=10.0, baz='cat')
+        table.add_row(foo=2, bar=20.0, baz='dog')
+        self.assertIsInstance(table.id.data, GrowableArray)
+        self.assertIsInstance(table['foo'].data, GrowableArray)
+        self.assertEqual(table['foo'].data.dtype, np.dtype('int64'))
+        self.assertEqual(table['bar'].data.dtype, np.dtype('float64'))
+        self.assertIsInstance(table['baz'].data, list)
+        self.assertEqual(table['foo'].data, [1, 2])
+        self.assertEqual(table[1], (1, 2, 20.0, 'dog'))
+
+    def test_add_row_not_a_number(self):
+        table = self.with_spec()
+        table.add_row(foo=1, bar=10.0, baz='cat')
+        table.add_row(foo='a', bar='b', baz='dog')
+        self.assertListEqual(table['foo'].data, [1, 'a'])
+        self.assertListEqual(table['bar'].data, [10.0, 'b'])
+
+    def test_add_row_other_dtype(self):
+        table = self.with_spec()
+        table.add_row(foo=1, bar=2**62 + 1, baz='cat')
+        table.add_row(foo=2, bar=0.5, baz='dog')
+        # the values are stored as they were added rather than converted to floats
+        self.assertIsInstance(table['bar'].data, list)
+        self.assertEqual(table['bar'].data, [2**62 + 1, 0.5])
+        self.assertIsInstance(table['bar'].data[0], int)
+        self.assertIsInstance(table['foo'].data, GrowableArray)
+
+    def test_extend_not_numbers(self):
+        col = VectorData(name='name', description='desc', data=[])
+        col.extend(['a', 'b'])
+        self.assertIsInstance(col.data, list)
+        ts = TimeSeries('ts', [1, 2], 'unit', timestamps=[0., 1.])
+        col = VectorData(name='name', description='desc', data=[])
+        col.extend([ts])
+        self.assertIsInstance(col.data, list)
+        self.assertIs(col.data[0], ts)
+
+    def test_extend_mixed_numbers(self):
+        col = VectorData(name='name', description='desc', data=[])
+        col.extend([1, 2.5])
+        self.assertIsInstance(col.data, list)
+        self.assertIsInstance(col.data[0], int)
+        col = VectorData(name='name', description='desc', data=[])
+        col.extend([1, 2])
+        col.extend([2.5])
+        self.assertIsInstance(col.data, list)
+        self.assertEqual(col.data, [1, 2, 2.5])
+
+    def test_numeric_columns_to_file(self):
+        table = self.with_spec()
+        for i in range(3):
+            table.add_row(foo=i, bar=i * 10.0, baz='cat')
+        nwbfile = NWBFile('desc', 'id', datetime.now(tzlocal()))
+        nwbfile.add_acquisition(table)
+        manager = get_manager()
+        builder = manager.build(table)
+        self.assertIsInstance(builder['foo'].data, np.ndarray)
+        np.testing.assert_array_equal(builder['foo'].data, [0, 1, 2])
+        np.testing.assert_array_equal(builder['bar'].data, [0.0, 10.0, 20.0])
+
+    def test_add_rows(self):
+        table = self.with_spec()
+        table.add_row(foo=0, bar=0.0, baz='ant')
+        table.add_rows({'foo': np.array(self.data[0]), 'bar': np.array(self.data[1]), 'baz': self.data[2]})
+        self.assertEqual(len(table), 6)
+        self.assertEqual(table.id.data, [0, 1, 2, 3, 4, 5])
+        self.assertEqual(table['foo'].data, [0] + self.data[0])
+        self.assertEqual(table['bar'].data, [0.0] + self.data[1])
+        self.assertListEqual(table['baz'].data, ['ant'] + self.data[2])
+        self.assertIsInstance(table['baz'].data[1], str)
+        self.assertEqual(table[5], (5, 5, 50.0, 'lizard'))
+
+    def test_add_rows_kwargs_ids(self):
+        table = self.with_spec()
+        table.add_rows(foo=self.data[0], bar=self.data[1], baz=self.data[2], id=[10, 11, 12, 13, 14])
+        self.assertEqual(table.id.data, [10, 11, 12, 13, 14])
+        self.assertEqual(table[(2, 'baz')], 'bird')
+
+    def test_add_rows_lengths(self):
+        table = self.with_spec()
+        with self.assertRaisesRegex(ValueError, "expected 5 rows"):
+            table.add_rows({'foo': self.data[0], 'bar': self.data[1][:4], 'baz': self.data[2]})
+        with self.assertRaisesRegex(ValueError, "same number of ids"):
+            table.add_rows({'foo': self.data[0], 'bar': self.data[1], 'baz': self.data[2]}, id=[1, 2])
+        # nothing is added if any of the columns are invalid
+        self.assertEqual(len(table), 0)
+        self.assertEqual(len(table['foo']), 0)
+
+    def test_add_rows_missing_extra_columns(self):
+        table = self.with_spec()
+        with self.assertRaises(ValueError):
+            table.add_rows({'foo': self.data[0], 'bar': self.data[1]})
+        with self.assertRaises(ValueError):
+            table.add_rows({'foo': self.data[0], 'bar': self.data[1], 'baz': self.data[2], 'qax': self.data[0]})
+
+    def test_add_rows_not_an_array(self):
+        table = self.with_spec()
+        with self.assertRaisesRegex(ValueError, "must be an array"):
+            table.add_rows({'foo': self.data[0], 'bar': self.data[1], 'baz': 'cat'})
+
+    def test_add_rows_ragged(self):
+        table = DynamicTable('ragged', 'a test table')
+        table.add_column('foo', 'a ragged column', index=True)
+        table.add_column('bar', 'another ragged column', index=True)
+        table.add_row(foo=[1.0], bar=['a', 'b'])
+        table.add_rows(foo=[[2.0, 3.0], [], [4.0]], bar=np.array(['c', 'd', 'e']), index={'bar': [1, 1, 3]})
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table['foo'][:], [[1.0], [2.0, 3.0], [], [4.0]])
+        self.assertEqual(table['bar'][:], [['a', 'b'], ['c'], [], ['d', 'e']])
+        self.assertEqual(table['foo'].data, [1, 3, 3, 4])
+        self.assertEqual(table['bar'].data, [2, 3, 3, 5])
+
+    def test_add_rows_bad_offsets(self):
+        table = DynamicTable('ragged', 'a test table')
+        table.add_column('foo', 'a ragged column', index=True)
+        table.add_column('bar', 'a column')
+        with self.assertRaisesRegex(ValueError, "non-decreasing"):
+            table.add_rows(foo=[1, 2, 3], bar=[1, 2], index={'foo': [2, 1]})
+        with self.assertRaisesRegex(ValueError, "last offset"):
+            table.add_rows(foo=[1, 2, 3], bar=[1, 2], index={'foo': [1, 2]})
+        with self.assertRaisesRegex(ValueError, "not indexed"):
+            table.add_rows(foo=[[1], [2, 3]], bar=[1, 2], index={'bar': [1, 2]})
+        self.assertEqual(len(table), 0)
+
+
+class TestDynamicTableToDataFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.electrodes = DynamicTable('electrodes', 'an electrodes table')
+        self.electrodes.add_column('location', 'the location of each electrode')
+        self.electrodes.add_rows(location=['CA1', 'CA3', 'DG'])
+        self.table = DynamicTable('units', 'a units table')
+        self.table.add_column('quality', 'the quality of each unit')
+        self.table.add_column('spikes', 'the spike times of each unit', index=True)
+        self.table.add_column('waveform', 'the waveform of each unit')
+        self.table.add_column('electrode', 'the electrode of each unit', table=self.electrodes)
+        self.table.add_column('electrodes', 'the electrodes of each unit', table=self.electrodes, index=True)
+        self.table.add_rows(quality=[0.5, 0.9, 0.1], spikes=[[1.0, 2.0], [], [3.0]],
+                            waveform=np.arange(6.0).reshape(3, 2), electrode=[2, 0, 2],
+                            electrodes=[[0, 1], [2], [1]])
+
+    def test_columns(self):
+        df = self.table.to_dataframe(columns=['spikes', 'quality'])
+        self.assertEqual(list(df.columns), ['spikes', 'quality'])
+        self.assertEqual(df['spikes'].tolist(), [[1.0, 2.0], [], [3.0]])
+        self.assertEqual(df['quality'].tolist(), [0.5, 0.9, 0.1])
+
+    def test_unknown_column(self):
+        with self.assertRaises(KeyError):
+            self.table.to_dataframe(columns=['qux'])
+
+    def test_rows(self):
+        df = self.table.to_dataframe(rows=[2, 0])
+        self.assertEqual(df.index.tolist(), [2, 0])
+        self.assertEqual(df['quality'].tolist(), [0.1, 0.5])
+        self.assertEqual(df['spikes'].tolist(), [[3.0], [1.0, 2.0]])
+        np.testing.assert_array_equal(df['waveform'].iloc[1], [0.0, 1.0])
+        df = self.table.to_dataframe(rows=slice(1, None))
+        self.assertEqual(df.index.tolist(), [1, 2])
+        self.assertEqual(df['electrode'].tolist(), [0, 2])
+
+    def test_rows_mask(self):
+        df = self.table.to_dataframe(rows=np.array([False, True, True]))
+        self.assertEqual(df.index.tolist(), [1, 2])
+        self.assertEqual(df['spikes'].tolist(), [[], [3.0]])
+        with self.assertRaises(IndexError):
+            self.table.to_dataframe(rows=np.array([False, True]))
+        with self.assertRaises(IndexError):
+            self.table.to_dataframe(rows=np.array([0., 1.]))
+
+    def test_ragged(self):
+        df = self.table.to_dataframe(ragged='flat')
+        self.assertIsInstance(df['spikes'].iloc[0], np.ndarray)
+        np.testing.assert_array_equal(df['spikes'].iloc[0], [1.0, 2.0])
+        np.testing.assert_array_equal(df['electrodes'].iloc[0], [0, 1])
+        df = self.table.to_dataframe(ragged='skip')
+        self.assertEqual(list(df.columns), ['quality', 'waveform', 'electrode'])
+        with self.assertRaises(ValueError):
+            self.table.to_dataframe(ragged='nested')
+
+    def test_regions(self):
+        df = self.table.to_dataframe()
+        self.assertEqual(df['electrode'].tolist(), [2, 0, 2])
+        self.assertEqual([list(x) for x in df['electrodes']], [[0, 1], [2], [1]])
+
+    def test_resolve_regions(self):
+        df = self.table.to_dataframe(resolve_regions=True)
+        self.assertEqual(list(df.columns), ['quality', 'spikes', 'waveform', 'electrode_location', 'electrodes'])
+        self.assertEqual(df['electrode_location'].tolist(), ['DG', 'CA1', 'DG'])
+        self.assertEqual(df['electrodes'].iloc[0]['location'].tolist(), ['CA1', 'CA3'])
+        self.assertEqual(df['electrodes'].iloc[1].index.tolist(), [2])
+
+    def test_dataset(self):
+        fd, path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        try:
+            with h5py.File(path, 'w') as f:
+                columns = [VectorData('quality', 'quality', data=f.create_dataset('quality', data=[0.5, 0.9, 0.1])),
+                           VectorData('waveform', 'waveform',
+                                      data=f.create_dataset('waveform', data=np.arange(6.0).reshape(3, 2)))]
+                table = DynamicTable('units', 'a units table', id=f.create_dataset('id', data=[5, 6, 7]),
+                                     columns=columns)
+                df = table.to_dataframe(rows=[2, 0])
+                self.assertEqual(df.index.tolist(), [7, 5])
+                self.assertEqual(df['quality'].tolist(), [0.1, 0.5])
+                np.testing.assert_array_equal(df['waveform'].iloc[0], [4.0, 5.0])
+        finally:
+            os.remove(path)
+
+
+class TestVectorIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.values = np.arange(10.0)
+        self.index = [2, 2, 5, 10]
+        self.rows = [[0.0, 1.0], [], [2.0, 3.0, 4.0], [5.0, 6.0, 7.0, 8.0, 9.0]]
+
+    def make_index(self, values, index):
+        return VectorIndex('foo_index', index, VectorData('foo', 'a ragged column', data=values))
+
+    def assertRowsEqual(self, rows, expected):
+        self.assertEqual(len(rows), len(expected))
+        for row, exp in zip(rows, expected):
+            np.testing.assert_array_equal(row, exp)
+
+    def check_rows(self, vi):
+        self.assertRowsEqual(vi[:], self.rows)
+        self.assertRowsEqual(vi[1:3], self.rows[1:3])
+        self.assertRowsEqual(vi[::2], self.rows[::2])
+        self.assertRowsEqual(vi[[3, 0, -2]], [self.rows[3], self.rows[0], self.rows[2]])
+        self.assertRowsEqual(vi[np.array([2, 2])], [self.rows[2], self.rows[2]])
+        self.assertEqual(vi[2:2], [])
+        values, offsets = vi.get_rows(flat=True)
+        np.testing.assert_array_equal(values, self.values)
+        np.testing.assert_array_equal(offsets, self.index)
+        values, offsets = vi.get_rows([3, 0], flat=True)
+        np.testing.assert_array_equal(values, self.rows[3] + self.rows[0])
+        np.testing.assert_array_equal(offsets, [5, 7])
+        with self.assertRaises(IndexError):
+            vi[[4]]
+        self.assertRowsEqual(vi[np.array([True, False, True, False])], [self.rows[0], self.rows[2]])
+        with self.assertRaises(IndexError):
+            vi[np.array([True, False])]
+
+    def test_get_rows_array(self):
+        self.check_rows(self.make_index(self.values, self.index))
+
+    def test_get_rows_list(self):
+        vi = self.make_index(self.values.tolist(), self.index)
+        self.check_rows(vi)
+        self.assertEqual(vi[:], self.rows)
+
+    def test_get_rows_growable(self):
+        vi = self.make_index(list(), list())
+        for row in self.rows:
+            vi.add_vector(row)
+        self.check_rows(vi)
+        self.assertEqual(vi[:], self.rows)
+
+    def test_get_rows_flat_view(self):
+        vi = self.make_index(self.values, self.index)
+        values, offsets = vi.get_rows(slice(1, 4), flat=True)
+        self.assertTrue(np.shares_memory(values, self.values))
+        np.testing.assert_array_equal(offsets, [0, 3, 8])
+
+    def test_get_rows_dataset(self):
+        fd, path = tempfile.mkstemp(suffix='.h5')
+        os.close(fd)
+        try:
+            with h5py.File(path, 'w') as f:
+                vi = self.make_index(f.create_dataset('foo', data=self.values),
+                                     f.create_dataset('foo_index', data=self.index))
+                self.check_rows(vi)
+        finally:
+            os.remove(path)
+
 
 class TestNWBTable(unittest.TestCase):
 
@@ -207,6 +207,45 @@ class NWBFileTest(unittest.TestCase):
         self.nwbfile.add_trial(start_time=50.0, stop_time=70.0)
         self.assertEqual(len(self.nwbfile.trials), 3)
 
+    def test_add_units(self):
+        self.nwbfile.add_unit(spike_times=[0.5])
+        self.nwbfile.add_units(spike_times=np.array([1.0, 2.0, 3.0]), id=[5, 6], index={'spike_times': [1, 3]})
+        self.assertEqual(len(self.nwbfile.units), 3)
+        self.assertEqual(self.nwbfile.units.id.data, [0, 5, 6])
+        self.assertEqual(self.nwbfile.units['spike_times'][:], [[0.5], [1.0], [2.0, 3.0]])
+
+    def test_add_trials(self):
+        self.nwbfile.add_trial_column('trial_type', 'the type of trial')
+        self.nwbfile.add_trials(start_time=[10.0, 30.0, 50.0], stop_time=[20.0, 40.0, 70.0],
+                                trial_type=['a', 'b', 'a'])
+        self.assertEqual(len(self.nwbfile.trials), 3)
+        self.assertEqual(self.nwbfile.trials[2], (2, 50.0, 70.0, 'a'))
+
+    def test_add_epochs(self):
+        ts = TimeSeries('test_ts', list(range(10)), 'grams', rate=2.0, starting_time=1.0)
+        self.nwbfile.add_epoch(start_time=1.0, stop_time=2.0, tags='a', timeseries=ts)
+        self.nwbfile.add_epochs(start_time=[2.0, 3.0], stop_time=[3.0, 4.5], tags=['b, c', ['d']], timeseries=ts)
+        self.assertEqual(len(self.nwbfile.epochs), 3)
+        self.assertEqual(self.nwbfile.epoch_tags, {'a', 'b', 'c', 'd'})
+        self.assertEqual(self.nwbfile.epochs['tags'][:], [['a'], ['b', 'c'], ['d']])
+        self.assertEqual(self.nwbfile.epochs['timeseries'][:], [[(0, 2, ts)], [(2, 2, ts)], [(4, 3, ts)]])
+
+    def test_add_epochs_timestamps(self):
+        ts = TimeSeries('test_ts', list(range(6)), 'grams', timestamps=[0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+        self.nwbfile.add_epochs(start_time=[0.0, 0.25], stop_time=[0.2, 0.5], timeseries=ts)
+        for i, (start, stop) in enumerate(((0.0, 0.2), (0.25, 0.5))):
+            self.nwbfile.add_epoch(start_time=start, stop_time=stop, timeseries=ts)
+            self.assertEqual(self.nwbfile.epochs['timeseries'][i], self.nwbfile.epochs['timeseries'][i + 2])
+
+    def test_add_electrodes(self):
+        dev1 = self.nwbfile.create_device('dev1')  # noqa: F405
+        group = self.nwbfile.create_electrode_group('tetrode1',
+                                                    'tetrode description', 'tetrode location', dev1)
+        self.nwbfile.add_electrodes(np.arange(4.0), np.zeros(4), np.zeros(4), -np.ones(4), ['CA1'] * 4,
+                                    ['none'] * 4, group=[group] * 4)
+        self.assertEqual(len(self.nwbfile.electrodes), 4)
+        self.assertEqual(self.nwbfile.electrodes[3], (3, 3.0, 0.0, 0.0, -1.0, 'CA1', 'none', group, 'tetrode1'))
+
     def test_add_invalid_times_column(self):
         self.nwbfile.add_invalid_times_column('comments', 'description of reason for omitting time')
         self.assertEqual(self.nwbfile.invalid_times.colnames, ('start_time', 'stop_time', 'comments'))
@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 
 from pynwb.icephys import PatchClampSeries, CurrentClampSeries, IZeroClampSeries, CurrentClampStimulusSeries, \
-        VoltageClampSeries, VoltageClampStimulusSeries, IntracellularElectrode
+        VoltageClampSeries, VoltageClampStimulusSeries, IntracellularElectrode, SweepTable
 from pynwb.device import Device
 
 
@@ -171,5 +171,26 @@ class VoltageClampStimulusSeriesConstructor(unittest.TestCase):
         self.assertEqual(vCSS.electrode, electrode_name)
 
 
+class SweepTableConstructor(unittest.TestCase):
+
+    def test_add_entries(self):
+        electrode_name = GetElectrode()
+        pcs = [PatchClampSeries('test_pcs%d' % i, list(), 'unit', electrode_name, 1.0, timestamps=list(),
+                                sweep_number=n) for i, n in enumerate((4711, 4712, 4712))]
+        sweep_table = SweepTable(name='sweep_table')
+        sweep_table.add_entry(pcs[0])
+        sweep_table.add_entries(pcs[1:])
+        self.assertEqual(len(sweep_table), 3)
+        self.assertEqual(sweep_table['sweep_number'].data, [4711, 4712, 4712])
+        self.assertEqual(sweep_table.get_series(4711), [pcs[0]])
+        self.assertEqual(sweep_table.get_series(4712), pcs[1:])
+
+    def test_add_entries_not_a_series(self):
+        sweep_table = SweepTable(name='sweep_table')
+        with self.assertRaises(TypeError):
+            sweep_table.add_entries([GetElectrode()])
+        self.assertEqual(len(sweep_table), 0)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -229,6 +229,29 @@ class PlaneSegmentationConstructor(unittest.TestCase):
         self.assertTrue(np.allclose(pS['image_mask'][0], img_masks[0]))
         self.assertTrue(np.allclose(pS['image_mask'][1], img_masks[1]))
 
+    def test_add_rois(self):
+        pix_mask = [[1, 2, 1.0], [3, 4, 1.0], [5, 6, 1.0],
+                    [7, 8, 2.0], [9, 10, 2.0]]
+        img_masks = np.random.randn(3, 5, 5)
+
+        iSS, ip = self.getBoilerPlateObjects()
+
+        pS = PlaneSegmentation('description', ip, 'test_name', iSS)
+        pS.add_roi(pixel_mask=pix_mask[0:1], image_mask=img_masks[0])
+        pS.add_rois(pixel_mask=pix_mask[1:5], image_mask=img_masks[1:], index={'pixel_mask': [2, 4]})
+
+        self.assertEqual(len(pS), 3)
+        self.assertEqual(pS['pixel_mask'][0], pix_mask[0:1])
+        self.assertEqual(pS['pixel_mask'][1], pix_mask[1:3])
+        self.assertEqual(pS['pixel_mask'][2], pix_mask[3:5])
+        self.assertTrue(np.allclose(pS['image_mask'][2], img_masks[2]))
+
+    def test_add_rois_no_mask(self):
+        iSS, ip = self.getBoilerPlateObjects()
+        pS = PlaneSegmentation('description', ip, 'test_name', iSS)
+        with self.assertRaises(ValueError):
+            pS.add_rois(id=[1, 2])
+
     def test_init_image_mask(self):
         w, h = 5, 5
         img_mask = [[[1.0 for x in range(w)] for y in range(h)], [[2.0 for x in range(w)] for y in range(h)]]
@@ -5,8 +5,14 @@ This should really test to make sure neurodata_type_def and neurodata_type_inc
 gets mapped appropriately when constructors and methods are invoked
 '''
 import unittest
-
-from pynwb.spec import NWBNamespaceBuilder
+import os
+import shutil
+import tempfile
+
+import pynwb
+from pynwb.form.spec import NamespaceCatalog
+from pynwb.form.spec.namespace import YAMLSpecReader
+from pynwb.spec import NWBNamespaceBuilder, NWBGroupSpec, NWBDatasetSpec, NWBNamespace
 from pynwb.spec import NWBRefSpec
 import json
 
@@ -29,3 +35,29 @@ class NWBRefSpecTests(unittest.TestCase):
     def test_wrong_reference_type(self):
         with self.assertRaises(ValueError):
             NWBRefSpec('TimeSeries', 'unknownreftype')
+
+
+class NoSpecReader(YAMLSpecReader):
+
+    def read_spec(self, spec_path):
+        raise AssertionError("read '%s' instead of the cache" % spec_path)
+
+
+class CoreNamespaceCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_cache_core_namespace(self):
+        pynwb._cache_core_namespace(self.cache_dir)
+        self.assertEqual(len([f for f in os.listdir(self.cache_dir) if f.endswith('.pkl')]), 1)
+        resources = pynwb._get_resources()
+        reader = NoSpecReader(indir=os.path.dirname(resources['namespace_path']))
+        ns_catalog = NamespaceCatalog(NWBGroupSpec, NWBDatasetSpec, NWBNamespace)
+        ns_catalog.load_namespaces(resources['namespace_path'], reader=reader, cache_dir=self.cache_dir,
+                                   cache_key=resources['cache_key'], write_cache=False)
+        self.assertEqual(ns_catalog.get_spec(pynwb.CORE_NAMESPACE, 'TimeSeries'),
+                         pynwb.get_type_map().namespace_catalog.get_spec(pynwb.CORE_NAMESPACE, 'TimeSeries'))